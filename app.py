@@ -1,73 +1,348 @@
-from flask import Flask, jsonify, request, Response, stream_with_context
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from flask import Blueprint, Flask, current_app, has_app_context, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
 import json
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
 import sys
 from pathlib import Path
 from io import BytesIO
-import requests
-import time
+from types import SimpleNamespace
+from datetime import date
 import uuid
+import threading
+import hashlib
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
+# Routes are registered on a blueprint; create_app() builds the Flask app around it
+api = Blueprint('api', __name__)
 
 # Add backend directory to path for imports
 backend_path = Path(__file__).parent / 'backend'
 sys.path.insert(0, str(backend_path))
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+from corpus_store import CorpusStore, load_yaml_file
+from text_processing import case_identifier, case_text
+from vector_index import build_embedder, load_or_build_index
+from bm25_index import load_or_build_bm25, reciprocal_rank_fusion
+from case_registry import FACETS, CaseRegistryProvider, load_case_dataset
+from profile_store import load_profile_index
+from prompts import SimulationPrompts
+from rate_limiter import rate_limiters
+from simulation_cache import SimulationCache, simulation_cache_key
+from strategy_cache import StrategyCache, canonical_cases, strategy_cache_key
+from json_stream import ArrayItemStream
+from memorandum_sections import SectionTracker
+from simulation_jobs import JobStore, SimulationJobs, format_event_id, parse_event_id
+from sequential_testing import BUDGET, interval_summary, mean_interval, stop_reason
+from webhook_client import DEFAULT_RETRY_EXCEPTIONS, CircuitOpenError, WebhookClient, circuit_breakers
+from courtroom_agents import CourtroomAgents, StubLLM
+from llm_gateway import LLMGateway
+from response_pages import (
+    PaginationError,
+    ItemSerializer,
+    ResultSet,
+    ResultSets,
+    assemble,
+    decode_cursor,
+    parse_fields,
+    parse_page_size
+)
+
+def get_service(name):
+    """Return a service injected via create_app(services=...) for the current app, if any
+
+    Known names: `openai` (OpenAI client), `http` (requests-compatible module used for
+    the n8n webhook), `weaviate_connect` (callable returning a Weaviate client),
+    `simulation_cache` (a SimulationCache for scored simulation runs) and
+    `simulation_jobs` (a SimulationJobs runner with its own job store).
+    Benchmarks and tests use this to swap in offline stand-ins.
+    """
+    if has_app_context():
+        return current_app.extensions.get('services', {}).get(name)
+    return None
+
+# OpenAI client, created on first use (or during warm-up) so importing this module stays cheap
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+def get_rate_limiter(name):
+    """Process-wide token bucket for an upstream (`n8n`, `openai_scoring`), configured by `rate_limits` in config.yaml"""
+    return rate_limiters.get(name, (load_app_config().get('rate_limits', {}) or {}).get(name))
 
-# Load case data
-def load_cases():
-    """Load cases from the JSON file"""
-    data_path = os.path.join(os.path.dirname(__file__), 'data', 'reckless_driving_cases.json')
-    with open(data_path, 'r') as f:
-        return json.load(f)
+def get_openai_client():
+    """Return the OpenAI client (an injected one if set), importing the SDK on first use"""
+    global _openai_client
+    injected = get_service('openai')
+    if injected is not None:
+        return injected
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _openai_client
+
+# Every OpenAI call goes through one gateway: response cache, per-model concurrency caps and
+# token budgets, latency and token accounting (`llm` in config.yaml, re-applied when it changes)
+llm_gateway = LLMGateway()
+_llm_gateway_settings = {'applied': None}
+
+def get_llm_gateway():
+    """Return the process-wide LLM gateway with the current `llm` settings applied"""
+    settings = load_app_config().get('llm', {}) or {}
+    key = json.dumps(settings, sort_keys=True, default=str)
+    if _llm_gateway_settings['applied'] != key:
+        cache = settings.get('cache', {}) or {}
+        ttl_hours = cache.get('ttl_hours', 24)
+        llm_gateway.configure(
+            cache_size=int(cache.get('maxsize', 512)) if cache.get('enabled', True) else 0,
+            cache_ttl=float(ttl_hours) * 3600 if ttl_hours else None,
+            models=settings.get('models'),
+            default_max_concurrency=int(settings.get('max_concurrency', 8))
+        )
+        _llm_gateway_settings['applied'] = key
+    return llm_gateway
+
+def llm_client(cache=True):
+    """The OpenAI client (see get_openai_client) with its chat completions routed through the LLM gateway"""
+    return get_llm_gateway().bind(get_openai_client(), cache=cache)
+
+# Shared read-only stores: each file is parsed once and hot-reloaded on change
+DATA_DIR = Path(__file__).parent / 'data'
+CONFIG_PATH = Path(__file__).parent / 'config.yaml'
+config_store = CorpusStore(CONFIG_PATH.parent, loader=load_yaml_file)
+# All *_cases.json datasets are merged; reckless driving stays first in unfiltered listings
+PRIMARY_CASES_FILE = 'reckless_driving_cases.json'
+case_table_store = CorpusStore(DATA_DIR, loader=load_case_dataset)
+case_registry = CaseRegistryProvider(case_table_store, primary=PRIMARY_CASES_FILE)
+# Judge / prosecutor profiles, indexed by normalised name once per file version
+JUDGE_PROFILES_FILE = 'judge_characteristics.json'
+STATE_ATTORNEY_PROFILES_FILE = 'stateattorney_characteristics.json'
+COMPUTED_JUDGE_PROFILES_FILE = 'index/judge_profiles.json'
+profile_store = CorpusStore(DATA_DIR, loader=load_profile_index)
 
 # Load judge characteristics
-def load_judge_characteristics():
-    """Load judge characteristics from JSON file"""
-    data_path = os.path.join(os.path.dirname(__file__), 'data', 'judge_characteristics.json')
-    with open(data_path, 'r') as f:
-        return json.load(f)
+def load_judge_characteristics(name=None):
+    """Resolve a judge profile by name (default profile when the name is empty or unknown)
+
+    Hand-authored profiles win; judges only known from the computed profiles
+    (backend/judge_characteristics.py) are looked up there next. Computed
+    profiles carry only the four scores and evidence snippets; the simulation
+    prompts leave out the court, temperament and strict areas they lack.
+    """
+    profiles = profile_store.get(JUDGE_PROFILES_FILE)
+    match = profiles.lookup(name)
+    if match is None and (DATA_DIR / COMPUTED_JUDGE_PROFILES_FILE).exists():
+        match = profile_store.get(COMPUTED_JUDGE_PROFILES_FILE).lookup(name)
+    return (match or profiles.resolve(None)).profile
 
 # Load state attorney characteristics
-def load_state_attorney_characteristics():
-    """Load state attorney characteristics from JSON file"""
-    data_path = os.path.join(os.path.dirname(__file__), 'data', 'stateattorney_characteristics.json')
-    with open(data_path, 'r') as f:
-        return json.load(f)
+def load_state_attorney_characteristics(name=None):
+    """Resolve a state attorney profile by name (default profile when the name is empty or unknown)"""
+    return profile_store.get(STATE_ATTORNEY_PROFILES_FILE).resolve(name).profile
+
+def load_app_config():
+    """Load config.yaml from the shared store (reloaded when the file changes)"""
+    return config_store.get(CONFIG_PATH)
 
-@app.route('/api/similar-cases', methods=['GET'])
+# Local vector + BM25 indexes over the case corpus, rebuilt whenever the corpus changes
+_case_search_state = {'version': None, 'search': None}
+_case_search_lock = threading.Lock()
+
+def get_case_search():
+    """Return the local search indexes (vector, bm25, embedder, registry) for the current corpus"""
+    registry = case_registry.get()
+    version = (registry.version, config_store.version(CONFIG_PATH))
+    if _case_search_state['version'] == version:
+        return _case_search_state['search']
+    with _case_search_lock:
+        if _case_search_state['version'] != version:
+            cases = registry.all_cases()
+            settings = load_app_config().get('local_index', {}) or {}
+            index_dir = Path(__file__).parent / settings.get('directory', 'data/index')
+            name = settings.get('name', 'case_registry')
+            embedder = build_embedder(settings)
+            search = SimpleNamespace(
+                vector=load_or_build_index(cases, directory=index_dir, name=name, embedder=embedder),
+                bm25=load_or_build_bm25(cases, directory=index_dir, name=name),
+                embedder=embedder,
+                registry=registry
+            )
+            _case_search_state.update(version=version, search=search)
+        return _case_search_state['search']
+
+def rank_cases(search, query_text, case_id, k, mode, restrict_to=None):
+    """Rank corpus case ids by vector, keyword (BM25) or hybrid (RRF-fused) relevance"""
+    exclude = [case_id] if case_id is not None else []
+    if case_id is not None:
+        query_vector = search.vector.vector_of(case_id)
+        query_text = case_text(search.registry.get(case_id))
+    else:
+        query_vector = search.embedder.embed([query_text])[0]
+
+    if mode == 'vector':
+        hits = search.vector.search(query_vector, k, exclude=exclude, restrict_to=restrict_to)
+        return [(hit.case_id, hit.score) for hit in hits]
+    if mode == 'keyword':
+        hits = search.bm25.search(query_text, k, exclude=exclude, restrict_to=restrict_to)
+        return [(hit.case_id, hit.score) for hit in hits]
+
+    # Fuse deeper candidate lists so documents ranked well by only one side still surface
+    depth = max(k * 4, 50)
+    vector_hits = search.vector.search(query_vector, depth, exclude=exclude, restrict_to=restrict_to)
+    keyword_hits = search.bm25.search(query_text, depth, exclude=exclude, restrict_to=restrict_to)
+    fused = reciprocal_rank_fusion([
+        [hit.case_id for hit in vector_hits],
+        [hit.case_id for hit in keyword_hits]
+    ])
+    return fused[:k]
+
+def format_case(case, score=None, offenses=()):
+    """Format a corpus case to match frontend expectations"""
+    formatted = {
+        'id': str(case_identifier(case) or ''),
+        'caseName': case.get('caseName', ''),
+        'date': case.get('dateFiled', ''),
+        'judge': case.get('judge', ''),
+        'syllabus': case.get('syllabus', ''),
+        'court': case.get('court', ''),
+        'url': case.get('absolute_url', ''),
+        'offenses': list(offenses)
+    }
+    if score is not None:
+        formatted['score'] = score
+    return formatted
+
+CASE_FILTERS = ('court', 'judge', 'offense', 'date_from', 'date_to')
+
+def is_iso_date(value):
+    """Check that a query parameter is a YYYY-MM-DD date"""
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+CASE_FIELDS = ('id', 'caseName', 'date', 'judge', 'syllabus', 'court', 'url', 'offenses', 'score')
+
+# Pre-serialized case JSON and server-side ranked result sets for cursor pagination
+case_serializer = ItemSerializer()
+result_sets = ResultSets()
+
+def case_page_response(registry, result_id, offset, page_size, fields):
+    """Assemble one page of corpus cases from pre-serialized JSON fragments"""
+    page, next_cursor, total = result_sets.page(result_id, offset, page_size)
+    items = []
+    for cid, score in page:
+        cid = int(cid)
+        if registry.row_of(cid) is None:
+            continue  # dropped by a corpus reload since the result set was ranked
+        items.append(case_serializer.serialize(
+            (registry.version, cid),
+            fields,
+            lambda cid=cid: format_case(registry.get(cid), offenses=registry.offenses_of(cid)),
+            dynamic={'score': score} if score is not None else None
+        ))
+    return Response(
+        assemble(items, nextCursor=next_cursor, total=total),
+        mimetype='application/json'
+    )
+
+@api.route('/api/similar-cases', methods=['GET'])
 def get_similar_cases():
-    """Get top 5 similar cases"""
+    """Rank the case corpus against a free-text query (`q`) or an existing case (`case_id`)
+
+    `mode` selects the ranking: `hybrid` (default, vector + BM25 fused with RRF), `vector` or `keyword`.
+    `court`, `judge`, `offense`, `date_from` and `date_to` filter the corpus via the registry's facet indexes.
+    Results are paginated: `limit` sets the page size, `cursor` (from `nextCursor`) fetches the next page
+    and `fields` projects each case onto a comma-separated subset of its fields.
+    """
     try:
-        cases = load_cases()
-        # Return top 5 cases (or all if less than 5)
-        top_cases = cases[:5]
-        
-        # Format the response to match frontend expectations
-        formatted_cases = []
-        for case in top_cases:
-            formatted_cases.append({
-                'id': str(case.get('cluster_id', '')),
-                'caseName': case.get('caseName', ''),
-                'date': case.get('dateFiled', ''),
-                'judge': case.get('judge', ''),
-                'syllabus': case.get('syllabus', ''),
-                'court': case.get('court', ''),
-                'url': case.get('absolute_url', '')
-            })
-        
+        fields = parse_fields(request.args.get('fields'), CASE_FIELDS)
+        page_size = parse_page_size(request.args.get('limit') or request.args.get('k'))
+        cursor = request.args.get('cursor')
+        if cursor:
+            result_id, offset = decode_cursor(cursor)
+            return case_page_response(case_registry.get(), result_id, offset, page_size, fields)
+
+        query_text = (request.args.get('q') or request.args.get('query') or '').strip()
+        case_id = (request.args.get('case_id') or '').strip()
+        filters = {name: request.args.get(name) for name in CASE_FILTERS if request.args.get(name)}
+        for name in ('date_from', 'date_to'):
+            if name in filters and not is_iso_date(filters[name]):
+                return jsonify({
+                    'success': False,
+                    'error': f'{name} must be an ISO date (YYYY-MM-DD)'
+                }), 400
+        mode = (request.args.get('mode') or 'hybrid').lower()
+        if mode not in ('hybrid', 'vector', 'keyword'):
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported mode: {mode}'
+            }), 400
+        if case_id and not case_id.isdigit():
+            return jsonify({
+                'success': False,
+                'error': f'Unknown case id: {case_id}'
+            }), 404
+
+        registry = case_registry.get()
+        depth = max(page_size, int(load_app_config().get('search', {}).get('top_k', 200) or 200))
+        result_key = json.dumps([query_text, case_id, mode, sorted(filters.items()), depth])
+        result_id = hashlib.sha1(f"{registry.version}|{config_store.version(CONFIG_PATH)}|{result_key}".encode('utf-8')).hexdigest()
+
+        if result_sets.get(result_id) is None:
+            if not query_text and not case_id:
+                # No query: list the (filtered) corpus in dataset order
+                rows = registry.filter_rows(**filters)
+                ids = registry.table.ids if rows is None else registry.table.ids[rows]
+                result_sets.put(result_id, ResultSet(ids))
+            else:
+                search = get_case_search()
+                restrict_to = search.registry.filter_ids(**filters)
+                if case_id:
+                    if search.registry.row_of(int(case_id)) is None:
+                        return jsonify({
+                            'success': False,
+                            'error': f'Unknown case id: {case_id}'
+                        }), 404
+                    ranked = rank_cases(search, None, int(case_id), depth, mode, restrict_to)
+                else:
+                    ranked = rank_cases(search, query_text, None, depth, mode, restrict_to)
+                result_sets.put(result_id, ResultSet(
+                    [cid for cid, _ in ranked],
+                    [score for _, score in ranked]
+                ))
+
+        return case_page_response(registry, result_id, 0, page_size, fields)
+    except PaginationError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api.route('/api/case-facets', methods=['GET'])
+def get_case_facets():
+    """List the courts, judges and offense types in the case registry with their case counts"""
+    try:
+        registry = case_registry.get()
+        date_from, date_to = registry.date_range()
         return jsonify({
             'success': True,
-            'cases': formatted_cases
+            'totalCases': len(registry),
+            'facets': {name: registry.facet_values(name) for name in FACETS},
+            'dateRange': {'from': date_from, 'to': date_to}
         })
     except Exception as e:
         return jsonify({
@@ -75,147 +350,210 @@ def get_similar_cases():
             'error': str(e)
         }), 500
 
-@app.route('/api/generate-strategies', methods=['POST'])
-def generate_strategies():
-    """Generate defense strategies based on selected cases using OpenAI"""
-    try:
-        data = request.json
-        selected_cases = data.get('cases', [])
-        
-        if not selected_cases:
-            return jsonify({
-                'success': False,
-                'error': 'No cases provided'
-            }), 400
-        
-        # Build prompt from selected cases
-        prompt = "You are a legal strategy expert. Based on the following similar legal cases, generate exactly 3 recommended defense strategies.\n\n"
-        prompt += "Similar Cases:\n\n"
-        
-        for i, case in enumerate(selected_cases, 1):
-            prompt += f"Case {i}: {case.get('caseName', '')}\n"
-            prompt += f"Date: {case.get('date', '')}\n"
-            prompt += f"Judge: {case.get('judge', '')}\n"
-            prompt += f"Court: {case.get('court', '')}\n"
-            prompt += f"Summary: {case.get('syllabus', '')}\n\n"
-        
-        prompt += "\nFor each defense strategy, provide:\n"
-        prompt += "1. Title: A clear, concise name for the strategy\n"
-        prompt += "2. Advantages: List of key benefits and strengths\n"
-        prompt += "3. Considerations: Important factors to consider\n"
-        prompt += "4. Risk Flags: Potential risks or challenges\n"
-        prompt += "5. Supporting Precedent & Strategy Applications: Which of the provided cases support this strategy and how\n"
-        
-        # Call OpenAI API with structured output
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert legal strategist who analyzes case precedents to develop effective defense strategies."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "defense_strategies",
-                    "strict": True,
-                    "schema": {
+STRATEGY_MODEL = "gpt-4o-2024-08-06"
+# Generated strategies by selected case set, created on first use from `strategies.cache` in config.yaml
+_strategy_cache_state = {'settings': None, 'cache': None}
+_strategy_cache_lock = threading.Lock()
+
+def get_strategy_cache():
+    """Return the in-memory cache of generated strategies, or None when disabled"""
+    settings = (load_app_config().get('strategies', {}) or {}).get('cache', {}) or {}
+    if not settings.get('enabled', True):
+        return None
+    key = (settings.get('maxsize', 256), settings.get('ttl_hours', 24))
+    if _strategy_cache_state['settings'] == key:
+        return _strategy_cache_state['cache']
+    with _strategy_cache_lock:
+        if _strategy_cache_state['settings'] != key:
+            maxsize, ttl_hours = key
+            _strategy_cache_state['cache'] = StrategyCache(
+                maxsize=int(maxsize),
+                ttl=float(ttl_hours) * 3600 if ttl_hours else None
+            )
+            _strategy_cache_state['settings'] = key
+    return _strategy_cache_state['cache']
+
+STRATEGY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "defense_strategies",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "strategies": {
+                    "type": "array",
+                    "items": {
                         "type": "object",
                         "properties": {
-                            "strategies": {
+                            "title": {
+                                "type": "string",
+                                "description": "The name of the defense strategy"
+                            },
+                            "advantages": {
+                                "type": "array",
+                                "items": {
+                                    "type": "string"
+                                },
+                                "description": "List of advantages for this strategy"
+                            },
+                            "considerations": {
+                                "type": "array",
+                                "items": {
+                                    "type": "string"
+                                },
+                                "description": "Important considerations for this strategy"
+                            },
+                            "risk_flags": {
+                                "type": "array",
+                                "items": {
+                                    "type": "string"
+                                },
+                                "description": "Potential risks and challenges"
+                            },
+                            "supporting_precedents": {
                                 "type": "array",
                                 "items": {
                                     "type": "object",
                                     "properties": {
-                                        "title": {
+                                        "case_name": {
                                             "type": "string",
-                                            "description": "The name of the defense strategy"
+                                            "description": "Name of the supporting case"
                                         },
-                                        "advantages": {
-                                            "type": "array",
-                                            "items": {
-                                                "type": "string"
-                                            },
-                                            "description": "List of advantages for this strategy"
-                                        },
-                                        "considerations": {
-                                            "type": "array",
-                                            "items": {
-                                                "type": "string"
-                                            },
-                                            "description": "Important considerations for this strategy"
-                                        },
-                                        "risk_flags": {
-                                            "type": "array",
-                                            "items": {
-                                                "type": "string"
-                                            },
-                                            "description": "Potential risks and challenges"
-                                        },
-                                        "supporting_precedents": {
-                                            "type": "array",
-                                            "items": {
-                                                "type": "object",
-                                                "properties": {
-                                                    "case_name": {
-                                                        "type": "string",
-                                                        "description": "Name of the supporting case"
-                                                    },
-                                                    "application": {
-                                                        "type": "string",
-                                                        "description": "How this case supports the strategy"
-                                                    }
-                                                },
-                                                "required": ["case_name", "application"],
-                                                "additionalProperties": False
-                                            },
-                                            "description": "Cases that support this strategy"
+                                        "application": {
+                                            "type": "string",
+                                            "description": "How this case supports the strategy"
                                         }
                                     },
-                                    "required": ["title", "advantages", "considerations", "risk_flags", "supporting_precedents"],
+                                    "required": ["case_name", "application"],
                                     "additionalProperties": False
-                                }
+                                },
+                                "description": "Cases that support this strategy"
                             }
                         },
-                        "required": ["strategies"],
+                        "required": ["title", "advantages", "considerations", "risk_flags", "supporting_precedents"],
                         "additionalProperties": False
                     }
                 }
+            },
+            "required": ["strategies"],
+            "additionalProperties": False
+        }
+    }
+}
+
+def strategy_prompt(selected_cases):
+    """Strategy-generation prompt, listing the cases in canonical order so any ordering of the same set gets the same prompt"""
+    selected_cases = canonical_cases(selected_cases)
+    prompt = "You are a legal strategy expert. Based on the following similar legal cases, generate exactly 3 recommended defense strategies.\n\n"
+    prompt += "Similar Cases:\n\n"
+
+    for i, case in enumerate(selected_cases, 1):
+        prompt += f"Case {i}: {case.get('caseName', '')}\n"
+        prompt += f"Date: {case.get('date', '')}\n"
+        prompt += f"Judge: {case.get('judge', '')}\n"
+        prompt += f"Court: {case.get('court', '')}\n"
+        prompt += f"Summary: {case.get('syllabus', '')}\n\n"
+
+    prompt += "\nFor each defense strategy, provide:\n"
+    prompt += "1. Title: A clear, concise name for the strategy\n"
+    prompt += "2. Advantages: List of key benefits and strengths\n"
+    prompt += "3. Considerations: Important factors to consider\n"
+    prompt += "4. Risk Flags: Potential risks or challenges\n"
+    prompt += "5. Supporting Precedent & Strategy Applications: Which of the provided cases support this strategy and how\n"
+    return prompt
+
+def strategy_request(selected_cases):
+    """Structured-output chat completion request generating strategies for the selected cases"""
+    return dict(
+        model=STRATEGY_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are an expert legal strategist who analyzes case precedents to develop effective defense strategies."
+            },
+            {
+                "role": "user",
+                "content": strategy_prompt(selected_cases)
             }
-        )
-        
-        # Parse the response
-        result = json.loads(response.choices[0].message.content)
-        strategies = result.get('strategies', [])
-        
-        # Format strategies for frontend
-        formatted_strategies = []
-        for i, strategy in enumerate(strategies[:3], 1):  # Ensure only 3 strategies
-            formatted_strategies.append({
-                'id': f'strategy-{i}',
-                'title': strategy.get('title', ''),
-                'advantages': strategy.get('advantages', []),
-                'considerations': strategy.get('considerations', []),
-                'riskFlags': strategy.get('risk_flags', []),
-                'supportingPrecedents': [
-                    {
-                        'caseName': prec.get('case_name', ''),
-                        'application': prec.get('application', '')
-                    }
-                    for prec in strategy.get('supporting_precedents', [])
-                ]
-            })
-        
+        ],
+        response_format=STRATEGY_RESPONSE_FORMAT
+    )
+
+def format_strategy(i, strategy):
+    """Format the `i`-th generated strategy (from 1) for the frontend"""
+    return {
+        'id': f'strategy-{i}',
+        'title': strategy.get('title', ''),
+        'advantages': strategy.get('advantages', []),
+        'considerations': strategy.get('considerations', []),
+        'riskFlags': strategy.get('risk_flags', []),
+        'supportingPrecedents': [
+            {
+                'caseName': prec.get('case_name', ''),
+                'application': prec.get('application', '')
+            }
+            for prec in strategy.get('supporting_precedents', [])
+        ]
+    }
+
+def format_strategies(content):
+    """Parse the model's structured output and format its strategies for the frontend"""
+    result = json.loads(content)
+    strategies = result.get('strategies', [])
+    return [format_strategy(i, strategy) for i, strategy in enumerate(strategies[:3], 1)]  # Ensure only 3 strategies
+
+def strategy_request_error(data):
+    """Validation error for a strategy-generation request body, or None"""
+    if not isinstance(data, dict):
+        return 'Request body must be a JSON object'
+    if not data.get('cases'):
+        return 'No cases provided'
+    return None
+
+@api.route('/api/generate-strategies', methods=['POST'])
+def generate_strategies():
+    """Generate defense strategies based on selected cases using OpenAI
+
+    Results are cached by the selected case set regardless of its order; a request
+    with `forceRefresh: true` bypasses the cache and replaces the entry.
+    /api/generate-strategies/stream streams the same result strategy by strategy.
+    """
+    try:
+        data = request.get_json(silent=True)
+        error = strategy_request_error(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        selected_cases = data['cases']
+        force_refresh = bool(data.get('forceRefresh', False))
+
+        cache = get_strategy_cache()
+        cache_key = strategy_cache_key(selected_cases, STRATEGY_MODEL)
+        if cache is not None and not force_refresh:
+            cached_strategies = cache.get(cache_key)
+            if cached_strategies is not None:
+                return jsonify({
+                    'success': True,
+                    'strategies': cached_strategies,
+                    'cached': True
+                })
+
+        # Call OpenAI API with structured output
+        response = llm_client(cache=not force_refresh).chat.completions.create(**strategy_request(selected_cases))
+        formatted_strategies = format_strategies(response.choices[0].message.content)
+
+        if cache is not None:
+            cache.put(cache_key, formatted_strategies)
+
         return jsonify({
             'success': True,
-            'strategies': formatted_strategies
+            'strategies': formatted_strategies,
+            'cached': False
         })
-        
+
     except Exception as e:
         print(f"Error generating strategies: {str(e)}")
         return jsonify({
@@ -223,10 +561,117 @@ def generate_strategies():
             'error': str(e)
         }), 500
 
-@app.route('/api/upload-case', methods=['POST'])
+def strategy_events(selected_cases, force_refresh=False):
+    """Yield the stream events of one strategy generation (needs an app context)
+
+    The model's answer is streamed and parsed as it arrives, so each `strategy`
+    event goes out as soon as that strategy's JSON object is complete. The final
+    `complete` event carries the /api/generate-strategies payload, parsed from
+    the full answer. A cached result streams all its strategies at once.
+    """
+    try:
+        cache = get_strategy_cache()
+        cache_key = strategy_cache_key(selected_cases, STRATEGY_MODEL)
+        cached_strategies = cache.get(cache_key) if cache is not None and not force_refresh else None
+        if cached_strategies is not None:
+            for strategy in cached_strategies:
+                yield {'type': 'strategy', 'strategy': strategy, 'cached': True}
+            yield {'type': 'complete', 'success': True, 'strategies': cached_strategies, 'cached': True}
+            return
+
+        parser = ArrayItemStream('strategies')
+        for chunk in get_llm_gateway().chat_stream(get_openai_client(), strategy_request(selected_cases)):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            for strategy in parser.feed(delta or ''):
+                if parser.items <= 3:
+                    yield {'type': 'strategy', 'strategy': format_strategy(parser.items, strategy), 'cached': False}
+        formatted_strategies = format_strategies(parser.text)
+
+        if cache is not None:
+            cache.put(cache_key, formatted_strategies)
+        yield {'type': 'complete', 'success': True, 'strategies': formatted_strategies, 'cached': False}
+    except Exception as e:
+        print(f"Error streaming strategies: {str(e)}")
+        yield error_event(e)
+
+@api.route('/api/generate-strategies/stream', methods=['POST'])
+def stream_strategies():
+    """Generate defense strategies as Server-Sent Events, one `strategy` event per strategy (see strategy_events)"""
+    data = request.get_json(silent=True)
+    error = strategy_request_error(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    events = strategy_events(data['cases'], bool(data.get('forceRefresh', False)))
+    return Response(
+        stream_with_context(sse_event(event) for event in events),
+        mimetype='text/event-stream',
+        headers=SSE_HEADERS
+    )
+
+def import_pdf_reader():
+    """Import the PDF library used by /api/upload-case"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+    return PdfReader
+
+def import_weaviate():
+    """Import the Weaviate helpers (and the Weaviate client) used by /api/upload-case"""
+    from weaviate_cases import load_weaviate
+    return load_weaviate()
+
+UPLOAD_FIELDS = (
+    'rank', 'case_id', 'uuid', 'title', 'body', 'source_file',
+    'distance', 'certainty', 'absolute_url', 'judge', 'metadata'
+)
+
+def upload_page_response(result_id, offset, page_size, fields, **extra):
+    """Assemble one page of an upload search from pre-serialized JSON fragments"""
+    page, next_cursor, total = result_sets.page(result_id, offset, page_size)
+    items = [
+        case_serializer.serialize((result_id, case_data['rank']), fields, lambda case_data=case_data: case_data)
+        for case_data, _ in page
+    ]
+    return Response(
+        assemble(items, nextCursor=next_cursor, total=total, **extra),
+        mimetype='application/json'
+    )
+
+@api.route('/api/upload-case/results', methods=['GET'])
+def get_upload_results():
+    """Fetch further pages of an /api/upload-case search via its `cursor`"""
+    try:
+        cursor = request.args.get('cursor')
+        if not cursor:
+            return jsonify({
+                'success': False,
+                'error': 'cursor is required'
+            }), 400
+        fields = parse_fields(request.args.get('fields'), UPLOAD_FIELDS)
+        page_size = parse_page_size(request.args.get('limit'))
+        result_id, offset = decode_cursor(cursor)
+        return upload_page_response(result_id, offset, page_size, fields)
+    except PaginationError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+@api.route('/api/upload-case', methods=['POST'])
 def upload_case():
-    """Upload PDF(s), extract text, and query Weaviate for similar cases"""
+    """Upload PDF(s), extract text, and query Weaviate for similar cases
+
+    Accepts optional `fields` (comma-separated projection) and `limit` (page size) form fields.
+    The response carries the first page and a `nextCursor` for /api/upload-case/results.
+    """
     try:
+        fields = parse_fields(request.form.get('fields'), UPLOAD_FIELDS)
+        page_size = parse_page_size(request.form.get('limit'))
+
         # Check if files were uploaded
         if 'files' not in request.files:
             return jsonify({
@@ -241,17 +686,14 @@ def upload_case():
                 'error': 'No files provided'
             }), 400
         
-        # Import PDF extraction library
+        # Import PDF extraction library (already loaded when the app was warmed up)
         try:
-            from pypdf import PdfReader
+            PdfReader = import_pdf_reader()
         except ImportError:
-            try:
-                from PyPDF2 import PdfReader
-            except ImportError:
-                return jsonify({
-                    'success': False,
-                    'error': 'PDF processing library not installed'
-                }), 500
+            return jsonify({
+                'success': False,
+                'error': 'PDF processing library not installed'
+            }), 500
         
         # Extract text from all PDFs
         extracted_text = []
@@ -300,36 +742,29 @@ def upload_case():
             connection=connection_opts,
             model=config.get('search', {}).get('reasoning_model'),
             effort=config.get('search', {}).get('reasoning_effort', 'low'),
-            api_base=config.get('search', {}).get('reasoning_api_base')
+            api_base=config.get('search', {}).get('reasoning_api_base'),
+            client=get_service('openai'),
+            gateway=get_llm_gateway()
         )
         
         print(f"Generated query: {query_text}")
         
         # Connect to Weaviate and search
-        client = connect_weaviate_client(connection_opts)
+        client = (get_service('weaviate_connect') or connect_weaviate_client)(connection_opts)
         try:
             collection_name = config.get('collection', {}).get('name', 'RecklessDisorderlyMock')
             collection = client.collections.get(collection_name)
             
-            # Import MetadataQuery
-            from weaviate.classes.query import MetadataQuery
+            MetadataQuery = import_weaviate()[2]
             
-            # Perform search with top_k=5
+            # Retrieve the configured depth once; the client pages through it
             response = collection.query.near_text(
                 query=query_text,
-                limit=5,
+                limit=max(page_size, int(config.get('search', {}).get('top_k', 200) or 200)),
                 return_properties=["case_id", "title", "body", "metadata", "source_file", "absolute_url", "judge"],
                 return_metadata=MetadataQuery(distance=True, certainty=True)
             )
             
-            if not response.objects:
-                return jsonify({
-                    'success': True,
-                    'cases': [],
-                    'extracted_text': combined_text[:500],  # First 500 chars for reference
-                    'query': query_text
-                })
-            
             # Format results
             results = []
             for rank, obj in enumerate(response.objects, start=1):
@@ -358,12 +793,14 @@ def upload_case():
                 
                 results.append(case_data)
             
-            return jsonify({
-                'success': True,
-                'cases': results,
-                'extracted_text': combined_text[:500],  # First 500 chars for reference
-                'query': query_text
-            })
+            # Keep the full ranking server-side; later pages come from /api/upload-case/results
+            result_id = uuid.uuid4().hex
+            result_sets.put(result_id, ResultSet(results))
+            return upload_page_response(
+                result_id, 0, page_size, fields,
+                extracted_text=combined_text[:500],  # First 500 chars for reference
+                query=query_text
+            )
             
         finally:
             try:
@@ -371,6 +808,11 @@ def upload_case():
             except AttributeError:
                 pass
                 
+    except PaginationError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         print(f"Error in upload_case: {str(e)}")
         import traceback
@@ -380,17 +822,51 @@ def upload_case():
             'error': str(e)
         }), 500
 
-def score_simulation_result(defense_argument, plaintiff_argument, judgment_summary, winner, strategy_title, variation):
-    """
-    Use GPT-4o to score the effectiveness of the lawyer's argumentation strategy
-    Returns a score from 0-10 based on how well the strategy worked out
-    """
-    try:
-        # Build comprehensive prompt for GPT-4o to evaluate the simulation
-        evaluation_prompt = f"""
-You are an expert legal analyst evaluating the effectiveness of a defense lawyer's argumentation strategy in a motion to dismiss hearing simulation.
+SCORING_MODEL = "gpt-4o-2024-08-06"
+
+SCORING_SYSTEM_PROMPT = "You are an expert legal analyst who evaluates the effectiveness of legal arguments and courtroom strategies. You provide detailed, objective assessments based on legal reasoning quality, persuasiveness, and strategic coherence."
+
+SCORING_CRITERIA = """EVALUATION TASK:
+Analyze the defense attorney's argumentation strategy and rate its effectiveness on a scale of 5-10, where:
+- 5-6: Moderate - Strategy had some merit but significant gaps in argumentation
+- 7-8: Good - Strategy was effective with strong legal reasoning and persuasive arguments
+- 9-10: Excellent - Strategy was highly effective with exceptional legal reasoning and compelling arguments
+
+Consider the following factors:
+1. **Legal Reasoning Quality**: How sound and well-structured were the legal arguments?
+2. **Precedent Application**: How effectively did the defense use case law and legal precedent?
+3. **Persuasiveness**: How compelling and convincing were the arguments to the judge?
+4. **Response to Opposition**: How well did the defense address or anticipate the plaintiff's arguments?
+5. **Strategic Coherence**: Did the defense maintain a consistent and logical strategy throughout?
+6. **Judge's Receptivity**: How did the judge respond to the defense arguments based on the judgment?
+7. **Outcome Alignment**: Did the strategy contribute to a favorable outcome for the defense?"""
+
+SCORING_GUIDANCE = "Your evaluation should be objective and based solely on the quality and effectiveness of the legal argumentation, not just the final outcome. Be generous and a bit biased towards the defense lawyer."
+
+EVALUATION_PROPERTIES = {
+    "score": {
+        "type": "number",
+        "description": "Score from 0-10 evaluating strategy effectiveness"
+    },
+    "rationale": {
+        "type": "string",
+        "description": "Brief explanation of the score"
+    },
+    "strengths": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Key strengths in the argumentation"
+    },
+    "weaknesses": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Key weaknesses or areas for improvement"
+    }
+}
 
-STRATEGY USED:
+def format_transcript(strategy_title, variation, defense_argument, plaintiff_argument, judgment_summary, winner):
+    """Strategy and courtroom transcript section of a scoring prompt"""
+    return f"""STRATEGY USED:
 Strategy: {strategy_title}
 Variation: {variation}
 
@@ -405,24 +881,19 @@ State Attorney's Argument:
 Judge's Judgment:
 {judgment_summary}
 
-Final Decision: {winner}
+Final Decision: {winner}"""
 
----
+def build_scoring_request(defense_argument, plaintiff_argument, judgment_summary, winner, strategy_title, variation):
+    """Chat completion arguments asking GPT-4o to score one simulation transcript"""
+    # Build comprehensive prompt for GPT-4o to evaluate the simulation
+    evaluation_prompt = f"""
+You are an expert legal analyst evaluating the effectiveness of a defense lawyer's argumentation strategy in a motion to dismiss hearing simulation.
 
-EVALUATION TASK:
-Analyze the defense attorney's argumentation strategy and rate its effectiveness on a scale of 5-10, where:
-- 5-6: Moderate - Strategy had some merit but significant gaps in argumentation
-- 7-8: Good - Strategy was effective with strong legal reasoning and persuasive arguments
-- 9-10: Excellent - Strategy was highly effective with exceptional legal reasoning and compelling arguments
+{format_transcript(strategy_title, variation, defense_argument, plaintiff_argument, judgment_summary, winner)}
 
-Consider the following factors:
-1. **Legal Reasoning Quality**: How sound and well-structured were the legal arguments?
-2. **Precedent Application**: How effectively did the defense use case law and legal precedent?
-3. **Persuasiveness**: How compelling and convincing were the arguments to the judge?
-4. **Response to Opposition**: How well did the defense address or anticipate the plaintiff's arguments?
-5. **Strategic Coherence**: Did the defense maintain a consistent and logical strategy throughout?
-6. **Judge's Receptivity**: How did the judge respond to the defense arguments based on the judgment?
-7. **Outcome Alignment**: Did the strategy contribute to a favorable outcome for the defense?
+---
+
+{SCORING_CRITERIA}
 
 Provide your response in JSON format with:
 - "score": A number from 0-10 (can include decimals like 7.5)
@@ -430,92 +901,210 @@ Provide your response in JSON format with:
 - "strengths": List of 2-3 key strengths in the argumentation
 - "weaknesses": List of 2-3 key weaknesses or areas for improvement
 
-Your evaluation should be objective and based solely on the quality and effectiveness of the legal argumentation, not just the final outcome. Be generous and a bit biased towards the defense lawyer.
+{SCORING_GUIDANCE}
 """
-        
-        # Call GPT-4o for evaluation
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert legal analyst who evaluates the effectiveness of legal arguments and courtroom strategies. You provide detailed, objective assessments based on legal reasoning quality, persuasiveness, and strategic coherence."
-                },
-                {
-                    "role": "user",
-                    "content": evaluation_prompt
+    
+    return dict(
+        model=SCORING_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": SCORING_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": evaluation_prompt
+            }
+        ],
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "strategy_evaluation",
+                "strict": True,
+                "schema": {
+                    "type": "object",
+                    "properties": EVALUATION_PROPERTIES,
+                    "required": ["score", "rationale", "strengths", "weaknesses"],
+                    "additionalProperties": False
                 }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "strategy_evaluation",
-                    "strict": True,
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "score": {
-                                "type": "number",
-                                "description": "Score from 0-10 evaluating strategy effectiveness"
-                            },
-                            "rationale": {
-                                "type": "string",
-                                "description": "Brief explanation of the score"
-                            },
-                            "strengths": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Key strengths in the argumentation"
-                            },
-                            "weaknesses": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Key weaknesses or areas for improvement"
+            }
+        },
+        temperature=0.3  # Lower temperature for more consistent scoring
+    )
+
+def build_batch_scoring_request(runs):
+    """Chat completion arguments asking GPT-4o to score several transcripts in one call
+
+    `runs` are `(run_id, strategy_title, variation, transcript)`; the shared
+    instructions are sent once and the answer is an array with one evaluation
+    per run id.
+    """
+    transcripts = "\n\n".join(
+        f"=== RUN {run_id} ===\n{format_transcript(strategy_title, variation, **transcript)}"
+        for run_id, strategy_title, variation, transcript in runs
+    )
+    evaluation_prompt = f"""
+You are an expert legal analyst evaluating the effectiveness of defense lawyers' argumentation strategies in {len(runs)} motion to dismiss hearing simulations.
+
+{transcripts}
+
+---
+
+{SCORING_CRITERIA}
+
+Evaluate every run independently of the others. Provide your response in JSON format with "evaluations": one entry per run, each with:
+- "run_id": The id of the run as given in its "=== RUN ... ===" header
+- "score": A number from 0-10 (can include decimals like 7.5)
+- "rationale": A brief 2-3 sentence explanation of your score
+- "strengths": List of 2-3 key strengths in the argumentation
+- "weaknesses": List of 2-3 key weaknesses or areas for improvement
+
+{SCORING_GUIDANCE}
+"""
+    
+    return dict(
+        model=SCORING_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": SCORING_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": evaluation_prompt
+            }
+        ],
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "strategy_evaluations",
+                "strict": True,
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "evaluations": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "run_id": {
+                                        "type": "string",
+                                        "enum": [run[0] for run in runs]
+                                    },
+                                    **EVALUATION_PROPERTIES
+                                },
+                                "required": ["run_id", "score", "rationale", "strengths", "weaknesses"],
+                                "additionalProperties": False
                             }
-                        },
-                        "required": ["score", "rationale", "strengths", "weaknesses"],
-                        "additionalProperties": False
-                    }
+                        }
+                    },
+                    "required": ["evaluations"],
+                    "additionalProperties": False
                 }
-            },
-            temperature=0.3  # Lower temperature for more consistent scoring
-        )
-        
-        # Parse the evaluation result
-        evaluation_raw = json.loads(response.choices[0].message.content)
-        
-        # Normalize evaluation payload
-        try:
-            raw_score = float(evaluation_raw.get('score', 5.0))
-        except (TypeError, ValueError):
-            raw_score = 5.0
-        score = max(0.0, min(10.0, raw_score))
-        
-        strengths = evaluation_raw.get('strengths', [])
-        if not isinstance(strengths, list):
-            strengths = [str(strengths)]
-        weaknesses = evaluation_raw.get('weaknesses', [])
-        if not isinstance(weaknesses, list):
-            weaknesses = [str(weaknesses)]
-        
-        evaluation = {
-            'score': score,
-            'rationale': evaluation_raw.get('rationale', ''),
-            'strengths': strengths,
-            'weaknesses': weaknesses
-        }
+            }
+        },
+        temperature=0.3
+    )
+
+def normalize_evaluation(evaluation_raw):
+    """Normalize one evaluation object into score (0-10), rationale, strengths and weaknesses"""
+    try:
+        raw_score = float(evaluation_raw.get('score', 5.0))
+    except (TypeError, ValueError):
+        raw_score = 5.0
+    score = max(0.0, min(10.0, raw_score))
+    
+    strengths = evaluation_raw.get('strengths', [])
+    if not isinstance(strengths, list):
+        strengths = [str(strengths)]
+    weaknesses = evaluation_raw.get('weaknesses', [])
+    if not isinstance(weaknesses, list):
+        weaknesses = [str(weaknesses)]
+    
+    return {
+        'score': score,
+        'rationale': evaluation_raw.get('rationale', ''),
+        'strengths': strengths,
+        'weaknesses': weaknesses
+    }
+
+def parse_evaluation(content):
+    """Normalize GPT-4o's JSON evaluation into score (0-10), rationale, strengths and weaknesses"""
+    return normalize_evaluation(json.loads(content))
+
+def parse_batch_evaluations(content, run_ids):
+    """Evaluations of a batch response in `run_ids` order
+
+    Raises ValueError unless the response has exactly one scored evaluation per run id.
+    """
+    entries = json.loads(content).get('evaluations')
+    if not isinstance(entries, list):
+        raise ValueError("Batch evaluation has no evaluations array")
+    by_run = {}
+    for entry in entries:
+        run_id = entry.get('run_id') if isinstance(entry, dict) else None
+        if run_id not in run_ids or run_id in by_run:
+            raise ValueError(f"Unexpected or duplicate run id in batch evaluation: {run_id!r}")
+        if not isinstance(entry.get('score'), (int, float)):
+            raise ValueError(f"Batch evaluation of {run_id} has no numeric score")
+        by_run[run_id] = normalize_evaluation(entry)
+    missing = [run_id for run_id in run_ids if run_id not in by_run]
+    if missing:
+        raise ValueError(f"Batch evaluation is missing runs: {', '.join(missing)}")
+    return [by_run[run_id] for run_id in run_ids]
+
+def log_evaluation(strategy_title, variation, evaluation):
+    """Log the evaluation for debugging/insight"""
+    print(f"\n{'='*80}")
+    print("SIMULATION SCORING EVALUATION")
+    print(f"{'='*80}")
+    print(f"Strategy: {strategy_title} ({variation})")
+    print(f"Score: {evaluation['score']}/10")
+    print(f"Rationale: {evaluation['rationale']}")
+    print(f"Strengths: {', '.join(evaluation['strengths']) or 'None noted'}")
+    print(f"Weaknesses: {', '.join(evaluation['weaknesses']) or 'None noted'}")
+    print(f"{'='*80}\n")
+
+def fallback_evaluation(winner):
+    """Simple winner-based scoring used when GPT-4o scoring fails"""
+    fallback_score = 0.0
+    fallback_rationale = "Unable to retrieve detailed evaluation; applied fallback scoring."
+    winner_lower = winner.lower() if isinstance(winner, str) else ""
+    if 'defense' in winner_lower or 'defendant' in winner_lower:
+        fallback_score = 7.5
+        fallback_rationale = "Defense prevailed; assigning favorable fallback score."
+    elif 'split' in winner_lower or 'partial' in winner_lower:
+        fallback_score = 5.0
+        fallback_rationale = "Split decision; assigning neutral fallback score."
+    else:
+        fallback_score = 2.5
+        fallback_rationale = "Plaintiff prevailed; assigning low fallback score."
+    
+    return {
+        'score': fallback_score,
+        'rationale': fallback_rationale,
+        'strengths': [],
+        'weaknesses': [],
+        'fallback': True
+    }
+
+def score_simulation_result(defense_argument, plaintiff_argument, judgment_summary, winner, strategy_title, variation):
+    """
+    Use GPT-4o to score the effectiveness of the lawyer's argumentation strategy
+    Returns a score from 0-10 based on how well the strategy worked out
+    """
+    try:
+        scoring_request = build_scoring_request(
+            defense_argument, plaintiff_argument, judgment_summary, winner, strategy_title, variation
+        )
         
-        # Log the evaluation for debugging/insight
-        print(f"\n{'='*80}")
-        print("SIMULATION SCORING EVALUATION")
-        print(f"{'='*80}")
-        print(f"Strategy: {strategy_title} ({variation})")
-        print(f"Score: {evaluation['score']}/10")
-        print(f"Rationale: {evaluation['rationale']}")
-        print(f"Strengths: {', '.join(evaluation['strengths']) or 'None noted'}")
-        print(f"Weaknesses: {', '.join(evaluation['weaknesses']) or 'None noted'}")
-        print(f"{'='*80}\n")
+        # Call GPT-4o for evaluation
+        response = get_llm_gateway().chat(
+            get_openai_client(), scoring_request, limiter=get_rate_limiter('openai_scoring')
+        )
         
+        evaluation = parse_evaluation(response.choices[0].message.content)
+        log_evaluation(strategy_title, variation, evaluation)
         return evaluation
         
     except Exception as e:
@@ -523,335 +1112,971 @@ Your evaluation should be objective and based solely on the quality and effectiv
         import traceback
         traceback.print_exc()
         # Fallback to simple winner-based scoring if GPT-4o fails
-        fallback_score = 0.0
-        fallback_rationale = "Unable to retrieve detailed evaluation; applied fallback scoring."
-        winner_lower = winner.lower() if isinstance(winner, str) else ""
-        if 'defense' in winner_lower or 'defendant' in winner_lower:
-            fallback_score = 7.5
-            fallback_rationale = "Defense prevailed; assigning favorable fallback score."
-        elif 'split' in winner_lower or 'partial' in winner_lower:
-            fallback_score = 5.0
-            fallback_rationale = "Split decision; assigning neutral fallback score."
-        else:
-            fallback_score = 2.5
-            fallback_rationale = "Plaintiff prevailed; assigning low fallback score."
-        
-        return {
-            'score': fallback_score,
-            'rationale': fallback_rationale,
-            'strengths': [],
-            'weaknesses': []
-        }
+        return fallback_evaluation(winner)
 
-@app.route('/api/run-simulations', methods=['POST'])
-def run_simulations():
-    """Run multiple simulations for each strategy using n8n webhook with streaming results"""
-    data = request.json
-    strategies = data.get('strategies', [])
-    case_facts = data.get('caseFacts', '')
-    extracted_text = data.get('extractedText', '')
-    judge_name = data.get('judgeName', '')
-    state_attorney_name = data.get('stateAttorneyName', '')
-    
-    if not strategies:
-        return jsonify({
-            'success': False,
-            'error': 'No strategies provided'
-        }), 400
+def score_simulation_batch(runs):
+    """Score `(run_id, strategy_title, variation, transcript)` runs in one GPT-4o call
+
+    Returns their evaluations in order; raises when the call fails or the
+    response does not validate (callers fall back to per-run scoring).
+    """
+    scoring_request = build_batch_scoring_request(runs)
+    response = get_llm_gateway().chat(
+        get_openai_client(), scoring_request, limiter=get_rate_limiter('openai_scoring')
+    )
+    evaluations = parse_batch_evaluations(response.choices[0].message.content, [run[0] for run in runs])
+    for (run_id, strategy_title, variation, transcript), evaluation in zip(runs, evaluations):
+        log_evaluation(strategy_title, variation, evaluation)
+    return evaluations
+
+# Run variations executed for every strategy
+SIMULATION_VARIATIONS = ("Standard Approach", "Aggressive Variant", "Conservative Variant")
+DEFAULT_N8N_URL = "https://juliuspor.app.n8n.cloud/webhook/bfda8a16-0260-4297-ab36-a707e54323c2"
+
+def build_webhook_payload(prompts):
+    """Session id and n8n webhook payload for one run's (lawyer, opponent, judge) prompts"""
+    lawyer_prompt, opponent_prompt, judge_prompt = prompts
+    session_id = f"session-{uuid.uuid4()}"
+    payload = {
+        "lawyer_prompt": lawyer_prompt,
+        "judge_prompt": judge_prompt,
+        "opponent_prompt": opponent_prompt,
+        "session_id": session_id
+    }
+    return session_id, payload
+
+def read_transcript(result):
+    """Defense argument, plaintiff argument, judgment summary and winner from an n8n response body"""
+    output = result.get('output', {})
+    return {
+        'defense_argument': output.get('defense_argument', ''),
+        'plaintiff_argument': output.get('plaintiff_argument', ''),
+        'judgment_summary': output.get('judgment_summary', ''),
+        'winner': output.get('winner', '')
+    }
+
+def provisional_run(run_id, variation, session_id, transcript):
+    """The run payload of a `run_transcript` event (courtroom transcript, not yet scored)"""
+    return {
+        'runId': run_id,
+        'variation': variation,
+        'winner': transcript['winner'],
+        'defenseArgument': transcript['defense_argument'],
+        'plaintiffArgument': transcript['plaintiff_argument'],
+        'judgmentSummary': transcript['judgment_summary'],
+        'sessionId': session_id
+    }
+
+def run_result(run_id, variation, session_id, transcript, evaluation):
+    """The run payload of a `run_scored` event"""
+    return {
+        **provisional_run(run_id, variation, session_id, transcript),
+        'score': evaluation.get('score', 0),
+        'evaluation': evaluation
+    }
+
+def run_error(run_id, variation, error):
+    """The run payload of a failed run"""
+    return {
+        'runId': run_id,
+        'variation': variation,
+        'error': error,
+        'score': 0
+    }
+
+def circuit_open_error(run_id, variation, webhook, error):
+    """The run payload of a run refused by an open circuit breaker: `circuitOpen` and
+    `retryIn` (seconds until the next probe) tell "upstream down" from a failed run"""
+    return {
+        **run_error(run_id, variation, str(error)),
+        'circuitOpen': True,
+        'retryIn': webhook.breaker.stats()['retryIn']
+    }
+
+def webhook_settings():
+    """`simulation.webhook` in config.yaml (timeouts, connection pool, retries, circuit breaker)"""
+    return (load_app_config().get('simulation', {}) or {}).get('webhook', {}) or {}
+
+def webhook_timeouts(settings=None):
+    """`(connect, read)` timeouts in seconds for one n8n webhook call"""
+    settings = webhook_settings() if settings is None else settings
+    return float(settings.get('connect_timeout_seconds', 5)), float(settings.get('read_timeout_seconds', 120))
+
+def get_circuit_breaker(name):
+    """Process-wide circuit breaker for an upstream (`n8n`), configured by `simulation.webhook.breaker`"""
+    return circuit_breakers.get(name, webhook_settings().get('breaker'))
+
+def build_webhook_client(transport, timeout, retry_exceptions=DEFAULT_RETRY_EXCEPTIONS, pool_stats=None):
+    """WebhookClient for the n8n webhook around `transport` (requests-, httpx- or fake-compatible)"""
+    settings = webhook_settings()
+    return WebhookClient(
+        transport,
+        get_circuit_breaker('n8n'),
+        timeout=timeout,
+        retries=int(settings.get('retries', 2)),
+        backoff=float(settings.get('backoff_seconds', 0.5)),
+        max_backoff=float(settings.get('max_backoff_seconds', 8)),
+        retry_exceptions=retry_exceptions,
+        pool_stats=pool_stats
+    )
+
+def requests_pool_stats(adapter, maxsize):
+    """Connection pool statistics of a mounted `requests` HTTPAdapter"""
+    pools = adapter.poolmanager.pools
+    hosts = [pools[key] for key in pools.keys()]
+    return {
+        'hosts': len(hosts),
+        'maxsizePerHost': maxsize,
+        'connectionsOpened': sum(pool.num_connections for pool in hosts),
+        'requests': sum(pool.num_requests for pool in hosts)
+    }
+
+# Keep-alive session for the n8n webhook, created on first use from `simulation.webhook` in config.yaml
+_webhook_client_state = {'settings': None, 'client': None}
+_webhook_client_lock = threading.Lock()
+
+def get_webhook_client():
+    """Return the pooled, retrying n8n webhook client (wrapping an injected `http` service if set)"""
+    settings = webhook_settings()
+    key = json.dumps(settings, sort_keys=True, default=str)
+    injected = get_service('http')
+    if injected is not None:
+        state = current_app.extensions.setdefault('webhook_client', {'settings': None, 'client': None})
+        if state['settings'] != key:
+            state['client'] = build_webhook_client(injected, webhook_timeouts(settings))
+            state['settings'] = key
+        return state['client']
+    if _webhook_client_state['settings'] == key:
+        return _webhook_client_state['client']
+    with _webhook_client_lock:
+        if _webhook_client_state['settings'] != key:
+            import requests
+            from requests.adapters import HTTPAdapter
+            maxsize = int(settings.get('pool_maxsize', 32))
+            # pool_block: callers beyond `pool_maxsize` wait for a pooled connection instead of opening extra ones
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=maxsize, pool_block=True, max_retries=0)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            previous = _webhook_client_state['client']
+            _webhook_client_state['client'] = build_webhook_client(
+                session,
+                webhook_timeouts(settings),
+                retry_exceptions=(requests.Timeout, requests.ConnectionError),
+                pool_stats=lambda: requests_pool_stats(adapter, maxsize)
+            )
+            _webhook_client_state['settings'] = key
+            if previous is not None:
+                previous.transport.close()
+    return _webhook_client_state['client']
+
+def webhook_client_stats():
+    """Statistics of the n8n webhook client in use, or None before the first simulation"""
+    state = current_app.extensions.get('webhook_client') if get_service('http') is not None else _webhook_client_state
+    client = (state or {}).get('client')
+    return client.stats() if client is not None else None
+
+def fetch_transcript(webhook, n8n_url, run_id, variation, prompts):
+    """Pipeline stage 1: run one courtroom simulation through the n8n webhook
+
+    `webhook` is a WebhookClient (see get_webhook_client).  Returns
+    `(session_id, transcript)`, or an error result if the webhook call fails
+    (a circuit_open_error one if its circuit breaker is open).
+    """
+    try:
+        session_id, payload = build_webhook_payload(prompts)
+        
+        response = webhook.post(n8n_url, payload, get_rate_limiter('n8n'))
+        
+        if response.status_code != 200:
+            print(f"n8n webhook error: {response.status_code} - {response.text}")
+            return run_error(run_id, variation, f"API error: {response.status_code}")
+        
+        return session_id, read_transcript(response.json())
     
-    def generate():
-        """Generator function to stream simulation results"""
-        try:
-            # Load judge and state attorney characteristics
-            judge_chars = load_judge_characteristics()
-            state_attorney_chars = load_state_attorney_characteristics()
-            
-            # n8n webhook URL
-            n8n_url = "https://juliuspor.app.n8n.cloud/webhook/bfda8a16-0260-4297-ab36-a707e54323c2"
-            
-            # Store results for final summary
-            simulation_results = []
-            
-            # For each strategy, run 3 simulations
-            for strategy_idx, strategy in enumerate(strategies):
-                strategy_id = strategy.get('id', f'strategy-{strategy_idx + 1}')
-                strategy_title = strategy.get('title', '')
-                
-                strategy_runs = []
-                
-                # Run 3 simulations per strategy
-                for run_idx in range(3):
-                    run_id = f"{strategy_id}-run-{run_idx + 1}"
-                    variation = "Standard Approach" if run_idx == 0 else \
-                               "Aggressive Variant" if run_idx == 1 else \
-                               "Conservative Variant"
-                    
-                    # Build the case context with all relevant information
-                    case_context = f"""
-Case Facts:
-{case_facts}
+    except CircuitOpenError as e:
+        print(f"n8n webhook skipped: {str(e)}")
+        return circuit_open_error(run_id, variation, webhook, e)
+    except Exception as e:
+        print(f"Error calling n8n webhook: {str(e)}")
+        return run_error(run_id, variation, str(e))
 
-Extracted Case Documents:
-{extracted_text[:1000] if extracted_text else 'No additional documents provided'}
+# Where courtroom simulations run (`simulation.backend`): the hosted n8n workflow or in-process agents
+SIMULATION_BACKENDS = ('n8n', 'agents')
+AGENT_MODEL = "gpt-4o-2024-08-06"
 
-Judge: {judge_chars.get('name', 'Hon. Sarah Mitchell')}
-Court: {judge_chars.get('court', 'EDNY/SDNY')}
+class WebhookSimulationBackend:
+    """Courtroom simulations on the n8n workflow behind `url`
 
-State Attorney: {state_attorney_chars.get('name', 'James Anderson')}
-Firm: {state_attorney_chars.get('firm', 'Office of the State Attorney')}
-"""
-                
-                    # Build lawyer prompt (defense) based on strategy and case
-                    lawyer_prompt = f"""
-You are the defense attorney representing the defendant in this case.
+    A simulation backend has an `identity` (part of each run's simulation cache
+    key) and `simulate(run_id, variation, prompts)`, returning
+    `(session_id, transcript)` or a run_error result.
+    """
 
-CASE DETAILS:
-{case_context}
+    def __init__(self, webhook, url):
+        self.webhook = webhook
+        self.url = url
+        self.identity = url
 
-DEFENSE STRATEGY TO EMPLOY:
-{strategy_title}
+    def simulate(self, run_id, variation, prompts):
+        return fetch_transcript(self.webhook, self.url, run_id, variation, prompts)
 
-Strategy Details:
-- Advantages: {', '.join(strategy.get('advantages', [])[:3])}
-- Key Approach: {strategy.get('advantages', [''])[0] if strategy.get('advantages') else ''}
+class AgentSimulationBackend:
+    """Courtroom simulations run in-process by CourtroomAgents (see WebhookSimulationBackend)"""
 
-VARIATION: {variation}
-{"- Focus on aggressive cross-examination and forceful arguments." if variation == "Aggressive Variant" else 
- "- Focus on measured, procedural arguments and risk mitigation." if variation == "Conservative Variant" else
- "- Use a balanced approach combining legal precedent with factual analysis."}
+    def __init__(self, agents, llm):
+        self.agents = agents
+        self.identity = f"agents:{llm}:{agents.model}:rounds={agents.rounds}"
 
-Your role is to present a compelling legal defense using this strategy. Argue forcefully for dismissal or reduced liability.
-Present your argument professionally and persuasively, citing relevant legal principles where appropriate.
-"""
+    def simulate(self, run_id, variation, prompts):
+        try:
+            session_id = f"session-{uuid.uuid4()}"
+            return session_id, self.agents.run(prompts, get_rate_limiter('openai_agents'))
+        except Exception as e:
+            print(f"Error running courtroom agents: {str(e)}")
+            return run_error(run_id, variation, str(e))
 
-                    # Build opponent prompt (state attorney) based on characteristics
-                    opponent_prompt = f"""
-You are the State Attorney representing the plaintiff in this lawsuit.
+def simulation_backend_name(simulation_config):
+    name = simulation_config.get('backend', 'n8n')
+    if name not in SIMULATION_BACKENDS:
+        raise ValueError(f"Unknown simulation backend: {name} (use one of {', '.join(SIMULATION_BACKENDS)})")
+    return name
 
-CASE DETAILS:
-{case_context}
+def agent_settings():
+    """`simulation.agents` in config.yaml"""
+    return (load_app_config().get('simulation', {}) or {}).get('agents', {}) or {}
 
-YOUR PROFILE:
-- Aggressiveness Level: {state_attorney_chars.get('aggressiveness', 8.5)}/10
-- Win Rate: {state_attorney_chars.get('plaintiffSuccessRate', 72.5)}%
-- Approach: {state_attorney_chars.get('emotionalProfile', {}).get('communicationStyle', 'Direct and Confrontational')}
-- Settlement Willingness: {state_attorney_chars.get('emotionalProfile', {}).get('opennessToSettlement', 25)}% (Low)
+def build_courtroom_agents(client, settings):
+    return CourtroomAgents(
+        client,
+        settings.get('model', AGENT_MODEL),
+        rounds=int(settings.get('rounds', 2)),
+        temperature=float(settings.get('temperature', 0.7)),
+        max_tokens=int(settings.get('max_tokens', 700)),
+        turn_workers=int(settings.get('turn_workers', 8))
+    )
 
-KEY STRENGTHS:
-{chr(10).join(f"- {s.get('area', '')}: {s.get('note', '')}" for s in state_attorney_chars.get('strengths', [])[:3])}
+# In-process courtroom agents, created on first use from `simulation.agents` in config.yaml
+_courtroom_agents_state = {'settings': None, 'agents': None}
+_courtroom_agents_lock = threading.Lock()
 
-TACTICAL APPROACH:
-{chr(10).join(f"- {t}" for t in state_attorney_chars.get('tacticalProfile', {}).get('commonTactics', [])[:3])}
+def get_courtroom_agents():
+    """Return the courtroom agents (on the injected `openai` service if set, or the stub LLM)"""
+    settings = agent_settings()
+    key = json.dumps(settings, sort_keys=True, default=str)
+    stub = settings.get('llm', 'openai') == 'stub'
+    state, lock = _courtroom_agents_state, _courtroom_agents_lock
+    if not stub and get_service('openai') is not None:
+        state = current_app.extensions.setdefault('courtroom_agents', {'settings': None, 'agents': None})
+    if state['settings'] == key:
+        return state['agents']
+    with lock:
+        if state['settings'] != key:
+            client = StubLLM(float(settings.get('stub_latency_seconds', 0))) if stub else get_openai_client()
+            # Every turn should be a fresh sample, so agent calls skip the response cache
+            client = get_llm_gateway().bind(client, cache=False)
+            previous = state['agents']
+            state['agents'] = build_courtroom_agents(client, settings)
+            state['settings'] = key
+            if previous is not None:
+                previous.close()
+    return state['agents']
 
-Your role is to aggressively prosecute this case on behalf of the plaintiff. Present compelling arguments for liability
-and maximum damages. Challenge the defense's arguments forcefully and cite precedent to support the plaintiff's position.
-"""
+def get_simulation_backend(simulation_config):
+    """The configured simulation backend for a request (needs an app context)"""
+    if simulation_backend_name(simulation_config) == 'agents':
+        return AgentSimulationBackend(get_courtroom_agents(), agent_settings().get('llm', 'openai'))
+    return WebhookSimulationBackend(get_webhook_client(), simulation_config.get('webhook_url') or DEFAULT_N8N_URL)
 
-                    # Build judge prompt based on characteristics
-                    judge_prompt = f"""
-You are {judge_chars.get('name', 'Hon. Sarah Mitchell')}, presiding judge for {judge_chars.get('court', 'EDNY/SDNY')}.
-
-CASE DETAILS:
-{case_context}
-
-YOUR JUDICIAL PROFILE:
-- Pleading Strictness: {judge_chars.get('pleadingStrictness', 8.5)}/10
-- Precedent Weight: {judge_chars.get('precedentWeight', 9.0)}/10
-- Policy Receptivity: {judge_chars.get('policyReceptivity', 2.0)}/10
-- Plaintiff Friendly: {judge_chars.get('plaintiffFriendly', 8.0)}/10
-
-TEMPERAMENT: {judge_chars.get('emotionalProfile', {}).get('temperament', 'Methodical')}
-- Patience: {judge_chars.get('emotionalProfile', {}).get('patience', 55)}/100
-- Openness to Novel Arguments: {judge_chars.get('emotionalProfile', {}).get('opennessToNovelArguments', 15)}/100
-- Plaintiff Sympathy: {judge_chars.get('emotionalProfile', {}).get('sympathy', {}).get('plaintiff', 80)}%
-- Defendant Sympathy: {judge_chars.get('emotionalProfile', {}).get('sympathy', {}).get('defendant', 20)}%
-
-STRICT AREAS:
-{chr(10).join(f"- {a.get('area', '')}: {a.get('level', 0)}/10 - {a.get('note', '')}" for a in judge_chars.get('strictAreas', [])[:3])}
-
-INSTRUCTIONS:
-1. Call both the defense lawyer (LawyerAgent) and state attorney (OpponentAgent) to hear their arguments
-2. Consider each argument carefully based on your judicial philosophy and characteristics
-3. Make a verdict determining the winner (Plaintiff or Defense) 
-4. Provide a judgment summary explaining your reasoning
-
-Your decision should reflect your judicial tendencies, particularly your:
-- High precedent weight (strongly favor established case law)
-- High pleading strictness (demand rigorous legal standards)
-- Plaintiff-friendly bias ({judge_chars.get('plaintiffFriendly', 8.0)}/10)
-- Low openness to novel arguments
-"""
+def courtroom_agent_stats():
+    """Statistics of the courtroom agents in use, or None before the first agent simulation"""
+    states = [_courtroom_agents_state, current_app.extensions.get('courtroom_agents') or {}]
+    agents = [state['agents'] for state in states if state.get('agents') is not None]
+    return agents[-1].stats() if agents else None
 
-                    # Call n8n webhook
-                    try:
-                        session_id = f"session-{uuid.uuid4()}"
-                        
-                        payload = {
-                            "lawyer_prompt": lawyer_prompt,
-                            "judge_prompt": judge_prompt,
-                            "opponent_prompt": opponent_prompt,
-                            "session_id": session_id
-                        }
-                        
-                        response = requests.post(n8n_url, json=payload, timeout=120)
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            output = result.get('output', {})
-                            
-                            # Get the chat history components
-                            defense_argument = output.get('defense_argument', '')
-                            plaintiff_argument = output.get('plaintiff_argument', '')
-                            judgment_summary = output.get('judgment_summary', '')
-                            winner = output.get('winner', '')
-                            
-                            # Score the result using GPT-4o
-                            evaluation = score_simulation_result(
-                                defense_argument=defense_argument,
-                                plaintiff_argument=plaintiff_argument,
-                                judgment_summary=judgment_summary,
-                                winner=winner,
-                                strategy_title=strategy_title,
-                                variation=variation
-                            )
-                            score = evaluation.get('score', 0)
-                            
-                            run_result = {
-                                'runId': run_id,
-                                'variation': variation,
-                                'winner': winner,
-                                'score': score,
-                                'defenseArgument': defense_argument,
-                                'plaintiffArgument': plaintiff_argument,
-                                'judgmentSummary': judgment_summary,
-                                'sessionId': session_id,
-                                'evaluation': evaluation
-                            }
-                            
-                            strategy_runs.append(run_result)
-                            
-                            # Stream this result immediately to the frontend
-                            stream_data = {
-                                'type': 'run_complete',
-                                'strategyId': strategy_id,
-                                'strategyTitle': strategy_title,
-                                'run': run_result
-                            }
-                            yield f"data: {json.dumps(stream_data)}\n\n"
-                            
-                        else:
-                            print(f"n8n webhook error: {response.status_code} - {response.text}")
-                            error_result = {
-                                'runId': run_id,
-                                'variation': variation,
-                                'error': f"API error: {response.status_code}",
-                                'score': 0
-                            }
-                            strategy_runs.append(error_result)
-                            
-                            # Stream error result
-                            stream_data = {
-                                'type': 'run_complete',
-                                'strategyId': strategy_id,
-                                'strategyTitle': strategy_title,
-                                'run': error_result
-                            }
-                            yield f"data: {json.dumps(stream_data)}\n\n"
-                    
-                    except Exception as e:
-                        print(f"Error calling n8n webhook: {str(e)}")
-                        error_result = {
-                            'runId': run_id,
-                            'variation': variation,
-                            'error': str(e),
-                            'score': 0
-                        }
-                        strategy_runs.append(error_result)
-                        
-                        # Stream error result
-                        stream_data = {
-                            'type': 'run_complete',
-                            'strategyId': strategy_id,
-                            'strategyTitle': strategy_title,
-                            'run': error_result
-                        }
-                        yield f"data: {json.dumps(stream_data)}\n\n"
-                    
-                    # Small delay between calls to avoid overwhelming the API
-                    time.sleep(2)
-                
-                # Calculate average score for this strategy after all runs complete
-                valid_scores = [r['score'] for r in strategy_runs if 'score' in r and r['score'] > 0]
-                average_score = sum(valid_scores) / len(valid_scores) if valid_scores else 0
-                
-                strategy_result = {
-                    'strategyId': strategy_id,
-                    'strategyTitle': strategy_title,
-                    'runs': strategy_runs,
-                    'averageScore': average_score,
-                    'winsCount': len([r for r in strategy_runs if r.get('score', 0) >= 7])
-                }
-                simulation_results.append(strategy_result)
-                
-                # Stream strategy completion
-                stream_data = {
-                    'type': 'strategy_complete',
-                    'strategy': strategy_result
-                }
-                yield f"data: {json.dumps(stream_data)}\n\n"
-            
-            # Send final completion message
-            final_data = {
-                'type': 'complete',
-                'success': True,
-                'results': simulation_results
-            }
-            yield f"data: {json.dumps(final_data)}\n\n"
-            
+def score_run(strategy_title, run_id, variation, session_id, transcript):
+    """Pipeline stage 2: score a transcript with GPT-4o (falls back to winner-based scoring)"""
+    evaluation = score_simulation_result(strategy_title=strategy_title, variation=variation, **transcript)
+    return run_result(run_id, variation, session_id, transcript, evaluation)
+
+def score_runs(batch):
+    """Pipeline stage 2 for a batch of `(strategy_idx, run_idx, strategy_title, run_id, variation, session_id, transcript)`
+
+    A batch of several runs is scored in one GPT-4o call; if that call fails or
+    its response does not validate, each run is scored on its own.
+    """
+    if len(batch) > 1:
+        try:
+            evaluations = score_simulation_batch([
+                (run_id, strategy_title, variation, transcript)
+                for _, _, strategy_title, run_id, variation, _, transcript in batch
+            ])
+            return [
+                run_result(run_id, variation, session_id, transcript, evaluation)
+                for (_, _, _, run_id, variation, session_id, transcript), evaluation in zip(batch, evaluations)
+            ]
         except Exception as e:
-            print(f"Error running simulations: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            error_data = {
-                'type': 'error',
-                'success': False,
-                'error': str(e)
+            print(f"Batch scoring of {len(batch)} runs failed, scoring them one by one: {str(e)}")
+    return [
+        score_run(strategy_title, run_id, variation, session_id, transcript)
+        for _, _, strategy_title, run_id, variation, session_id, transcript in batch
+    ]
+
+# How transcripts are grouped into scoring calls (`simulation.scoring_batch` in config.yaml)
+SCORING_BATCH_MODES = ('run', 'strategy', 'request')
+
+class ScoringBatches:
+    """Groups finished simulations into scoring batches: per run, per strategy or per request"""
+
+    def __init__(self, mode, strategy_count, max_runs):
+        if mode not in SCORING_BATCH_MODES:
+            raise ValueError(f"Unsupported scoring_batch mode: {mode}")
+        self.mode = mode
+        self.max_runs = max(1, int(max_runs))
+        runs_per_strategy = len(SIMULATION_VARIATIONS)
+        if mode == 'request':
+            self.remaining = {0: runs_per_strategy * strategy_count}
+        else:
+            self.remaining = {strategy_idx: runs_per_strategy for strategy_idx in range(strategy_count)}
+        self.waiting = {}
+
+    def add(self, strategy_idx, item=None):
+        """Register a finished simulation (`item=None` if it failed); returns the batches now ready to score"""
+        if self.mode == 'run':
+            return [[item]] if item else []
+        key = strategy_idx if self.mode == 'strategy' else 0
+        self.remaining[key] -= 1
+        if item:
+            self.waiting.setdefault(key, []).append(item)
+        if self.remaining[key]:
+            return []
+        ready = self.waiting.pop(key, [])
+        return [ready[start:start + self.max_runs] for start in range(0, len(ready), self.max_runs)]
+
+    def extend(self, strategy_idx, count):
+        """Expect `count` more simulations of a strategy (adaptive runs started after the first round)"""
+        if self.mode != 'run':
+            key = strategy_idx if self.mode == 'strategy' else 0
+            self.remaining[key] = self.remaining.get(key, 0) + count
+
+def scoring_batches(strategies, simulation_config):
+    return ScoringBatches(
+        simulation_config.get('scoring_batch', 'run'),
+        len(strategies),
+        simulation_config.get('scoring_batch_max_runs', 9)
+    )
+
+def summarize_strategy(strategy_id, strategy_title, strategy_runs):
+    """Aggregate a strategy's runs (in variation order) into its strategy_complete payload"""
+    valid_scores = [r['score'] for r in strategy_runs if 'score' in r and r['score'] > 0]
+    average_score = sum(valid_scores) / len(valid_scores) if valid_scores else 0
+    return {
+        'strategyId': strategy_id,
+        'strategyTitle': strategy_title,
+        'runs': strategy_runs,
+        'averageScore': average_score,
+        'winsCount': len([r for r in strategy_runs if r.get('score', 0) >= 7])
+    }
+
+def plan_strategy_runs(simulation_prompts, strategy_idx, strategy, run_indices):
+    """Runs `run_indices` of one strategy as (strategy_idx, run_idx, strategy_title, run_id, variation, prompts)
+
+    Run `k` uses variation `k % len(SIMULATION_VARIATIONS)`, so runs beyond the
+    first round repeat the variations in order.
+    """
+    strategy_id = strategy.get('id', f'strategy-{strategy_idx + 1}')
+    variations = [SIMULATION_VARIATIONS[run_idx % len(SIMULATION_VARIATIONS)] for run_idx in run_indices]
+    run_prompts = simulation_prompts.run_prompts(strategy, variations)
+    return [
+        (strategy_idx, run_idx, strategy.get('title', ''), f"{strategy_id}-run-{run_idx + 1}", variation, prompts)
+        for run_idx, variation, prompts in zip(run_indices, variations, run_prompts)
+    ]
+
+def plan_simulation_runs(strategies, case_facts, extracted_text, judge_chars, state_attorney_chars):
+    """Every strategy x variation run as (strategy_idx, run_idx, strategy_title, run_id, variation, prompts)"""
+    # Case context, opponent and judge prompts are the same for every run; render them once
+    simulation_prompts = SimulationPrompts(case_facts, extracted_text, judge_chars, state_attorney_chars)
+    runs = []
+    for strategy_idx, strategy in enumerate(strategies):
+        runs.extend(plan_strategy_runs(simulation_prompts, strategy_idx, strategy, range(len(SIMULATION_VARIATIONS))))
+    return runs
+
+# Scored runs by content hash, created on first use from `simulation.cache` in config.yaml
+_simulation_cache_state = {'settings': None, 'cache': None}
+_simulation_cache_lock = threading.Lock()
+
+def get_simulation_cache():
+    """Return the disk cache of scored simulation runs (an injected one if set), or None when disabled"""
+    injected = get_service('simulation_cache')
+    if injected is not None:
+        return injected
+    settings = (load_app_config().get('simulation', {}) or {}).get('cache', {}) or {}
+    if not settings.get('enabled', True):
+        return None
+    key = (
+        settings.get('directory', 'data/cache/simulations'),
+        settings.get('size_limit_mb', 512),
+        settings.get('ttl_hours', 168)
+    )
+    if _simulation_cache_state['settings'] == key:
+        return _simulation_cache_state['cache']
+    with _simulation_cache_lock:
+        if _simulation_cache_state['settings'] != key:
+            directory, size_limit_mb, ttl_hours = key
+            previous = _simulation_cache_state['cache']
+            _simulation_cache_state['cache'] = SimulationCache(
+                Path(__file__).parent / directory,
+                size_limit=int(float(size_limit_mb) * 1024 * 1024),
+                ttl=float(ttl_hours) * 3600 if ttl_hours else None
+            )
+            _simulation_cache_state['settings'] = key
+            if previous is not None:
+                previous.close()
+    return _simulation_cache_state['cache']
+
+def split_cached_runs(cache, runs, backend_id, force_refresh=False):
+    """Look planned runs up in the simulation cache
+
+    A run's key hashes its prompts, variation and the models behind it (the
+    simulation backend's identity and SCORING_MODEL), plus which repetition of
+    its variation it is. Returns `(hits, misses, keys)`: hits as
+    `(strategy_idx, run_idx, run_result)` flagged `cached`, the planned runs
+    still to simulate, and every run's key by `(strategy_idx, run_idx)`. With
+    `force_refresh` every run is a miss (and its fresh result replaces the
+    entry). `cache` is a SimulationCache or None (caching disabled).
+    """
+    hits, misses, keys = [], [], {}
+    for run in runs:
+        strategy_idx, run_idx, strategy_title, run_id, variation, prompts = run
+        keys[strategy_idx, run_idx] = key = simulation_cache_key(
+            prompts, variation, (backend_id, SCORING_MODEL), replicate=run_idx // len(SIMULATION_VARIATIONS)
+        )
+        entry = None
+        if cache is not None and not force_refresh:
+            try:
+                entry = cache.get(key)
+            except Exception as e:
+                print(f"Error reading simulation cache for {run_id}: {str(e)}")
+        if entry is None:
+            misses.append(run)
+            continue
+        result = run_result(run_id, variation, entry['session_id'], entry['transcript'], entry['evaluation'])
+        hits.append((strategy_idx, run_idx, {**result, 'cached': True}))
+    return hits, misses, keys
+
+def cache_scored_runs(cache, keys, batch, results):
+    """Store a scored batch in the simulation cache (runs that fell back to winner-based scoring are skipped)"""
+    if cache is None:
+        return
+    for (strategy_idx, run_idx, _, _, _, session_id, transcript), result in zip(batch, results):
+        evaluation = result.get('evaluation')
+        if evaluation and not evaluation.get('fallback'):
+            try:
+                cache.set(keys[strategy_idx, run_idx], session_id, transcript, evaluation)
+            except Exception as e:
+                print(f"Error caching simulation run {result.get('runId')}: {str(e)}")
+
+class SimulationProgress:
+    """Collects run results in any order and produces the stream events they complete"""
+
+    def __init__(self, strategies):
+        self.strategy_meta = [
+            (strategy.get('id', f'strategy-{strategy_idx + 1}'), strategy.get('title', ''))
+            for strategy_idx, strategy in enumerate(strategies)
+        ]
+        self.runs_by_strategy = [[None] * len(SIMULATION_VARIATIONS) for _ in strategies]
+        self.pending_by_strategy = [len(SIMULATION_VARIATIONS) for _ in strategies]
+        self.annotations = [{} for _ in strategies]
+        self.results = [None] * len(strategies)
+
+    def extend(self, strategy_idx, count):
+        """Expect `count` more runs of a strategy (its `strategy_complete` waits for them)"""
+        self.runs_by_strategy[strategy_idx].extend([None] * count)
+        self.pending_by_strategy[strategy_idx] += count
+
+    def annotate(self, strategy_idx, **fields):
+        """Extra fields for a strategy's `strategy_complete` payload"""
+        self.annotations[strategy_idx].update(fields)
+
+    def transcript(self, strategy_idx, run):
+        """The provisional `run_transcript` event of a run whose transcript is in and is being scored"""
+        strategy_id, strategy_title = self.strategy_meta[strategy_idx]
+        return {
+            'type': 'run_transcript',
+            'strategyId': strategy_id,
+            'strategyTitle': strategy_title,
+            'plannedRuns': len(self.runs_by_strategy[strategy_idx]),
+            'run': run
+        }
+
+    def add(self, strategy_idx, run_idx, run_result):
+        """Record one scored (or failed) run; returns its `run_scored` event plus `strategy_complete` once the strategy is done
+
+        Run events carry `plannedRuns`, the runs the strategy has so far; adaptive
+        rounds raise it until the strategy stops.
+        """
+        strategy_id, strategy_title = self.strategy_meta[strategy_idx]
+        self.runs_by_strategy[strategy_idx][run_idx] = run_result
+        self.pending_by_strategy[strategy_idx] -= 1
+        events = [{
+            'type': 'run_scored',
+            'strategyId': strategy_id,
+            'strategyTitle': strategy_title,
+            'plannedRuns': len(self.runs_by_strategy[strategy_idx]),
+            'run': run_result
+        }]
+        if self.pending_by_strategy[strategy_idx] == 0:
+            strategy_result = {
+                **summarize_strategy(strategy_id, strategy_title, self.runs_by_strategy[strategy_idx]),
+                **self.annotations[strategy_idx]
             }
-            yield f"data: {json.dumps(error_data)}\n\n"
-    
-    # Return streaming response with SSE headers
-    return Response(
-        stream_with_context(generate()),
-        mimetype='text/event-stream',
-        headers={
-            'Cache-Control': 'no-cache',
-            'X-Accel-Buffering': 'no',
-            'Connection': 'keep-alive'
+            self.results[strategy_idx] = strategy_result
+            events.append({
+                'type': 'strategy_complete',
+                'strategy': strategy_result
+            })
+        return events
+
+    def complete_event(self):
+        return {
+            'type': 'complete',
+            'success': True,
+            'results': self.results
         }
-    )
 
-@app.route('/api/generate-memorandum', methods=['POST'])
-def generate_memorandum():
-    """Generate strategy memorandum based on best simulation result"""
+def adaptive_settings(simulation_config, data):
+    """Stopping rules of an adaptive request (`simulation.adaptive`, switched by the request's `adaptive`), or None"""
+    settings = simulation_config.get('adaptive', {}) or {}
+    if not data.get('adaptive', settings.get('enabled', False)):
+        return None
+    max_total_runs = settings.get('max_total_runs')
+    return {
+        'min_runs': max(2, int(settings.get('min_runs', 3))),
+        'max_runs': max(1, int(settings.get('max_runs', 9))),
+        'max_total_runs': int(max_total_runs) if max_total_runs else None,
+        'confidence': float(settings.get('confidence', 0.9)),
+        'score_sd_floor': float(settings.get('score_sd_floor', 0.5))
+    }
+
+class SimulationSchedule:
+    """Decides how many runs each strategy gets
+
+    Without `adaptive` settings every strategy runs each variation once. With
+    them, a strategy that finished a round (one run per variation) gets another
+    round until backend/sequential_testing.py stops it: the confidence interval
+    of its mean score separates from every other strategy's, or lies below
+    another strategy's (dominated), or it reached `max_runs`, or the request
+    reached `max_total_runs` (the first round always runs).
+    """
+
+    def __init__(self, strategies, simulation_prompts, adaptive=None):
+        self.strategies = strategies
+        self.simulation_prompts = simulation_prompts
+        self.adaptive = adaptive
+        self.scores = [[] for _ in strategies]
+        self.started = [0] * len(strategies)
+        self.in_flight = [0] * len(strategies)
+        self.stopped = [None] * len(strategies)
+
+    def initial_runs(self):
+        runs = []
+        for strategy_idx in range(len(self.strategies)):
+            runs.extend(self._start(strategy_idx, len(SIMULATION_VARIATIONS)))
+        return runs
+
+    def _start(self, strategy_idx, count):
+        first = self.started[strategy_idx]
+        self.started[strategy_idx] += count
+        self.in_flight[strategy_idx] += count
+        return plan_strategy_runs(
+            self.simulation_prompts, strategy_idx, self.strategies[strategy_idx], range(first, first + count)
+        )
+
+    def intervals(self):
+        return [
+            mean_interval(scores, self.adaptive['confidence'], self.adaptive['score_sd_floor'])
+            for scores in self.scores
+        ]
+
+    def record(self, strategy_idx, result):
+        """Register a finished run (scored or failed); returns the runs to start next for its strategy"""
+        self.in_flight[strategy_idx] -= 1
+        if 'error' not in result:
+            self.scores[strategy_idx].append(result.get('score', 0))
+        if self.adaptive is None or self.in_flight[strategy_idx]:
+            return []
+        settings = self.adaptive
+        runs = self.started[strategy_idx]
+        reason = stop_reason(strategy_idx, self.intervals(), runs, settings['min_runs'], settings['max_runs'])
+        count = 0
+        if reason is None:
+            count = min(len(SIMULATION_VARIATIONS), settings['max_runs'] - runs)
+            if settings['max_total_runs']:
+                count = min(count, settings['max_total_runs'] - sum(self.started))
+            if count <= 0:
+                reason = BUDGET
+        if reason:
+            self.stopped[strategy_idx] = reason
+            return []
+        return self._start(strategy_idx, count)
+
+    def summary(self, strategy_idx):
+        """Adaptive details of a stopped strategy for its `strategy_complete` payload"""
+        return {
+            'runs': self.started[strategy_idx],
+            'stopReason': self.stopped[strategy_idx],
+            'confidence': self.adaptive['confidence'],
+            'confidenceInterval': interval_summary(self.intervals()[strategy_idx])
+        }
+
+# What an engine does next: events to stream, planned runs to simulate, batches to score
+SimulationStep = namedtuple('SimulationStep', 'events simulate score')
+
+class SimulationPipeline:
+    """Engine-independent bookkeeping of one simulation request
+
+    The Flask route (threads) and asgi.py (tasks) both drive it: they simulate
+    the runs and score the batches each step asks for, and feed the outcomes
+    back through `transcript` and `scored`. Cached runs, scoring batches,
+    adaptive rounds and stream events are all handled here.
+    """
+
+    def __init__(self, strategies, simulation_prompts, simulation_config, backend_id,
+                 cache=None, force_refresh=False, adaptive=None):
+        self.progress = SimulationProgress(strategies)
+        self.batches = scoring_batches(strategies, simulation_config)
+        self.schedule = SimulationSchedule(strategies, simulation_prompts, adaptive)
+        self.backend_id = backend_id
+        self.cache = cache
+        self.force_refresh = force_refresh
+        self.cache_keys = {}
+
+    def start(self):
+        step = SimulationStep([], [], [])
+        self._launch(step, self.schedule.initial_runs())
+        return step
+
+    def transcript(self, info, outcome):
+        """A simulation finished: `info` is (strategy_idx, run_idx, strategy_title, run_id, variation)"""
+        strategy_idx, run_idx, strategy_title, run_id, variation = info
+        step = SimulationStep([], [], [])
+        if isinstance(outcome, tuple):
+            # Show the transcript right away and queue it for scoring
+            session_id, transcript = outcome
+            step.events.append(
+                self.progress.transcript(strategy_idx, provisional_run(run_id, variation, session_id, transcript))
+            )
+            step.score.extend(self.batches.add(strategy_idx, (*info, session_id, transcript)))
+        else:
+            # The simulation failed; there is nothing to score
+            self._finish(step, strategy_idx, run_idx, outcome)
+            step.score.extend(self.batches.add(strategy_idx))
+        return step
+
+    def scored(self, batch, results):
+        """A scoring batch finished"""
+        cache_scored_runs(self.cache, self.cache_keys, batch, results)
+        step = SimulationStep([], [], [])
+        for (strategy_idx, run_idx, *_), result in zip(batch, results):
+            self._finish(step, strategy_idx, run_idx, result)
+        return step
+
+    def complete_event(self):
+        return self.progress.complete_event()
+
+    def _finish(self, step, strategy_idx, run_idx, result):
+        next_runs = self.schedule.record(strategy_idx, result)
+        if next_runs:
+            self.progress.extend(strategy_idx, len(next_runs))
+            self.batches.extend(strategy_idx, len(next_runs))
+        elif self.schedule.stopped[strategy_idx]:
+            self.progress.annotate(strategy_idx, adaptive=self.schedule.summary(strategy_idx))
+        step.events.extend(self.progress.add(strategy_idx, run_idx, result))
+        self._launch(step, next_runs)
+
+    def _launch(self, step, runs):
+        hits, misses, keys = split_cached_runs(self.cache, runs, self.backend_id, self.force_refresh)
+        self.cache_keys.update(keys)
+        step.simulate.extend(misses)
+        # Cached runs are already scored
+        for strategy_idx, run_idx, result in hits:
+            self._finish(step, strategy_idx, run_idx, result)
+            step.score.extend(self.batches.add(strategy_idx))
+
+def error_event(error):
+    return {
+        'type': 'error',
+        'success': False,
+        'error': str(error)
+    }
+
+def sse_event(data, event_id=None):
+    """Encode one Server-Sent Events message (with an `id:` line when `event_id` is set)"""
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+# Sent on idle streams so proxies keep the connection open
+SSE_KEEPALIVE = ": keepalive\n\n"
+
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no',
+    'Connection': 'keep-alive'
+}
+
+def simulation_events(data):
+    """Yield the stream events of one simulation request (needs an app context)
+
+    Runs go through a two-stage pipeline: courtroom simulations (the n8n webhook
+    or in-process agents, per `simulation.backend`) on
+    a pool of `simulation.max_concurrency` workers, and GPT-4o scoring on its own
+    pool of `simulation.scoring_concurrency` workers, so a run's transcript is
+    scored while the next simulations are already running. `simulation.scoring_batch`
+    scores each run on its own (`run`) or all runs of a strategy / of the request
+    in one call (`strategy`, `request`). With `adaptive` (request) or
+    `simulation.adaptive.enabled`, strategies get further rounds of runs until
+    their ranking is settled (see SimulationSchedule). Closing the generator
+    drops queued work.
+    """
+    strategies = data.get('strategies', [])
+    simulation_config = load_app_config().get('simulation', {}) or {}
+    max_workers = max(1, int(simulation_config.get('max_concurrency', 6)))
+    scoring_workers = max(1, int(simulation_config.get('scoring_concurrency', 4)))
+    flask_app = current_app._get_current_object()
+    
+    def in_app_context(function):
+        # Worker threads need the app context for injected services and config
+        def run(*args):
+            with flask_app.app_context():
+                return function(*args)
+        return run
+    
+    simulations = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='simulation')
+    scoring = ThreadPoolExecutor(max_workers=scoring_workers, thread_name_prefix='scoring')
     try:
-        data = request.json
-        simulation_results = data.get('simulationResults', [])
-        case_facts = data.get('caseFacts', '')
+        # Load judge and state attorney characteristics
+        judge_chars = load_judge_characteristics(data.get('judgeName', ''))
+        state_attorney_chars = load_state_attorney_characteristics(data.get('stateAttorneyName', ''))
         
-        if not simulation_results:
-            return jsonify({
-                'success': False,
-                'error': 'No simulation results provided'
-            }), 400
+        backend = get_simulation_backend(simulation_config)
+        
+        pipeline = SimulationPipeline(
+            strategies,
+            SimulationPrompts(data.get('caseFacts', ''), data.get('extractedText', ''), judge_chars, state_attorney_chars),
+            simulation_config,
+            backend.identity,
+            cache=get_simulation_cache(),
+            force_refresh=bool(data.get('forceRefresh', False)),
+            adaptive=adaptive_settings(simulation_config, data)
+        )
+        pending = {}
+        
+        def submit(step):
+            for strategy_idx, run_idx, strategy_title, run_id, variation, prompts in step.simulate:
+                future = simulations.submit(in_app_context(backend.simulate), run_id, variation, prompts)
+                pending[future] = ('transcript', (strategy_idx, run_idx, strategy_title, run_id, variation))
+            for batch in step.score:
+                pending[scoring.submit(in_app_context(score_runs), batch)] = ('scored', batch)
+            return step.events
         
-        # Find the best performing strategy
-        best_strategy = max(simulation_results, key=lambda s: s.get('averageScore', 0))
+        # Submit every strategy x variation simulation that is not cached up front
+        yield from submit(pipeline.start())
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, info = pending.pop(future)
+                if stage == 'scored':
+                    yield from submit(pipeline.scored(info, future.result()))
+                else:
+                    yield from submit(pipeline.transcript(info, future.result()))
         
-        # Find the best run within that strategy
-        best_run = max(best_strategy.get('runs', []), key=lambda r: r.get('score', 0))
+        # Send final completion message
+        yield pipeline.complete_event()
         
-        # Build prompt for memorandum generation
-        prompt = f"""
+    except Exception as e:
+        print(f"Error running simulations: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        yield error_event(e)
+    finally:
+        simulations.shutdown(wait=False, cancel_futures=True)
+        scoring.shutdown(wait=False, cancel_futures=True)
+
+# Simulation jobs, created on first use from `simulation.jobs` in config.yaml (changes apply after a restart)
+_simulation_jobs = None
+_simulation_jobs_lock = threading.Lock()
+
+def get_simulation_jobs():
+    """Return the process-wide simulation job runner (an injected `simulation_jobs` service if set)"""
+    global _simulation_jobs
+    injected = get_service('simulation_jobs')
+    if injected is not None:
+        return injected
+    if _simulation_jobs is None:
+        with _simulation_jobs_lock:
+            if _simulation_jobs is None:
+                settings = (load_app_config().get('simulation', {}) or {}).get('jobs', {}) or {}
+                retention_hours = settings.get('retention_hours', 24)
+                _simulation_jobs = SimulationJobs(
+                    JobStore(Path(__file__).parent / settings.get('database', 'data/jobs/simulations.sqlite3')),
+                    workers=settings.get('workers', 16),
+                    retention=float(retention_hours) * 3600 if retention_hours else None
+                )
+    return _simulation_jobs
+
+def simulation_keepalive_seconds():
+    settings = (load_app_config().get('simulation', {}) or {}).get('jobs', {}) or {}
+    return float(settings.get('keepalive_seconds', 15))
+
+def resume_point(jobs, last_event_id, job_id=None):
+    """`(job_id, seq)` to continue a stream from, given a `Last-Event-ID` (`<job_id>:<seq>`)
+
+    Raises ValueError for a malformed id and LookupError for an unknown job.
+    """
+    event_job_id, seq = parse_event_id(last_event_id)
+    if job_id and event_job_id and event_job_id != job_id:
+        raise ValueError(f"Event id {last_event_id} belongs to another job")
+    job_id = job_id or event_job_id
+    if not job_id or jobs.get(job_id) is None:
+        raise LookupError(f"Unknown simulation job: {job_id}")
+    return job_id, seq
+
+def job_stream(jobs, job_id, seq=0):
+    """SSE messages of a job after event `seq`: the stored ones, then live ones until the job ends"""
+    keepalive = simulation_keepalive_seconds()
+    while True:
+        active = jobs.is_active(job_id)
+        for seq, event in jobs.events_after(job_id, seq):
+            yield sse_event(event, format_event_id(job_id, seq))
+        if not active:
+            return
+        if not jobs.wait(job_id, seq, keepalive):
+            yield SSE_KEEPALIVE
+
+def job_stream_response(jobs, job_id, seq=0):
+    return Response(
+        stream_with_context(job_stream(jobs, job_id, seq)),
+        mimetype='text/event-stream',
+        headers={**SSE_HEADERS, 'X-Simulation-Job-Id': job_id}
+    )
+
+def run_in_app_context(flask_app, generator_function, *args):
+    """Iterate a generator that needs an app context from a thread without one"""
+    with flask_app.app_context():
+        yield from generator_function(*args)
+
+@api.route('/api/run-simulations', methods=['POST'])
+def run_simulations():
+    """Run multiple simulations for each strategy (n8n webhook or in-process agents) with streaming results
+
+    The request becomes a simulation job (see simulation_events for the
+    pipeline) executed on the job worker pool (`simulation.jobs.workers`); its
+    events are stored in SQLite and streamed from there, each with an SSE id
+    `<job_id>:<seq>`. A dropped connection does not stop the job: repeating the
+    request with a `Last-Event-ID` header replays the missed events and follows
+    the job (the body is ignored then), as does
+    GET /api/simulation-jobs/<job_id>/events.
+
+    Each run streams a provisional `run_transcript` event, then `run_scored`, in
+    completion order and tagged with its runId; a strategy's `strategy_complete`
+    follows as soon as all of its runs are scored. Runs found in the simulation
+    cache (same prompts, variation and models) stream a single `run_scored`
+    flagged `cached` right away; `forceRefresh: true` bypasses the cache. Each
+    open stream holds a worker thread for its whole duration; `asgi.py` serves
+    the same endpoint on asyncio.
+    """
+    jobs = get_simulation_jobs()
+    last_event_id = request.headers.get('Last-Event-ID')
+    if last_event_id:
+        try:
+            job_id, seq = resume_point(jobs, last_event_id)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except LookupError as e:
+            return jsonify({'success': False, 'error': str(e)}), 404
+        return job_stream_response(jobs, job_id, seq)
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Request body must be a JSON object'
+        }), 400
+    if not data.get('strategies'):
+        return jsonify({
+            'success': False,
+            'error': 'No strategies provided'
+        }), 400
+    
+    job_id = jobs.create(data)
+    flask_app = current_app._get_current_object()
+    jobs.submit(job_id, lambda: run_in_app_context(flask_app, simulation_events, data))
+    return job_stream_response(jobs, job_id)
+
+@api.route('/api/simulation-jobs/<job_id>', methods=['GET'])
+def get_simulation_job(job_id):
+    """Status of a simulation job (`queued`, `running`, `complete`, `failed`, `cancelled`, `interrupted`)"""
+    job = get_simulation_jobs().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f"Unknown simulation job: {job_id}"}), 404
+    return jsonify({'success': True, 'job': job})
+
+@api.route('/api/simulation-jobs/<job_id>/events', methods=['GET'])
+def get_simulation_job_events(job_id):
+    """Stream a job's events after `Last-Event-ID` (header or `lastEventId` query parameter); EventSource-compatible"""
+    jobs = get_simulation_jobs()
+    try:
+        job_id, seq = resume_point(
+            jobs, request.headers.get('Last-Event-ID') or request.args.get('lastEventId'), job_id
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    return job_stream_response(jobs, job_id, seq)
+
+@api.route('/api/simulation-jobs/<job_id>', methods=['DELETE'])
+def cancel_simulation_job(job_id):
+    """Cancel a running simulation job (takes effect at its next event)"""
+    jobs = get_simulation_jobs()
+    if jobs.get(job_id) is None:
+        return jsonify({'success': False, 'error': f"Unknown simulation job: {job_id}"}), 404
+    if not jobs.cancel(job_id):
+        return jsonify({'success': False, 'error': 'Simulation job is not running'}), 409
+    return jsonify({'success': True, 'jobId': job_id})
+
+MEMORANDUM_MODEL = "gpt-4o-2024-08-06"
+# Sections the memorandum prompt asks for, in order (section events of the streaming endpoint)
+MEMORANDUM_SECTIONS = (
+    'EXECUTIVE SUMMARY',
+    'CASE OVERVIEW',
+    'RECOMMENDED STRATEGY',
+    'SUPPORTING ARGUMENTS',
+    'ANTICIPATED OPPOSITION',
+    'RISK ANALYSIS',
+    'NEXT STEPS'
+)
+
+def memorandum_request_error(data):
+    """Validation error for a memorandum request body, or None"""
+    if not isinstance(data, dict):
+        return 'Request body must be a JSON object'
+    if not data.get('simulationResults'):
+        return 'No simulation results provided'
+    return None
+
+def best_simulation(simulation_results):
+    """`(best strategy, best run within it)` of the simulation results"""
+    # Find the best performing strategy
+    best_strategy = max(simulation_results, key=lambda s: s.get('averageScore', 0))
+    
+    # Find the best run within that strategy
+    best_run = max(best_strategy.get('runs', []), key=lambda r: r.get('score', 0))
+    return best_strategy, best_run
+
+def memorandum_request(case_facts, best_strategy, best_run):
+    """Chat completion request for the memorandum on the best strategy and run"""
+    prompt = f"""
 You are an expert legal strategist. Generate a comprehensive legal strategy memorandum based on the following simulation results.
 
 CASE FACTS:
@@ -891,22 +2116,64 @@ Generate a professional legal strategy memorandum with the following sections:
 
 Format the memorandum professionally with clear sections. Use legal terminology appropriately. Base all recommendations on the actual arguments and results from the simulation.
 """
+    
+    return dict(
+        model=MEMORANDUM_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are an expert legal strategist who writes clear, professional legal memoranda based on case analysis and simulation results."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        temperature=0.7,
+        max_tokens=3000
+    )
+
+def memorandum_summary(best_strategy, best_run):
+    """The `bestStrategy` / `bestRun` fields of a memorandum response"""
+    return {
+        'bestStrategy': {
+            'title': best_strategy.get('strategyTitle', ''),
+            'averageScore': best_strategy.get('averageScore', 0),
+            'winsCount': best_strategy.get('winsCount', 0),
+            'totalRuns': len(best_strategy.get('runs', []))
+        },
+        'bestRun': {
+            'variation': best_run.get('variation', ''),
+            'score': best_run.get('score', 0),
+            'defenseArgument': best_run.get('defenseArgument', ''),
+            'judgmentSummary': best_run.get('judgmentSummary', '')
+        }
+    }
+
+@api.route('/api/generate-memorandum', methods=['POST'])
+def generate_memorandum():
+    """Generate strategy memorandum based on best simulation result
+
+    The answer goes through the LLM response cache, so a repeated request gets
+    the same memorandum; `forceRefresh: true` bypasses the cache and generates
+    a new one. /api/generate-memorandum/stream streams the memorandum while it
+    is generated (never cached).
+    """
+    try:
+        data = request.get_json(silent=True)
+        error = memorandum_request_error(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        best_strategy, best_run = best_simulation(data['simulationResults'])
+        force_refresh = bool(data.get('forceRefresh', False))
         
         # Call OpenAI to generate the memorandum
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert legal strategist who writes clear, professional legal memoranda based on case analysis and simulation results."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=3000
+        response = llm_client(cache=not force_refresh).chat.completions.create(
+            **memorandum_request(data.get('caseFacts', ''), best_strategy, best_run)
         )
         
         memorandum_text = response.choices[0].message.content
@@ -914,18 +2181,7 @@ Format the memorandum professionally with clear sections. Use legal terminology
         return jsonify({
             'success': True,
             'memorandum': memorandum_text,
-            'bestStrategy': {
-                'title': best_strategy.get('strategyTitle', ''),
-                'averageScore': best_strategy.get('averageScore', 0),
-                'winsCount': best_strategy.get('winsCount', 0),
-                'totalRuns': len(best_strategy.get('runs', []))
-            },
-            'bestRun': {
-                'variation': best_run.get('variation', ''),
-                'score': best_run.get('score', 0),
-                'defenseArgument': best_run.get('defenseArgument', ''),
-                'judgmentSummary': best_run.get('judgmentSummary', '')
-            }
+            **memorandum_summary(best_strategy, best_run)
         })
         
     except Exception as e:
@@ -937,10 +2193,188 @@ Format the memorandum professionally with clear sections. Use legal terminology
             'error': str(e)
         }), 500
 
-@app.route('/health', methods=['GET'])
+def memorandum_events(simulation_results, case_facts):
+    """Yield the stream events of one memorandum generation (needs an app context)
+
+    `start` carries the best strategy and run right away; the memorandum
+    follows as `token` events (text deltas, as the model produces them), with a
+    `section` event once each heading line of MEMORANDUM_SECTIONS is complete
+    (`offset` is where the heading starts in the memorandum text). `complete`
+    carries the payload /api/generate-memorandum returns.
+    """
+    try:
+        best_strategy, best_run = best_simulation(simulation_results)
+        summary = memorandum_summary(best_strategy, best_run)
+        yield {'type': 'start', **summary}
+        
+        sections = SectionTracker(MEMORANDUM_SECTIONS)
+        parts = []
+        request_body = memorandum_request(case_facts, best_strategy, best_run)
+        for chunk in get_llm_gateway().chat_stream(get_openai_client(), request_body):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            yield {'type': 'token', 'text': delta}
+            for section in sections.feed(delta):
+                yield {'type': 'section', **section}
+        for section in sections.close():
+            yield {'type': 'section', **section}
+        
+        yield {'type': 'complete', 'success': True, 'memorandum': ''.join(parts), **summary}
+    except Exception as e:
+        print(f"Error streaming memorandum: {str(e)}")
+        yield error_event(e)
+
+@api.route('/api/generate-memorandum/stream', methods=['POST'])
+def stream_memorandum():
+    """Generate the strategy memorandum as Server-Sent Events, token by token with section events (see memorandum_events)"""
+    data = request.get_json(silent=True)
+    error = memorandum_request_error(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    events = memorandum_events(data['simulationResults'], data.get('caseFacts', ''))
+    return Response(
+        stream_with_context(sse_event(event) for event in events),
+        mimetype='text/event-stream',
+        headers=SSE_HEADERS
+    )
+
+@api.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Runtime statistics of the process-wide rate limiters, LLM gateway, circuit breakers, n8n webhook client, courtroom agents, caches, simulation jobs and (under asgi.py) simulation streams"""
+    streams = current_app.extensions.get('simulation_streams')
+    simulation_cache = get_simulation_cache()
+    strategy_cache = get_strategy_cache()
+    return jsonify({
+        'success': True,
+        'rateLimits': rate_limiters.stats(),
+        'llm': get_llm_gateway().stats(),
+        'circuitBreakers': circuit_breakers.stats(),
+        'webhook': webhook_client_stats(),
+        'courtroomAgents': courtroom_agent_stats(),
+        'simulationStreams': streams.stats() if streams else None,
+        'simulationJobs': get_simulation_jobs().stats(),
+        'caches': {
+            'caseItems': case_serializer.cache.stats(),
+            'resultSets': result_sets.cache.stats(),
+            'strategies': strategy_cache.stats() if strategy_cache else None,
+            'simulationRuns': simulation_cache.stats() if simulation_cache else None
+        }
+    })
+
+@api.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    return jsonify({'status': 'healthy'})
+    """Health check endpoint (includes startup timings and warm-up state)"""
+    startup = current_app.extensions.get('startup')
+    return jsonify({
+        'status': 'healthy',
+        'startup': startup.as_dict() if startup else None
+    })
+
+# Warm-up phases, in order: heavy imports first, then the in-memory indexes
+WARM_UP_PHASES = (
+    ('openai', get_openai_client),
+    ('requests', lambda: __import__('requests')),
+    ('pdf', import_pdf_reader),
+    ('weaviate', import_weaviate),
+    ('case_registry', lambda: case_registry.get()),
+    ('case_search', lambda: get_case_search()),
+    ('profiles', lambda: [profile_store.get(name) for name in (JUDGE_PROFILES_FILE, STATE_ATTORNEY_PROFILES_FILE)])
+)
+
+class StartupReport:
+    """Boot and warm-up timings for one application instance"""
+
+    def __init__(self, import_seconds, budget_seconds):
+        self.import_seconds = import_seconds
+        self.create_seconds = None
+        self.budget_seconds = budget_seconds
+        self.warm_up_mode = 'off'
+        self.phases = {}
+        self.errors = {}
+        self.ready = threading.Event()
+
+    @property
+    def boot_seconds(self):
+        return self.import_seconds + (self.create_seconds or 0.0)
+
+    def as_dict(self):
+        return {
+            'importSeconds': round(self.import_seconds, 4),
+            'createSeconds': round(self.create_seconds or 0.0, 4),
+            'bootSeconds': round(self.boot_seconds, 4),
+            'budgetSeconds': self.budget_seconds,
+            'warmUp': self.warm_up_mode,
+            'warm': self.ready.is_set(),
+            'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            'errors': dict(self.errors)
+        }
+
+def run_warm_up(report, logger):
+    """Run every warm-up phase, recording its duration; failures are logged, not raised"""
+    for name, phase in WARM_UP_PHASES:
+        started = time.perf_counter()
+        try:
+            phase()
+        except (Exception, SystemExit) as e:
+            report.errors[name] = str(e)
+            logger.warning("Warm-up phase %s failed: %s", name, e)
+        report.phases[name] = time.perf_counter() - started
+    report.ready.set()
+    logger.info("Warm-up finished in %.2fs", sum(report.phases.values()))
+
+def create_app(warm_up=None, services=None):
+    """Application factory
+
+    `warm_up` is `sync` (warm before returning), `background` (warm in a daemon
+    thread while the app starts serving) or `off` (tests, CLI tools). It defaults
+    to the WARM_UP environment variable, then `startup.warm_up` in config.yaml.
+    `services` overrides external clients (see get_service).
+    """
+    started = time.perf_counter()
+    startup_config = load_app_config().get('startup', {}) or {}
+    warm_up = (warm_up or os.getenv('WARM_UP') or startup_config.get('warm_up') or 'background').lower()
+    if warm_up not in ('sync', 'background', 'off'):
+        raise ValueError(f"Unsupported warm_up mode: {warm_up}")
+
+    flask_app = Flask(__name__)
+    CORS(flask_app, expose_headers=['X-Simulation-Job-Id'])
+    flask_app.register_blueprint(api)
+    flask_app.extensions['services'] = dict(services or {})
+
+    report = StartupReport(_IMPORT_SECONDS, startup_config.get('budget_seconds'))
+    report.warm_up_mode = warm_up
+    flask_app.extensions['startup'] = report
+    report.create_seconds = time.perf_counter() - started
+    if report.budget_seconds and report.boot_seconds > float(report.budget_seconds):
+        flask_app.logger.warning(
+            "Startup took %.2fs, over the %.2fs budget", report.boot_seconds, float(report.budget_seconds)
+        )
+
+    if warm_up == 'sync':
+        run_warm_up(report, flask_app.logger)
+    elif warm_up == 'background':
+        threading.Thread(target=run_warm_up, args=(report, flask_app.logger), name='warm-up', daemon=True).start()
+    return flask_app
+
+_default_app = None
+_default_app_lock = threading.Lock()
+
+def __getattr__(name):
+    """Build the default `app` on first access, so `app:app` works for WSGI servers"""
+    global _default_app
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _default_app_lock:
+        if _default_app is None:
+            _default_app = create_app()
+    return _default_app
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    create_app(warm_up='sync').run(debug=True, port=5000)
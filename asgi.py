@@ -0,0 +1,513 @@
+"""
+ASGI entry point: simulation streams on asyncio, every other route through Flask.
+
+`POST /api/run-simulations` keeps its connection open for minutes while the
+n8n webhook and GPT-4o work through every strategy x variation. Under WSGI each
+open stream pins a worker thread; here a stream is a coroutine and its runs are
+tasks on the event loop, so one process holds hundreds of concurrent streams.
+The event schema (`run_transcript`, `run_scored`, `strategy_complete`, `complete`,
+`error`) is the one app.py emits; prompts, scoring and aggregation are shared with it.
+
+A request is a simulation job (backend/simulation_jobs.py): it runs as a task
+independent of the connection, its events go to the SQLite job log, and the
+stream (like `GET /api/simulation-jobs/<job_id>/events`) follows that log, so a
+client reconnecting with `Last-Event-ID` gets what it missed.
+
+All other routes are served by the Flask app from `create_app()` on a WSGI
+thread pool (`asgi.wsgi_workers` in config.yaml).
+
+    uvicorn asgi:app --port 5000
+"""
+
+import asyncio
+import json
+import os
+import threading
+import traceback
+import uuid
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+
+import app as server
+from courtroom_agents import AsyncStubLLM
+from simulation_jobs import format_event_id
+
+CORS_HEADERS = [(b'access-control-allow-origin', b'*')]
+
+async def fetch_transcript_async(webhook, n8n_url, run_id, variation, prompts):
+    """Async counterpart of app.fetch_transcript"""
+    try:
+        session_id, payload = server.build_webhook_payload(prompts)
+
+        response = await webhook.post_async(n8n_url, payload, server.get_rate_limiter('n8n'))
+
+        if response.status_code != 200:
+            print(f"n8n webhook error: {response.status_code} - {response.text}")
+            return server.run_error(run_id, variation, f"API error: {response.status_code}")
+
+        return session_id, server.read_transcript(response.json())
+
+    except server.CircuitOpenError as e:
+        print(f"n8n webhook skipped: {str(e)}")
+        return server.circuit_open_error(run_id, variation, webhook, e)
+    except Exception as e:
+        print(f"Error calling n8n webhook: {str(e)}")
+        return server.run_error(run_id, variation, str(e))
+
+class AsyncWebhookSimulationBackend(server.WebhookSimulationBackend):
+    """Async counterpart of app.WebhookSimulationBackend (`webhook` wraps an async HTTP client)"""
+
+    async def simulate(self, run_id, variation, prompts):
+        return await fetch_transcript_async(self.webhook, self.url, run_id, variation, prompts)
+
+class AsyncAgentSimulationBackend(server.AgentSimulationBackend):
+    """Async counterpart of app.AgentSimulationBackend (`agents` on an async client)"""
+
+    async def simulate(self, run_id, variation, prompts):
+        try:
+            session_id = f"session-{uuid.uuid4()}"
+            return session_id, await self.agents.run_async(prompts, server.get_rate_limiter('openai_agents'))
+        except Exception as e:
+            print(f"Error running courtroom agents: {str(e)}")
+            return server.run_error(run_id, variation, str(e))
+
+async def score_simulation_result_async(openai_client, strategy_title, variation, transcript):
+    """Async counterpart of app.score_simulation_result"""
+    try:
+        scoring_request = server.build_scoring_request(
+            strategy_title=strategy_title, variation=variation, **transcript
+        )
+        response = await server.get_llm_gateway().chat_async(
+            openai_client, scoring_request, limiter=server.get_rate_limiter('openai_scoring')
+        )
+        evaluation = server.parse_evaluation(response.choices[0].message.content)
+        server.log_evaluation(strategy_title, variation, evaluation)
+        return evaluation
+
+    except Exception as e:
+        print(f"Error scoring simulation result with GPT-4o: {str(e)}")
+        traceback.print_exc()
+        return server.fallback_evaluation(transcript['winner'])
+
+async def score_run_async(openai_client, strategy_title, run_id, variation, session_id, transcript):
+    """Async counterpart of app.score_run"""
+    evaluation = await score_simulation_result_async(openai_client, strategy_title, variation, transcript)
+    return server.run_result(run_id, variation, session_id, transcript, evaluation)
+
+async def score_simulation_batch_async(openai_client, runs):
+    """Async counterpart of app.score_simulation_batch"""
+    scoring_request = server.build_batch_scoring_request(runs)
+    response = await server.get_llm_gateway().chat_async(
+        openai_client, scoring_request, limiter=server.get_rate_limiter('openai_scoring')
+    )
+    evaluations = server.parse_batch_evaluations(response.choices[0].message.content, [run[0] for run in runs])
+    for (run_id, strategy_title, variation, transcript), evaluation in zip(runs, evaluations):
+        server.log_evaluation(strategy_title, variation, evaluation)
+    return evaluations
+
+async def score_runs_async(openai_client, batch):
+    """Async counterpart of app.score_runs (per-run fallback calls run concurrently)"""
+    if len(batch) > 1:
+        try:
+            evaluations = await score_simulation_batch_async(openai_client, [
+                (run_id, strategy_title, variation, transcript)
+                for _, _, strategy_title, run_id, variation, _, transcript in batch
+            ])
+            return [
+                server.run_result(run_id, variation, session_id, transcript, evaluation)
+                for (_, _, _, run_id, variation, session_id, transcript), evaluation in zip(batch, evaluations)
+            ]
+        except Exception as e:
+            print(f"Batch scoring of {len(batch)} runs failed, scoring them one by one: {str(e)}")
+    return await asyncio.gather(*(
+        score_run_async(openai_client, strategy_title, run_id, variation, session_id, transcript)
+        for _, _, strategy_title, run_id, variation, session_id, transcript in batch
+    ))
+
+async def simulation_events(data, openai_client, backend, cache=None):
+    """Yield the stream events of one /api/run-simulations request
+
+    Same two-stage pipeline as the Flask route: at most `simulation.max_concurrency`
+    courtroom simulations and `simulation.scoring_concurrency` scoring calls (batched
+    per `simulation.scoring_batch`) run at a time per stream; the process-wide rate
+    limiters bound the upstream load. `backend` runs the courtroom simulations
+    (AsyncWebhookSimulationBackend or AsyncAgentSimulationBackend). Runs found in `cache` (a SimulationCache, or
+    None) are streamed as cached `run_scored` events unless `forceRefresh` is set;
+    adaptive requests get further rounds per strategy (app.SimulationSchedule).
+    Closing the generator cancels the work still in flight.
+    """
+    strategies = data.get('strategies', [])
+    simulation_config = server.load_app_config().get('simulation', {}) or {}
+    simulation_slots = asyncio.Semaphore(max(1, int(simulation_config.get('max_concurrency', 6))))
+    scoring_slots = asyncio.Semaphore(max(1, int(simulation_config.get('scoring_concurrency', 4))))
+    pending = {}
+
+    async def simulate(*args):
+        async with simulation_slots:
+            return await backend.simulate(*args)
+
+    async def score(batch):
+        async with scoring_slots:
+            return await score_runs_async(openai_client, batch)
+
+    try:
+        # Profiles may be (re)parsed from disk, keep that off the event loop
+        judge_chars = await asyncio.to_thread(server.load_judge_characteristics, data.get('judgeName', ''))
+        state_attorney_chars = await asyncio.to_thread(
+            server.load_state_attorney_characteristics, data.get('stateAttorneyName', '')
+        )
+
+        pipeline = server.SimulationPipeline(
+            strategies,
+            server.SimulationPrompts(
+                data.get('caseFacts', ''), data.get('extractedText', ''), judge_chars, state_attorney_chars
+            ),
+            simulation_config,
+            backend.identity,
+            cache=cache,
+            force_refresh=bool(data.get('forceRefresh', False)),
+            adaptive=server.adaptive_settings(simulation_config, data)
+        )
+
+        def submit(step):
+            for strategy_idx, run_idx, strategy_title, run_id, variation, prompts in step.simulate:
+                task = asyncio.create_task(simulate(run_id, variation, prompts))
+                pending[task] = ('transcript', (strategy_idx, run_idx, strategy_title, run_id, variation))
+            for batch in step.score:
+                pending[asyncio.create_task(score(batch))] = ('scored', batch)
+            return step.events
+
+        # Cache lookups and writes hit SQLite on disk, keep them off the event loop too
+        for event in submit(await asyncio.to_thread(pipeline.start)):
+            yield event
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage, info = pending.pop(task)
+                advance = pipeline.scored if stage == 'scored' else pipeline.transcript
+                for event in submit(await asyncio.to_thread(advance, info, task.result())):
+                    yield event
+
+        yield pipeline.complete_event()
+
+    except Exception as e:
+        print(f"Error running simulations: {str(e)}")
+        traceback.print_exc()
+        yield server.error_event(e)
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def error_events(error):
+    yield server.error_event(error)
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+def request_header(scope, name):
+    for key, value in scope.get('headers', []):
+        if key.decode('latin-1').lower() == name:
+            return value.decode('latin-1')
+    return None
+
+def query_param(scope, name):
+    values = parse_qs(scope.get('query_string', b'').decode('latin-1')).get(name)
+    return values[0] if values else None
+
+async def send_json(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())] + CORS_HEADERS
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+class SimulationServer:
+    """ASGI application serving /api/run-simulations natively and delegating the rest to Flask"""
+
+    def __init__(self, flask_app):
+        config = server.load_app_config().get('asgi', {}) or {}
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=int(config.get('wsgi_workers', 16)))
+        self.http_max_connections = int(config.get('http_max_connections', 256))
+        self.max_jobs = max(1, int(config.get('max_jobs', 512)))
+        self.services = flask_app.extensions.get('services', {})
+        self._openai_client = None
+        self._http_client = None
+        self._webhook_client = None
+        self._webhook_settings = None
+        self._courtroom_agents = None
+        self._agent_settings = None
+        self.streams_open = 0
+        self.streams_total = 0
+        self._job_slots = None
+        self._job_tasks = set()
+        flask_app.extensions['simulation_streams'] = self
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http' and scope['path'] == '/api/run-simulations' and scope['method'] == 'POST':
+            await self.run_simulations(scope, receive, send)
+        elif scope['type'] == 'http' and scope['method'] == 'GET' and self.job_events_path(scope['path']):
+            await self.job_events(scope, receive, send, self.job_events_path(scope['path']))
+        else:
+            await self.wsgi(scope, receive, send)
+
+    def openai_client(self):
+        """Async OpenAI client (an injected `async_openai` service if set)"""
+        injected = self.services.get('async_openai')
+        if injected is not None:
+            return injected
+        if self._openai_client is None:
+            from openai import AsyncOpenAI
+            self._openai_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self._openai_client
+
+    def simulation_cache(self):
+        """Disk cache of scored runs (an injected `simulation_cache` service if set), or None when disabled"""
+        injected = self.services.get('simulation_cache')
+        if injected is not None:
+            return injected
+        return server.get_simulation_cache()
+
+    def simulation_jobs(self):
+        """Simulation job runner (an injected `simulation_jobs` service if set)"""
+        injected = self.services.get('simulation_jobs')
+        if injected is not None:
+            return injected
+        return server.get_simulation_jobs()
+
+    @staticmethod
+    def job_events_path(path):
+        """Job id of a `/api/simulation-jobs/<job_id>/events` path, else None"""
+        prefix, suffix = '/api/simulation-jobs/', '/events'
+        if path.startswith(prefix) and path.endswith(suffix):
+            job_id = path[len(prefix):-len(suffix)]
+            return job_id if job_id and '/' not in job_id else None
+        return None
+
+    def http_client(self):
+        """Async HTTP client for the n8n webhook (an injected `async_http` service if set)"""
+        injected = self.services.get('async_http')
+        if injected is not None:
+            return injected
+        if self._http_client is None:
+            import httpx
+            self._http_client = httpx.AsyncClient(
+                timeout=120,
+                limits=httpx.Limits(max_connections=self.http_max_connections)
+            )
+        return self._http_client
+
+    def webhook_client(self):
+        """Retrying, circuit-breaking n8n webhook client around `http_client()`, rebuilt when `simulation.webhook` changes"""
+        settings = server.webhook_settings()
+        key = json.dumps(settings, sort_keys=True, default=str)
+        if self._webhook_client is None or self._webhook_settings != key:
+            connect_timeout, read_timeout = server.webhook_timeouts(settings)
+            if self.services.get('async_http') is not None:
+                self._webhook_client = server.build_webhook_client(self.http_client(), (connect_timeout, read_timeout))
+            else:
+                import httpx
+                self._webhook_client = server.build_webhook_client(
+                    self.http_client(),
+                    httpx.Timeout(read_timeout, connect=connect_timeout),
+                    retry_exceptions=(httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError),
+                    pool_stats=lambda: {'maxConnections': self.http_max_connections}
+                )
+            self._webhook_settings = key
+        return self._webhook_client
+
+    def courtroom_agents(self):
+        """In-process courtroom agents on `openai_client()` (or the stub LLM), rebuilt when `simulation.agents` changes"""
+        settings = server.agent_settings()
+        key = json.dumps(settings, sort_keys=True, default=str)
+        if self._courtroom_agents is None or self._agent_settings != key:
+            if settings.get('llm', 'openai') == 'stub':
+                client = AsyncStubLLM(float(settings.get('stub_latency_seconds', 0)))
+            else:
+                client = self.openai_client()
+            # Every turn should be a fresh sample, so agent calls skip the response cache
+            client = server.get_llm_gateway().bind_async(client, cache=False)
+            if self._courtroom_agents is not None:
+                self._courtroom_agents.close()
+            self._courtroom_agents = server.build_courtroom_agents(client, settings)
+            self._agent_settings = key
+        return self._courtroom_agents
+
+    def simulation_backend(self):
+        """The configured simulation backend (`simulation.backend`) for a stream"""
+        simulation_config = server.load_app_config().get('simulation', {}) or {}
+        if server.simulation_backend_name(simulation_config) == 'agents':
+            return AsyncAgentSimulationBackend(self.courtroom_agents(), server.agent_settings().get('llm', 'openai'))
+        return AsyncWebhookSimulationBackend(
+            self.webhook_client(), simulation_config.get('webhook_url') or server.DEFAULT_N8N_URL
+        )
+
+    async def aclose(self):
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        if self._openai_client is not None:
+            await self._openai_client.close()
+        if self._courtroom_agents is not None:
+            self._courtroom_agents.close()
+        self._openai_client = self._http_client = self._webhook_client = self._courtroom_agents = None
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for task in self._job_tasks:
+                    task.cancel()
+                await asyncio.gather(*self._job_tasks, return_exceptions=True)
+                await self.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def run_simulations(self, scope, receive, send):
+        body = await read_body(receive)
+        if body is None:
+            return
+        jobs = self.simulation_jobs()
+        last_event_id = request_header(scope, 'last-event-id')
+        if last_event_id:
+            await self.resume(jobs, last_event_id, None, receive, send)
+            return
+        try:
+            data = json.loads(body or b'null')
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            await send_json(send, 400, {'success': False, 'error': 'Request body must be a JSON object'})
+            return
+        if not data.get('strategies'):
+            await send_json(send, 400, {'success': False, 'error': 'No strategies provided'})
+            return
+
+        job_id = await asyncio.to_thread(jobs.create, data)
+        task = asyncio.create_task(self.run_job(jobs, job_id, data))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+        await self.stream_job(jobs, job_id, 0, receive, send)
+
+    async def job_events(self, scope, receive, send, job_id):
+        last_event_id = request_header(scope, 'last-event-id') or query_param(scope, 'lastEventId')
+        await self.resume(self.simulation_jobs(), last_event_id, job_id, receive, send)
+
+    async def resume(self, jobs, last_event_id, job_id, receive, send):
+        try:
+            job_id, seq = await asyncio.to_thread(server.resume_point, jobs, last_event_id, job_id)
+        except ValueError as e:
+            await send_json(send, 400, {'success': False, 'error': str(e)})
+            return
+        except LookupError as e:
+            await send_json(send, 404, {'success': False, 'error': str(e)})
+            return
+        await self.stream_job(jobs, job_id, seq, receive, send)
+
+    async def run_job(self, jobs, job_id, data):
+        """Job body: the simulation pipeline, at most `asgi.max_jobs` jobs at a time"""
+        if self._job_slots is None:
+            self._job_slots = asyncio.Semaphore(self.max_jobs)
+        async with self._job_slots:
+            try:
+                events = simulation_events(data, self.openai_client(), self.simulation_backend(), self.simulation_cache())
+            except Exception as e:
+                # e.g. an unknown `simulation.backend`; the job still has to end
+                events = error_events(e)
+            await jobs.run_async(job_id, events)
+
+    async def stream_job(self, jobs, job_id, seq, receive, send):
+        """Stream a job's events after `seq` until the job ends or the client goes away (the job keeps running)"""
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/event-stream; charset=utf-8')] + [
+                (name.lower().encode(), value.encode()) for name, value in server.SSE_HEADERS.items()
+            ] + [(b'x-simulation-job-id', job_id.encode())] + CORS_HEADERS
+        })
+
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        def notify():
+            loop.call_soon_threadsafe(wake.set)
+
+        async def pump():
+            position = seq
+            keepalive = server.simulation_keepalive_seconds()
+            while True:
+                wake.clear()
+                active = jobs.is_active(job_id)
+                for position, event in await asyncio.to_thread(jobs.events_after, job_id, position):
+                    message = server.sse_event(event, format_event_id(job_id, position))
+                    await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+                if not active:
+                    break
+                try:
+                    await asyncio.wait_for(wake.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    await send({'type': 'http.response.body', 'body': server.SSE_KEEPALIVE.encode(), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        async def disconnected():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        jobs.add_listener(job_id, notify)
+        self.streams_open += 1
+        self.streams_total += 1
+        streaming = asyncio.create_task(pump())
+        watcher = asyncio.create_task(disconnected())
+        try:
+            await asyncio.wait({streaming, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.streams_open -= 1
+            jobs.remove_listener(job_id, notify)
+            watcher.cancel()
+            if not streaming.done():
+                streaming.cancel()
+            await asyncio.gather(streaming, return_exceptions=True)
+
+    def stats(self):
+        return {
+            'open': self.streams_open,
+            'total': self.streams_total,
+            'jobTasks': len(self._job_tasks),
+            'webhook': self._webhook_client.stats() if self._webhook_client is not None else None,
+            'courtroomAgents': self._courtroom_agents.stats() if self._courtroom_agents is not None else None
+        }
+
+def create_asgi_app(warm_up=None, services=None):
+    """ASGI application factory; `warm_up` and `services` are passed to app.create_app
+
+    Besides the Flask services, `services` may carry `async_openai` (an
+    `openai.AsyncOpenAI`-compatible client) and `async_http` (an
+    `httpx.AsyncClient`-compatible client for the n8n webhook).
+    """
+    return SimulationServer(server.create_app(warm_up=warm_up, services=services))
+
+_default_app = None
+_default_app_lock = threading.Lock()
+
+def __getattr__(name):
+    """Build the default `app` on first access, so `uvicorn asgi:app` works"""
+    global _default_app
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _default_app_lock:
+        if _default_app is None:
+            _default_app = create_asgi_app()
+    return _default_app
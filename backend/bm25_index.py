@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+In-process BM25 keyword index over case captions and syllabi.
+
+Many syllabi are short keyword strings ("reckless driving, manifest weight,
+R.C. 4511.20") that dense embeddings rank poorly, so the keyword index is fused
+with the vector ranking using reciprocal-rank fusion (RRF).
+
+The inverted index is stored in CSR form: for term ``t`` the postings are
+``doc_rows[term_offsets[t]:term_offsets[t + 1]]`` with matching precomputed
+BM25 term weights, so a query is one vectorised add per query term.  It is saved
+as ``<name>.bm25.npz`` plus a ``<name>.bm25.json`` manifest (vocabulary, ids,
+fingerprint) and loads in milliseconds.
+
+Build (or refresh) an index from the command line with::
+
+    python backend/bm25_index.py --input data/reckless_driving_cases.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from text_processing import tokenize
+from vector_index import (
+    DEFAULT_INDEX_DIR,
+    SearchHit,
+    atomic_write,
+    corpus_fingerprint,
+    prepare_corpus,
+    top_k_indices,
+)
+
+BM25_FORMAT_VERSION = 1
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+DEFAULT_RRF_K = 60
+
+
+class BM25Index:
+    """Okapi BM25 over a static corpus with precomputed per-posting weights."""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        vocabulary: List[str],
+        term_offsets: np.ndarray,
+        doc_rows: np.ndarray,
+        weights: np.ndarray,
+        idf: np.ndarray,
+        fingerprint: str,
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ) -> None:
+        self.ids = ids
+        self.vocabulary = vocabulary
+        self.term_offsets = term_offsets
+        self.doc_rows = doc_rows
+        self.weights = weights
+        self.idf = idf
+        self.fingerprint = fingerprint
+        self.k1 = k1
+        self.b = b
+        self._terms = {term: position for position, term in enumerate(vocabulary)}
+        self._rows = {int(case_id): row for row, case_id in enumerate(ids.tolist())}
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    @classmethod
+    def build(
+        cls,
+        cases: Iterable[Dict[str, Any]],
+        *,
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ) -> "BM25Index":
+        ids, texts = prepare_corpus(cases)
+        term_ids: Dict[str, int] = {}
+        postings: List[List[Tuple[int, int]]] = []
+        doc_lengths = np.zeros(len(texts), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths[row] = len(tokens)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                term_id = term_ids.get(token)
+                if term_id is None:
+                    term_id = term_ids[token] = len(postings)
+                    postings.append([])
+                postings[term_id].append((row, count))
+
+        # Sort the vocabulary so the on-disk layout is deterministic.
+        vocabulary = sorted(term_ids)
+        document_count = len(texts)
+        average_length = float(doc_lengths.mean()) if document_count else 0.0
+        length_norm = k1 * (1.0 - b + b * doc_lengths / (average_length or 1.0))
+
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        rows_parts: List[np.ndarray] = []
+        weight_parts: List[np.ndarray] = []
+        idf = np.zeros(len(vocabulary), dtype=np.float32)
+        for position, term in enumerate(vocabulary):
+            entries = np.asarray(postings[term_ids[term]], dtype=np.int64)
+            rows, tf = entries[:, 0], entries[:, 1].astype(np.float32)
+            document_frequency = rows.shape[0]
+            idf[position] = np.log1p((document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            rows_parts.append(rows.astype(np.int32))
+            weight_parts.append(tf * (k1 + 1.0) / (tf + length_norm[rows]))
+            offsets[position + 1] = offsets[position] + document_frequency
+
+        doc_rows = np.concatenate(rows_parts) if rows_parts else np.zeros(0, dtype=np.int32)
+        weights = np.concatenate(weight_parts).astype(np.float32) if weight_parts else np.zeros(0, dtype=np.float32)
+        return cls(
+            np.asarray(ids, dtype=np.int64),
+            vocabulary,
+            offsets,
+            doc_rows,
+            weights,
+            idf,
+            corpus_fingerprint(ids, texts),
+            k1,
+            b,
+        )
+
+    def save(self, directory: Path, name: str) -> None:
+        """Write ``<name>.bm25.npz`` and ``<name>.bm25.json`` atomically."""
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "format": BM25_FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "k1": self.k1,
+            "b": self.b,
+            "vocabulary": self.vocabulary,
+        }
+        atomic_write(
+            directory / f"{name}.bm25.npz",
+            lambda handle: np.savez(
+                handle,
+                ids=self.ids,
+                term_offsets=self.term_offsets,
+                doc_rows=self.doc_rows,
+                weights=self.weights,
+                idf=self.idf,
+            ),
+        )
+        atomic_write(
+            directory / f"{name}.bm25.json",
+            lambda handle: handle.write(json.dumps(manifest).encode("utf-8")),
+        )
+
+    @classmethod
+    def load(cls, directory: Path, name: str) -> "BM25Index":
+        manifest = json.loads((directory / f"{name}.bm25.json").read_text(encoding="utf-8"))
+        if manifest.get("format") != BM25_FORMAT_VERSION:
+            raise ValueError(f"Unsupported BM25 index format in '{directory / name}'.")
+        with np.load(directory / f"{name}.bm25.npz") as arrays:
+            return cls(
+                arrays["ids"],
+                manifest["vocabulary"],
+                arrays["term_offsets"],
+                arrays["doc_rows"],
+                arrays["weights"],
+                arrays["idf"],
+                manifest["fingerprint"],
+                float(manifest["k1"]),
+                float(manifest["b"]),
+            )
+
+    def row_of(self, case_id: int) -> Optional[int]:
+        return self._rows.get(int(case_id))
+
+    def scores(self, query_text: str) -> np.ndarray:
+        """BM25 score of every document for ``query_text``."""
+        scores = np.zeros(len(self), dtype=np.float32)
+        for token in set(tokenize(query_text)):
+            position = self._terms.get(token)
+            if position is None:
+                continue
+            start, end = self.term_offsets[position], self.term_offsets[position + 1]
+            # Rows are unique within one posting list, so fancy-index += is safe.
+            scores[self.doc_rows[start:end]] += self.idf[position] * self.weights[start:end]
+        return scores
+
+    def search(
+        self,
+        query_text: str,
+        k: int,
+        *,
+        exclude: Iterable[int] = (),
+        restrict_to: Optional[Iterable[int]] = None,
+    ) -> List[SearchHit]:
+        """Return up to ``k`` documents with a positive BM25 score, best first."""
+        if len(self) == 0 or k <= 0:
+            return []
+        excluded = {int(case_id) for case_id in exclude}
+        scores = self.scores(query_text)
+        if restrict_to is None:
+            rows = np.arange(len(self))
+            for case_id in excluded:
+                row = self.row_of(case_id)
+                if row is not None:
+                    scores[row] = 0.0
+        else:
+            rows = np.asarray(
+                sorted(
+                    self._rows[int(case_id)]
+                    for case_id in restrict_to
+                    if int(case_id) in self._rows and int(case_id) not in excluded
+                ),
+                dtype=np.int64,
+            )
+            scores = scores[rows]
+        return [
+            SearchHit(case_id=int(self.ids[rows[position]]), row=int(rows[position]), score=float(scores[position]))
+            for position in top_k_indices(scores, k)
+            if scores[position] > 0
+        ]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    *,
+    k: int = DEFAULT_RRF_K,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse several best-first rankings with RRF: ``score(d) = sum w / (k + rank)``.
+
+    Returns ``(key, fused_score)`` pairs, best first.  Ties keep the order in
+    which keys were first seen, so the first ranking acts as the tie-breaker.
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def load_or_build_bm25(
+    cases: Sequence[Dict[str, Any]],
+    *,
+    directory: Path,
+    name: str,
+) -> BM25Index:
+    """Load the prebuilt BM25 index if it matches the corpus, otherwise rebuild and persist it."""
+    ids, texts = prepare_corpus(cases)
+    fingerprint = corpus_fingerprint(ids, texts)
+    try:
+        index = BM25Index.load(directory, name)
+        if index.fingerprint == fingerprint:
+            return index
+        logging.info("BM25 index '%s' is stale; rebuilding.", name)
+    except FileNotFoundError:
+        logging.info("BM25 index '%s' not found; building it.", name)
+    except (ValueError, KeyError, json.JSONDecodeError) as exc:
+        logging.warning("BM25 index '%s' is unreadable (%s); rebuilding.", name, exc)
+
+    index = BM25Index.build(cases)
+    try:
+        index.save(directory, name)
+    except OSError as exc:
+        logging.warning("Could not persist BM25 index '%s': %s", name, exc)
+    return index
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Build the local BM25 keyword index for one or more case datasets.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--input", type=Path, action="append", required=True, help="JSON array of case records (repeatable).")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_INDEX_DIR, help="Index directory.")
+    parser.add_argument("--name", help="Index name (defaults to the input file stems).")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    cases: List[Dict[str, Any]] = []
+    for path in args.input:
+        with path.open("r", encoding="utf-8") as handle:
+            cases.extend(json.load(handle))
+    name = args.name or "+".join(path.stem for path in args.input)
+    index = load_or_build_bm25(cases, directory=args.output_dir, name=name)
+    logging.info("BM25 index '%s' ready: %s cases, %s terms.", name, len(index), len(index.vocabulary))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
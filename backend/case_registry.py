@@ -0,0 +1,229 @@
+"""
+Unified registry of every case dataset under ``data/``.
+
+All ``*_cases.json`` files are merged into one corpus keyed by CourtListener
+``cluster_id``; the offense type is taken from the file name
+(``Disorderly_conduct_cases.json`` -> ``disorderly_conduct``).  A case found in
+several datasets is stored once and tagged with every offense.
+
+The corpus is held as a columnar :class:`~case_table.CaseTable`; dicts are only
+materialised for the rows an endpoint returns.  Facet indexes are built once
+per corpus version so filtered lookups cost O(result) instead of a scan over
+every record:
+  * hash indexes ``facet value -> sorted row positions`` for court, judge and offense;
+  * row positions sorted by ``dateFiled``, range-queried with ``searchsorted``.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from case_table import CaseTable, load_case_table
+from corpus_store import CorpusStore
+
+CASE_FILE_PATTERN = "*_cases.json"
+FACETS = ("court", "judge", "offense")
+
+
+def offense_from_filename(path: Path) -> str:
+    """Derive the offense key from a dataset name, e.g. ``reckless_driving``."""
+    stem = re.sub(r"_cases$", "", path.stem, flags=re.IGNORECASE)
+    return re.sub(r"[^a-z0-9]+", "_", stem.lower()).strip("_")
+
+
+def facet_key(value: Any) -> str:
+    """Normalise a facet value for lookups (case- and whitespace-insensitive)."""
+    return " ".join(str(value or "").split()).lower()
+
+
+def load_case_dataset(path: Path) -> CaseTable:
+    """:class:`CorpusStore` loader that parses a case dataset straight into columns."""
+    return load_case_table(path, offense_from_filename(path))
+
+
+def _group_rows(codes: np.ndarray, vocabulary: List[str]) -> Dict[str, np.ndarray]:
+    """Map each normalised vocabulary value to the sorted rows carrying its code."""
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(vocabulary) + 1))
+    groups: Dict[str, np.ndarray] = {}
+    for code, value in enumerate(vocabulary):
+        rows = order[bounds[code]:bounds[code + 1]]
+        key = facet_key(value)
+        if key in groups:  # values differing only in case/spacing share one key
+            rows = np.union1d(groups[key], rows)
+        groups[key] = rows
+    return groups
+
+
+class CaseRegistry:
+    """Merged case corpus plus precomputed facet and date indexes."""
+
+    def __init__(self, table: CaseTable, version: Tuple[Any, ...] = ()) -> None:
+        self.table = table
+        self.version = version
+
+        self._id_order = np.argsort(table.ids, kind="stable")
+        self._sorted_ids = table.ids[self._id_order]
+
+        offense_rows = {
+            facet_key(name): np.flatnonzero(table.offense_masks & np.uint32(1 << bit))
+            for bit, name in enumerate(table.offense_names)
+        }
+        self.facet_index: Dict[str, Dict[str, np.ndarray]] = {
+            "court": _group_rows(table.courts.codes, table.courts.values),
+            "judge": _group_rows(table.judges.codes, table.judges.values),
+            "offense": offense_rows,
+        }
+        self.facet_labels: Dict[str, Dict[str, str]] = {
+            "court": {facet_key(value): value for value in reversed(table.courts.values)},
+            "judge": {facet_key(value): value for value in reversed(table.judges.values)},
+            "offense": {facet_key(name): name for name in table.offense_names},
+        }
+
+        dated = np.flatnonzero(~np.isnat(table.date_filed))
+        self._date_rows = dated[np.argsort(table.date_filed[dated], kind="stable")]
+        self._sorted_dates = table.date_filed[self._date_rows]
+
+    @classmethod
+    def build(cls, tables: List[CaseTable], version: Tuple[Any, ...] = ()) -> "CaseRegistry":
+        """Merge per-dataset tables (first occurrence of a cluster id wins)."""
+        return cls(CaseTable.concat(tables), version)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def row_of(self, case_id: int) -> Optional[int]:
+        position = int(np.searchsorted(self._sorted_ids, case_id))
+        if position < self._sorted_ids.shape[0] and self._sorted_ids[position] == case_id:
+            return int(self._id_order[position])
+        return None
+
+    def get(self, case_id: int) -> Optional[Dict[str, Any]]:
+        """Materialise one case by cluster id."""
+        row = self.row_of(int(case_id))
+        return None if row is None else self.table.row(row)
+
+    def offenses_of(self, case_id: int) -> List[str]:
+        row = self.row_of(int(case_id))
+        return [] if row is None else self.table.offenses_of(row)
+
+    def iter_cases(self) -> Iterator[Dict[str, Any]]:
+        """Every case in registry (dataset) order, materialised one at a time."""
+        return self.table.iter_rows()
+
+    def all_cases(self) -> List[Dict[str, Any]]:
+        """Every case in registry order as dicts (prefer :meth:`iter_cases` for large corpora)."""
+        return list(self.iter_cases())
+
+    def facet_values(self, name: str) -> Dict[str, int]:
+        """Display label -> case count for one facet."""
+        labels = self.facet_labels[name]
+        return {labels[key]: int(rows.shape[0]) for key, rows in sorted(self.facet_index[name].items())}
+
+    def date_range(self) -> Tuple[Optional[str], Optional[str]]:
+        if self._sorted_dates.shape[0] == 0:
+            return None, None
+        return str(self._sorted_dates[0]), str(self._sorted_dates[-1])
+
+    def rows_in_date_range(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> np.ndarray:
+        """Rows filed within ``[date_from, date_to]`` (ISO dates, inclusive)."""
+        start = np.searchsorted(self._sorted_dates, np.datetime64(date_from, "D"), "left") if date_from else 0
+        end = (
+            np.searchsorted(self._sorted_dates, np.datetime64(date_to, "D"), "right")
+            if date_to
+            else self._sorted_dates.shape[0]
+        )
+        return np.sort(self._date_rows[start:end])
+
+    def filter_rows(
+        self,
+        *,
+        court: Optional[str] = None,
+        judge: Optional[str] = None,
+        offense: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Return the sorted rows matching every given filter, or ``None`` when no filter is set.
+
+        Each filter is a hash or ``searchsorted`` lookup; the result is the
+        intersection of the (smallest-first) candidate row sets.
+        """
+        candidates: List[np.ndarray] = []
+        for name, value in (("court", court), ("judge", judge), ("offense", offense)):
+            if value:
+                candidates.append(self.facet_index[name].get(facet_key(value), np.zeros(0, dtype=np.int64)))
+        if date_from or date_to:
+            candidates.append(self.rows_in_date_range(date_from, date_to))
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        matched = candidates[0]
+        for rows in candidates[1:]:
+            if matched.shape[0] == 0:
+                break
+            matched = np.intersect1d(matched, rows, assume_unique=True)
+        return matched
+
+    def filter_ids(self, **filters: Optional[str]) -> Optional[np.ndarray]:
+        """Cluster ids matching ``filters`` (``None`` when no filter is set)."""
+        rows = self.filter_rows(**filters)
+        return None if rows is None else self.table.ids[rows]
+
+    def filter(self, limit: Optional[int] = None, **filters: Optional[str]) -> List[Dict[str, Any]]:
+        """Materialise up to ``limit`` cases matching ``filters``, in registry order."""
+        rows = self.filter_rows(**filters)
+        if rows is None:
+            rows = np.arange(len(self))
+        return self.table.rows(rows[:limit] if limit is not None else rows)
+
+
+def discover_case_files(data_dir: Path) -> List[Path]:
+    """Every case dataset under ``data_dir`` in a stable order."""
+    return sorted(data_dir.glob(CASE_FILE_PATTERN), key=lambda path: path.name.lower())
+
+
+class CaseRegistryProvider:
+    """
+    Builds the registry from a :class:`CorpusStore` and rebuilds it when any dataset changes.
+
+    The store should use :func:`load_case_dataset` as its loader so that every
+    dataset is held in columnar form.  ``primary`` names the dataset listed
+    first, so unfiltered listings keep showing that offense before the others.
+    """
+
+    def __init__(self, store: CorpusStore, primary: Optional[str] = None) -> None:
+        self.store = store
+        self.primary = primary
+        self._registry: Optional[CaseRegistry] = None
+        self._files: List[Path] = []
+        self._files_checked_at = float("-inf")
+
+    def files(self) -> List[Path]:
+        now = time.monotonic()
+        if now - self._files_checked_at >= self.store.check_interval:
+            files = discover_case_files(self.store.base_dir)
+            if self.primary:
+                files.sort(key=lambda path: path.name != self.primary)
+            self._files = files
+            self._files_checked_at = now
+        return self._files
+
+    def version(self) -> Tuple[Any, ...]:
+        return tuple((path.name, self.store.version(path)) for path in self.files())
+
+    def get(self) -> CaseRegistry:
+        version = self.version()
+        registry = self._registry
+        if registry is not None and registry.version == version:
+            return registry
+        registry = CaseRegistry.build([self.store.get(path) for path in self.files()], version=version)
+        # Single reference swap: concurrent readers see the old or new registry.
+        self._registry = registry
+        return registry
@@ -0,0 +1,319 @@
+"""
+Column-oriented, compact representation of a case corpus.
+
+A list of JSON dicts repeats every key and keeps one Python object per field,
+which does not scale to 100k-case CourtListener pulls.  :class:`CaseTable`
+stores the same records as columns instead:
+
+  * ``ids``          - ``int64`` cluster ids;
+  * ``courts``/``judges`` - interned strings: one ``int32`` code per row plus a
+    small vocabulary list;
+  * ``date_filed``   - ``datetime64[D]`` (``NaT`` when missing or not an ISO date);
+  * ``offense_masks`` - one bit per offense dataset the case appears in;
+  * ``case_names``/``syllabi``/``urls`` - UTF-8 text packed into one contiguous
+    buffer per column with ``int64`` offsets.
+
+Rows are only turned back into dicts (:meth:`CaseTable.row`) for the records an
+endpoint actually returns.  ``benchmarks/bench_case_memory.py`` compares the
+footprint with the list-of-dicts loader.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from text_processing import case_identifier
+
+MAX_OFFENSES = 32
+NAT = np.datetime64("NaT", "D")
+
+
+def parse_dates(values: Iterable[Any]) -> np.ndarray:
+    """``datetime64[D]`` column of ISO dates; missing or unparsable values become ``NaT``."""
+    dates: List[np.datetime64] = []
+    invalid: List[Any] = []
+    for value in values:
+        if not value:
+            dates.append(NAT)
+            continue
+        try:
+            if not isinstance(value, str):
+                raise TypeError(value)
+            dates.append(np.datetime64(value, "D"))
+        except (TypeError, ValueError, OverflowError):
+            invalid.append(value)
+            dates.append(NAT)
+    if invalid:
+        logging.warning(
+            "Ignoring %d unparsable dateFiled value(s) (first: %r); stored as NaT.", len(invalid), invalid[0]
+        )
+    return np.asarray(dates, dtype="datetime64[D]")
+
+
+class StringColumn:
+    """Immutable UTF-8 strings in one buffer, addressed through an offsets array."""
+
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self, buffer: bytes, offsets: np.ndarray) -> None:
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Iterable[Optional[str]]) -> "StringColumn":
+        encoded = [(value or "").encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets)
+
+    def __len__(self) -> int:
+        return int(self.offsets.shape[0] - 1)
+
+    def __getitem__(self, row: int) -> str:
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return self.buffer[start:end].decode("utf-8")
+
+    def take(self, rows: Sequence[int]) -> "StringColumn":
+        view = memoryview(self.buffer)
+        return StringColumn.from_bytes(bytes(view[self.offsets[row]:self.offsets[row + 1]]) for row in rows)
+
+    @classmethod
+    def from_bytes(cls, chunks: Iterable[bytes]) -> "StringColumn":
+        chunks = list(chunks)
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        if chunks:
+            np.cumsum([len(chunk) for chunk in chunks], out=offsets[1:])
+        return cls(b"".join(chunks), offsets)
+
+    @classmethod
+    def concat(cls, columns: Sequence["StringColumn"]) -> "StringColumn":
+        parts = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for column in columns:
+            parts.append(column.offsets[1:] + base)
+            base += len(column.buffer)
+        return cls(b"".join(column.buffer for column in columns), np.concatenate(parts))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + int(self.offsets.nbytes)
+
+
+class InternedColumn:
+    """Low-cardinality strings stored as ``int32`` codes into a vocabulary (-1 = missing)."""
+
+    __slots__ = ("codes", "values", "_lookup")
+
+    def __init__(self, codes: np.ndarray, values: List[str]) -> None:
+        self.codes = codes
+        self.values = values
+        self._lookup = {value: code for code, value in enumerate(values)}
+
+    @classmethod
+    def from_strings(cls, raw_values: Iterable[Optional[str]]) -> "InternedColumn":
+        lookup: Dict[str, int] = {}
+        codes: List[int] = []
+        for raw in raw_values:
+            value = str(raw).strip() if raw not in (None, "") else ""
+            if not value:
+                codes.append(-1)
+                continue
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+            codes.append(code)
+        return cls(np.asarray(codes, dtype=np.int32), list(lookup))
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[0])
+
+    def __getitem__(self, row: int) -> str:
+        code = int(self.codes[row])
+        return self.values[code] if code >= 0 else ""
+
+    def code_of(self, value: str) -> Optional[int]:
+        return self._lookup.get(value)
+
+    def take(self, rows: np.ndarray) -> "InternedColumn":
+        return InternedColumn(self.codes[rows], self.values)
+
+    @classmethod
+    def concat(cls, columns: Sequence["InternedColumn"]) -> "InternedColumn":
+        values: List[str] = []
+        lookup: Dict[str, int] = {}
+        parts: List[np.ndarray] = []
+        for column in columns:
+            remap = np.empty(len(column.values) + 1, dtype=np.int32)
+            remap[-1] = -1  # code -1 indexes the last slot
+            for code, value in enumerate(column.values):
+                new_code = lookup.get(value)
+                if new_code is None:
+                    new_code = lookup[value] = len(values)
+                    values.append(value)
+                remap[code] = new_code
+            parts.append(remap[column.codes])
+        codes = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int32)
+        return cls(codes, values)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes) + sum(len(value) for value in self.values)
+
+
+class CaseTable:
+    """Columnar case corpus; see the module docstring for the layout."""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        case_names: StringColumn,
+        courts: InternedColumn,
+        judges: InternedColumn,
+        date_filed: np.ndarray,
+        syllabi: StringColumn,
+        urls: StringColumn,
+        offense_masks: np.ndarray,
+        offense_names: List[str],
+    ) -> None:
+        self.ids = ids
+        self.case_names = case_names
+        self.courts = courts
+        self.judges = judges
+        self.date_filed = date_filed
+        self.syllabi = syllabi
+        self.urls = urls
+        self.offense_masks = offense_masks
+        self.offense_names = offense_names
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], offense: Optional[str] = None) -> "CaseTable":
+        """Build a table from JSON records, skipping unidentifiable and duplicate cases."""
+        kept: List[Dict[str, Any]] = []
+        ids: List[int] = []
+        seen = set()
+        for record in records:
+            case_id = case_identifier(record)
+            if case_id is None or case_id in seen:
+                continue
+            seen.add(case_id)
+            kept.append(record)
+            ids.append(case_id)
+
+        offense_names = [offense] if offense else []
+        return cls(
+            ids=np.asarray(ids, dtype=np.int64),
+            case_names=StringColumn.from_strings(record.get("caseName") for record in kept),
+            courts=InternedColumn.from_strings(record.get("court") for record in kept),
+            judges=InternedColumn.from_strings(record.get("judge") for record in kept),
+            date_filed=parse_dates(record.get("dateFiled") for record in kept),
+            syllabi=StringColumn.from_strings(record.get("syllabus") for record in kept),
+            urls=StringColumn.from_strings(record.get("absolute_url") for record in kept),
+            offense_masks=np.full(len(kept), 1 if offense else 0, dtype=np.uint32),
+            offense_names=offense_names,
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence["CaseTable"]) -> "CaseTable":
+        """
+        Merge tables into one, keyed by cluster id.
+
+        The first occurrence of a case keeps its row data and position; its
+        offense mask becomes the union over every table the case appears in.
+        """
+        offense_names: List[str] = []
+        mask_parts: List[np.ndarray] = []
+        for table in tables:
+            remapped = np.zeros(len(table), dtype=np.uint32)
+            for bit, name in enumerate(table.offense_names):
+                if name not in offense_names:
+                    if len(offense_names) >= MAX_OFFENSES:
+                        raise ValueError(f"A case table supports at most {MAX_OFFENSES} offense types.")
+                    offense_names.append(name)
+                has_bit = (table.offense_masks >> np.uint32(bit)) & np.uint32(1)
+                remapped |= has_bit.astype(np.uint32) << np.uint32(offense_names.index(name))
+            mask_parts.append(remapped)
+
+        all_ids = np.concatenate([table.ids for table in tables]) if tables else np.zeros(0, dtype=np.int64)
+        all_masks = np.concatenate(mask_parts) if mask_parts else np.zeros(0, dtype=np.uint32)
+        unique_ids, first_rows, inverse = np.unique(all_ids, return_index=True, return_inverse=True)
+        merged_masks = np.zeros(unique_ids.shape[0], dtype=np.uint32)
+        np.bitwise_or.at(merged_masks, inverse, all_masks)
+
+        # Keep first-occurrence order rather than id order.
+        keep = np.sort(first_rows)
+        masks = merged_masks[inverse[keep]]
+        return cls(
+            ids=all_ids[keep],
+            case_names=StringColumn.concat([table.case_names for table in tables]).take(keep),
+            courts=InternedColumn.concat([table.courts for table in tables]).take(keep),
+            judges=InternedColumn.concat([table.judges for table in tables]).take(keep),
+            date_filed=np.concatenate([table.date_filed for table in tables])[keep]
+            if tables
+            else np.zeros(0, dtype="datetime64[D]"),
+            syllabi=StringColumn.concat([table.syllabi for table in tables]).take(keep),
+            urls=StringColumn.concat([table.urls for table in tables]).take(keep),
+            offense_masks=masks,
+            offense_names=offense_names,
+        )
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    def offenses_of(self, row: int) -> List[str]:
+        mask = int(self.offense_masks[row])
+        return [name for bit, name in enumerate(self.offense_names) if mask >> bit & 1]
+
+    def date_of(self, row: int) -> str:
+        value = self.date_filed[row]
+        return "" if np.isnat(value) else str(value)
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Materialise one row as a dict shaped like the source JSON records."""
+        return {
+            "cluster_id": int(self.ids[row]),
+            "absolute_url": self.urls[row],
+            "caseName": self.case_names[row],
+            "court": self.courts[row],
+            "dateFiled": self.date_of(row),
+            "judge": self.judges[row],
+            "syllabus": self.syllabi[row],
+        }
+
+    def rows(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.row(int(row)) for row in rows]
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield every row as a dict, one at a time (for index builds)."""
+        for row in range(len(self)):
+            yield self.row(row)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            int(self.ids.nbytes)
+            + self.case_names.nbytes
+            + self.courts.nbytes
+            + self.judges.nbytes
+            + int(self.date_filed.nbytes)
+            + self.syllabi.nbytes
+            + self.urls.nbytes
+            + int(self.offense_masks.nbytes)
+        )
+
+
+def load_case_table(path: Path, offense: Optional[str] = None) -> CaseTable:
+    """
+    Parse a JSON case dataset straight into a :class:`CaseTable`.
+
+    The intermediate dicts are dropped as soon as the columns are built, so
+    only the compact representation stays resident.
+    """
+    with path.open("r", encoding="utf-8") as handle:
+        records = json.load(handle)
+    return CaseTable.from_records(records, offense)
@@ -0,0 +1,150 @@
+"""
+Shared, read-only in-process store for the JSON datasets under ``data/``.
+
+Each dataset is parsed once and served from memory.  The store re-checks the
+file's ``(mtime, size)`` signature at most once per ``check_interval`` seconds
+and, when it changed, parses the new file completely before swapping it in, so
+readers only ever observe the old or the new payload, never a partial one.
+
+Payloads are shared between requests and threads: callers must treat them as
+read-only and copy anything they intend to modify.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+DEFAULT_CHECK_INTERVAL = 1.0
+
+FileSignature = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class CorpusEntry:
+    path: Path
+    signature: FileSignature
+    data: Any
+    loaded_at: float
+
+
+def file_signature(path: Path) -> FileSignature:
+    """Return the ``(mtime_ns, size)`` pair used to detect on-disk changes."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_json_file(path: Path) -> Any:
+    """Parse a JSON document from disk."""
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+class CorpusStore:
+    """Load-once cache of JSON datasets with mtime/size based hot reload."""
+
+    def __init__(
+        self,
+        base_dir: Union[str, Path],
+        *,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        loader: Callable[[Path], Any] = load_json_file,
+    ) -> None:
+        self.base_dir = Path(base_dir)
+        self.check_interval = check_interval
+        self._loader = loader
+        self._entries: Dict[Path, CorpusEntry] = {}
+        self._checked_at: Dict[Path, float] = {}
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def resolve(self, name: Union[str, Path]) -> Path:
+        """Resolve a dataset name relative to the store's base directory."""
+        path = Path(name)
+        if not path.is_absolute():
+            path = self.base_dir / path
+        return path
+
+    def get(self, name: Union[str, Path]) -> Any:
+        """Return the parsed dataset, reloading it only if the file changed."""
+        return self.entry(name).data
+
+    def entry(self, name: Union[str, Path]) -> CorpusEntry:
+        """Return the cached entry (payload plus signature) for a dataset."""
+        path = self.resolve(name)
+        entry = self._entries.get(path)
+        now = time.monotonic()
+        if entry is not None and now - self._checked_at.get(path, 0.0) < self.check_interval:
+            return entry
+
+        signature = file_signature(path)
+        if entry is not None and entry.signature == signature:
+            self._checked_at[path] = now
+            return entry
+
+        with self._lock_for(path):
+            # Another thread may have finished the reload while we waited.
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                self._checked_at[path] = now
+                return entry
+            entry = self._load(path, signature)
+            self._entries[path] = entry
+            self._checked_at[path] = now
+            return entry
+
+    def version(self, name: Union[str, Path]) -> FileSignature:
+        """Return the signature of the currently served payload."""
+        return self.entry(name).signature
+
+    def invalidate(self, name: Optional[Union[str, Path]] = None) -> None:
+        """Drop one (or every) cached dataset so the next access reloads it."""
+        if name is None:
+            self._entries.clear()
+            self._checked_at.clear()
+            return
+        path = self.resolve(name)
+        self._entries.pop(path, None)
+        self._checked_at.pop(path, None)
+
+    def _load(self, path: Path, signature: FileSignature) -> CorpusEntry:
+        started = time.perf_counter()
+        # ``signature`` was taken before parsing: if the file is rewritten while
+        # we read it, the next check sees a mismatch and reloads again.
+        data = self._loader(path)
+        logging.info(
+            "Loaded dataset '%s' in %.1f ms.", path.name, (time.perf_counter() - started) * 1000
+        )
+        return CorpusEntry(path=path, signature=signature, data=data, loaded_at=time.time())
+
+    def _lock_for(self, path: Path) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(path)
+            if lock is None:
+                lock = self._locks[path] = threading.Lock()
+            return lock
+
+
+def load_yaml_file(path: Path) -> Any:
+    """Parse a YAML document from disk, expanding ``${ENV}`` references."""
+    import yaml
+
+    with path.open("r", encoding="utf-8") as handle:
+        data = yaml.safe_load(handle) or {}
+    return _expand_env(data)
+
+
+def _expand_env(value: Any) -> Any:
+    if isinstance(value, str):
+        return os.path.expandvars(value)
+    if isinstance(value, list):
+        return [_expand_env(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _expand_env(val) for key, val in value.items()}
+    return value
@@ -0,0 +1,312 @@
+"""
+In-process courtroom simulations: the lawyer, opponent and judge agents of the
+n8n workflow, run directly against an OpenAI-compatible chat client.
+
+A run follows the hearing the judge prompt describes:
+
+  1. openings - the defense lawyer and the State Attorney each argue their
+     side; neither sees the other's argument yet, so both turns run at once;
+  2. ``rounds - 1`` rebuttal rounds - each side answers the other's previous
+     argument; the two turns of a round again run at once;
+  3. verdict - the judge hears both sides and returns the winner and a
+     judgment summary as structured output.
+
+A run therefore waits for ``rounds + 1`` LLM round trips instead of
+``2 * rounds + 1``.  :meth:`CourtroomAgents.run` drives a sync client (the
+turns of a round share a thread pool), :meth:`CourtroomAgents.run_async` an
+``openai.AsyncOpenAI``-compatible one.  Both return the transcript in the
+shape ``app.read_transcript`` extracts from an n8n response.
+
+:class:`StubLLM` / :class:`AsyncStubLLM` answer deterministically from a hash of
+the request (no network, optional simulated latency), so the whole simulation
+pipeline can be exercised and benchmarked offline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
+
+DEFENSE = "Defense"
+PLAINTIFF = "Plaintiff"
+
+OPENING_INSTRUCTION = "The court calls on you to present your argument. Address the court directly."
+
+REBUTTAL_TEMPLATE = """Opposing counsel argued:
+
+{argument}
+
+Respond to this argument and reinforce your position."""
+
+VERDICT_TEMPLATE = """You have heard both sides.
+
+DEFENSE (LawyerAgent):
+{defense}
+
+STATE ATTORNEY (OpponentAgent):
+{plaintiff}
+
+Deliver your verdict: the winner (Plaintiff or Defense) and a judgment summary explaining your reasoning."""
+
+VERDICT_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "courtroom_verdict",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "winner": {"type": "string", "enum": [DEFENSE, PLAINTIFF]},
+                "judgment_summary": {"type": "string"},
+            },
+            "required": ["winner", "judgment_summary"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+Request = Dict[str, Any]
+
+
+def message(role: str, content: str) -> Dict[str, str]:
+    return {"role": role, "content": content}
+
+
+def read_verdict(content: str) -> Tuple[str, str]:
+    """``(winner, judgment_summary)`` from the judge's structured answer."""
+    verdict = json.loads(content)
+    winner = verdict.get("winner")
+    if winner not in (DEFENSE, PLAINTIFF):
+        raise ValueError(f"Judge returned no valid winner: {winner!r}")
+    return winner, str(verdict.get("judgment_summary", ""))
+
+
+def completion_text(response: Any) -> str:
+    return response.choices[0].message.content or ""
+
+
+class CourtroomAgents:
+    """Runs courtroom hearings with ``client`` (``chat.completions.create``)."""
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        *,
+        rounds: int = 1,
+        temperature: float = 0.7,
+        max_tokens: int = 700,
+        turn_workers: int = 8,
+    ) -> None:
+        if rounds < 1:
+            raise ValueError("rounds must be at least 1")
+        self.client = client
+        self.model = model
+        self.rounds = int(rounds)
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self._turns = ThreadPoolExecutor(max_workers=max(1, int(turn_workers)), thread_name_prefix="courtroom")
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.llm_calls = 0
+
+    def _request(self, messages: List[Dict[str, str]], response_format: Optional[Dict[str, Any]] = None) -> Request:
+        request: Request = dict(
+            model=self.model, messages=list(messages), temperature=self.temperature, max_tokens=self.max_tokens
+        )
+        if response_format is not None:
+            request["response_format"] = response_format
+        return request
+
+    def _hearing(self, prompts: Sequence[str]) -> Generator[List[Request], List[str], Dict[str, str]]:
+        """The hearing protocol: yields each step's requests (independent of each other), receives their answers."""
+        lawyer_prompt, opponent_prompt, judge_prompt = prompts
+        defense = [message("system", lawyer_prompt), message("user", OPENING_INSTRUCTION)]
+        plaintiff = [message("system", opponent_prompt), message("user", OPENING_INSTRUCTION)]
+        defense_arguments: List[str] = []
+        plaintiff_arguments: List[str] = []
+        for round_idx in range(self.rounds):
+            defense_argument, plaintiff_argument = yield [self._request(defense), self._request(plaintiff)]
+            defense_arguments.append(defense_argument)
+            plaintiff_arguments.append(plaintiff_argument)
+            defense.append(message("assistant", defense_argument))
+            plaintiff.append(message("assistant", plaintiff_argument))
+            if round_idx + 1 < self.rounds:
+                defense.append(message("user", REBUTTAL_TEMPLATE.format(argument=plaintiff_argument)))
+                plaintiff.append(message("user", REBUTTAL_TEMPLATE.format(argument=defense_argument)))
+        defense_argument = "\n\n".join(defense_arguments)
+        plaintiff_argument = "\n\n".join(plaintiff_arguments)
+        verdict_prompt = VERDICT_TEMPLATE.format(defense=defense_argument, plaintiff=plaintiff_argument)
+        (verdict,) = yield [self._request([message("system", judge_prompt), message("user", verdict_prompt)], VERDICT_FORMAT)]
+        winner, judgment_summary = read_verdict(verdict)
+        return {
+            "defense_argument": defense_argument,
+            "plaintiff_argument": plaintiff_argument,
+            "judgment_summary": judgment_summary,
+            "winner": winner,
+        }
+
+    def _count(self, calls: int = 0, runs: int = 0, failures: int = 0) -> None:
+        with self._lock:
+            self.llm_calls += calls
+            self.runs += runs
+            self.failures += failures
+
+    def _complete(self, request: Request, limiter: Any = None) -> str:
+        create = lambda: self.client.chat.completions.create(**request)
+        return completion_text(limiter.call(create) if limiter is not None else create())
+
+    async def _complete_async(self, request: Request, limiter: Any = None) -> str:
+        create = lambda: self.client.chat.completions.create(**request)
+        return completion_text(await (limiter.call_async(create) if limiter is not None else create()))
+
+    def run(self, prompts: Sequence[str], limiter: Any = None) -> Dict[str, str]:
+        """Transcript of one hearing on ``(lawyer, opponent, judge)`` prompts; LLM calls go through ``limiter``."""
+        hearing = self._hearing(prompts)
+        self._count(runs=1)
+        try:
+            requests = next(hearing)
+            while True:
+                self._count(calls=len(requests))
+                # All but the last turn on the pool, the last one on this thread
+                others = [self._turns.submit(self._complete, request, limiter) for request in requests[:-1]]
+                last = self._complete(requests[-1], limiter)
+                requests = hearing.send([future.result() for future in others] + [last])
+        except StopIteration as done:
+            return done.value
+        except Exception:
+            self._count(failures=1)
+            raise
+
+    async def run_async(self, prompts: Sequence[str], limiter: Any = None) -> Dict[str, str]:
+        """:meth:`run` with an awaitable client."""
+        hearing = self._hearing(prompts)
+        self._count(runs=1)
+        try:
+            requests = next(hearing)
+            while True:
+                self._count(calls=len(requests))
+                answers = await asyncio.gather(*(self._complete_async(request, limiter) for request in requests))
+                requests = hearing.send(list(answers))
+        except StopIteration as done:
+            return done.value
+        except Exception:
+            self._count(failures=1)
+            raise
+
+    def close(self) -> None:
+        self._turns.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "model": self.model,
+                "rounds": self.rounds,
+                "runs": self.runs,
+                "failures": self.failures,
+                "llmCalls": self.llm_calls,
+            }
+
+
+STUB_SENTENCES = (
+    "The record does not support the elements the State must prove.",
+    "Settled precedent in this district controls the outcome here.",
+    "The evidence shows a conscious disregard of a substantial risk.",
+    "The procedural history confirms the motion is properly before the court.",
+    "Any doubt about the testimony must be resolved against the moving party.",
+    "The statute's plain text forecloses the opposing reading.",
+)
+
+
+def stub_digest(*parts: Any) -> bytes:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).digest()
+
+
+def stub_instance(schema: Dict[str, Any], seed: bytes, name: str = "value") -> Any:
+    """Deterministic instance of a JSON schema; enum values and numbers vary with ``seed``."""
+    digest = stub_digest(seed.hex(), name)
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][digest[0] % len(schema["enum"])]
+    if kind == "object":
+        return {key: stub_instance(value, seed, f"{name}.{key}") for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        items = schema.get("items", {})
+        # Arrays keyed by an enum property (e.g. batch evaluations by run id): one item per value
+        keys = [key for key, value in items.get("properties", {}).items() if "enum" in value]
+        if keys:
+            return [
+                {**stub_instance(items, seed, f"{name}[{value}]"), keys[0]: value}
+                for value in items["properties"][keys[0]]["enum"]
+            ]
+        return [stub_instance(items, seed, f"{name}[{index}]") for index in range(max(2, schema.get("minItems", 0)))]
+    if kind in ("number", "integer"):
+        minimum, maximum = schema.get("minimum", 0), schema.get("maximum", 10)
+        value = minimum + (maximum - minimum) * digest[1] / 255
+        return int(round(value)) if kind == "integer" else round(value, 1)
+    if kind == "boolean":
+        return bool(digest[2] % 2)
+    return f"{name.split('.')[-1].replace('_', ' ').capitalize()} {digest[:4].hex()}"
+
+
+def stub_completion(model: str, messages: List[Dict[str, Any]], response_format: Any = None) -> Any:
+    """Chat completion answered from a hash of ``model`` and ``messages``."""
+    seed = stub_digest(model, messages)
+    schema = None
+    if isinstance(response_format, dict) and response_format.get("type") == "json_schema":
+        schema = response_format.get("json_schema", {}).get("schema")
+    if schema is not None:
+        content = json.dumps(stub_instance(schema, seed))
+    else:
+        content = " ".join(STUB_SENTENCES[byte % len(STUB_SENTENCES)] for byte in seed[:4])
+    prompt_tokens = sum(len(str(entry.get("content", ""))) // 4 for entry in messages)
+    completion_tokens = max(1, len(content) // 4)
+    return SimpleNamespace(
+        id=f"chatcmpl-stub-{seed[:6].hex()}",
+        model=model,
+        choices=[SimpleNamespace(index=0, message=SimpleNamespace(role="assistant", content=content), finish_reason="stop")],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens
+        ),
+    )
+
+
+class _StubCompletions:
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+
+    def create(self, *, model: str, messages: List[Dict[str, Any]], response_format: Any = None, **_: Any) -> Any:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return stub_completion(model, messages, response_format)
+
+
+class _AsyncStubCompletions(_StubCompletions):
+    async def create(self, *, model: str, messages: List[Dict[str, Any]], response_format: Any = None, **_: Any) -> Any:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return stub_completion(model, messages, response_format)
+
+
+class StubLLM:
+    """Deterministic ``openai.OpenAI`` stand-in (``chat.completions.create``)."""
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self.chat = SimpleNamespace(completions=_StubCompletions(latency_seconds))
+
+
+class AsyncStubLLM:
+    """Deterministic ``openai.AsyncOpenAI`` stand-in (``chat.completions.create``)."""
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self.chat = SimpleNamespace(completions=_AsyncStubCompletions(latency_seconds))
+
+    async def close(self) -> None:
+        pass
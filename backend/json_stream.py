@@ -0,0 +1,80 @@
+"""
+Incremental parsing of a JSON object streamed as text chunks.
+
+Structured-output completions arrive token by token.  :class:`ArrayItemStream`
+is fed those chunks and hands back each element of one top-level array
+(e.g. ``{"strategies": [{...}, {...}]}``) as soon as the element's closing
+bracket arrives, instead of waiting for the whole document.  Only completed
+elements are decoded (with :func:`json.loads`), so a yielded item is always
+valid JSON; the full document is still available from ``text`` for the
+final, authoritative parse.
+
+The scanner keeps its position between chunks, so every character is looked
+at once regardless of how the stream is split.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, List, Optional
+
+OPENERS = "{["
+CLOSERS = "}]"
+
+
+class ArrayItemStream:
+    """Yields the object (or array) elements of the top-level ``key`` array of a streamed JSON object."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.text = ""
+        self.items = 0
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._array_done = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume ``chunk``; return the array elements it completed, in order."""
+        self.text += chunk
+        text = self.text
+        completed: List[Any] = []
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        # Keys (and string values) of the top-level object
+                        self._last_string = json.loads(text[self._string_start:pos + 1])
+            elif char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in OPENERS:
+                self._depth += 1
+                if self._array_depth is None:
+                    if char == "[" and self._depth == 2 and not self._array_done and self._last_string == self.key:
+                        self._array_depth = self._depth
+                elif self._depth == self._array_depth + 1:
+                    self._item_start = pos
+            elif char in CLOSERS:
+                if self._array_depth is not None:
+                    if self._depth == self._array_depth + 1 and self._item_start is not None:
+                        completed.append(json.loads(text[self._item_start:pos + 1]))
+                        self._item_start = None
+                        self.items += 1
+                    elif self._depth == self._array_depth:
+                        self._array_depth = None
+                        self._array_done = True
+                self._depth -= 1
+        self._pos = len(text)
+        return completed
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Batch computation of judge characteristic scores from their syllabi.
+
+``data/syllabi_by_judge.json`` maps a judge's name to the syllabi of the
+opinions they authored.  This pipeline turns it into the numeric profile used
+by the simulation prompts (``pleadingStrictness``, ``precedentWeight``,
+``policyReceptivity``, ``plaintiffFriendly``, each on a 0-10 scale) plus the
+``evidenceSnippets`` that justify each score.
+
+Every judge is processed in one vectorised pass:
+
+  1. syllabi are split into sentences and tokenised into a CSR sentence x term
+     matrix (``indptr``/``indices``/``counts`` NumPy arrays);
+  2. a lexicon maps terms to signed per-characteristic weights, so sentence
+     scores are one gather + ``np.add.reduceat`` over the non-zeros;
+  3. sentence scores are summed per judge (``reduceat`` over judge row
+     ranges) and divided by the judge's token count to get rates;
+  4. the ``k`` best sentences per judge and characteristic are chosen with one
+     ``lexsort`` over ``(judge, -score)``.
+
+Rates are turned into scores relative to the other judges (z-scores squashed
+onto 0-10), shrunk towards the middle for judges with few syllabi.
+
+Per-judge rates and snippets are cached under ``data/index`` keyed by a hash
+of the judge's syllabi and the lexicon, so a rerun only processes judges whose
+input changed; the cheap cross-judge calibration always runs on everyone.
+
+Run it with::
+
+    python backend/judge_characteristics.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from text_processing import tokenize
+from vector_index import DEFAULT_INDEX_DIR, atomic_write
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_SOURCE = Path(__file__).resolve().parent.parent / "data" / "syllabi_by_judge.json"
+DEFAULT_OUTPUT = DEFAULT_INDEX_DIR / "judge_profiles.json"
+DEFAULT_SNIPPETS = 3
+# Pseudo-count of syllabi pulling sparse judges towards the average profile.
+SHRINKAGE_DOCUMENTS = 5.0
+
+CHARACTERISTICS = ("pleadingStrictness", "precedentWeight", "policyReceptivity", "plaintiffFriendly")
+
+# Term -> weight per characteristic.  Multi-word entries are matched as
+# adjacent-token bigrams.  plaintiffFriendly reads "the State prevails": in
+# this corpus the plaintiff is the prosecution, so affirmances count for it
+# and reversals against it.
+LEXICON: Dict[str, Dict[str, float]] = {
+    "pleadingStrictness": {
+        "dismiss": 1.0, "dismissed": 1.0, "waived": 1.5, "waiver": 1.5, "untimely": 2.0,
+        "timely": 1.0, "jurisdiction": 1.5, "jurisdictional": 2.0, "procedural": 1.0,
+        "comply": 1.5, "failed": 0.5, "failure": 0.5, "requirements": 1.0, "preserve": 1.5,
+        "preserved": 1.0, "rule": 0.5, "certified question": 2.0, "plain error": 1.0,
+        "limitations": 1.0, "deficient": 0.5,
+    },
+    "precedentWeight": {
+        "precedent": 2.0, "precedents": 2.0, "stare": 2.0, "decisis": 2.0, "controlling": 1.5,
+        "binding": 1.5, "established": 1.0, "consistent": 0.5, "authority": 1.0,
+        "well settled": 2.0, "settled": 1.0, "pursuant": 0.5, "code annotated": 1.0,
+        "supreme court": 1.0, "held": 0.5, "holding": 1.0,
+    },
+    "policyReceptivity": {
+        "policy": 2.0, "public": 0.5, "interest": 0.5, "fairness": 1.5, "equitable": 1.5,
+        "equity": 1.5, "purpose": 1.0, "legislative intent": 2.0, "intent": 0.5,
+        "constitutional": 1.0, "unconstitutional": 1.5, "novel": 2.0, "reform": 2.0,
+        "justice": 0.5, "discretion": 0.5, "balance": 1.0,
+    },
+    "plaintiffFriendly": {
+        "affirm": 1.5, "affirmed": 1.5, "affirms": 1.5, "convicted": 0.5, "sufficient": 1.0,
+        "upheld": 1.5, "harmless": 1.0, "no error": 1.5, "without merit": 1.5, "denied": 0.5,
+        "reverse": -1.5, "reversed": -1.5, "reversal": -1.5, "vacate": -1.5, "vacated": -1.5,
+        "remand": -1.0, "remanded": -1.0, "insufficient": -1.5, "suppress": -0.5, "acquittal": -1.0,
+    },
+}
+
+_MARKUP = re.compile(r"<[^>]+>")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"(])")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Plain-text sentences of a syllabus (markup stripped, whitespace collapsed)."""
+    text = " ".join(_MARKUP.sub(" ", text or "").split())
+    return [sentence for sentence in _SENTENCE_END.split(text) if len(sentence) > 20]
+
+
+def lexicon_fingerprint(lexicon: Dict[str, Dict[str, float]] = LEXICON) -> str:
+    payload = json.dumps([CACHE_FORMAT_VERSION, lexicon], sort_keys=True).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def judge_fingerprint(syllabi: Sequence[str]) -> str:
+    digest = hashlib.sha1()
+    for syllabus in syllabi:
+        digest.update(hashlib.sha1((syllabus or "").encode("utf-8")).digest())
+    return digest.hexdigest()
+
+
+def lexicon_matrix(lexicon: Dict[str, Dict[str, float]]) -> Tuple[Dict[str, int], np.ndarray]:
+    """Term vocabulary and the dense ``terms x characteristics`` weight matrix."""
+    terms = sorted({term for weights in lexicon.values() for term in weights})
+    vocabulary = {term: position for position, term in enumerate(terms)}
+    matrix = np.zeros((len(terms), len(CHARACTERISTICS)), dtype=np.float64)
+    for column, name in enumerate(CHARACTERISTICS):
+        for term, weight in lexicon.get(name, {}).items():
+            matrix[vocabulary[term], column] = weight
+    return vocabulary, matrix
+
+
+def sentence_term_matrix(
+    sentences: Sequence[str], vocabulary: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    CSR matrix of lexicon term counts per sentence.
+
+    Returns ``(indptr, indices, counts, token_counts)``; only lexicon terms are
+    stored, unigrams and adjacent bigrams alike.
+    """
+    indptr = np.zeros(len(sentences) + 1, dtype=np.int64)
+    indices: List[int] = []
+    token_counts = np.zeros(len(sentences), dtype=np.int64)
+    for row, sentence in enumerate(sentences):
+        tokens = tokenize(sentence, drop_stopwords=False)
+        token_counts[row] = len(tokens)
+        grams = tokens + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+        indices.extend(vocabulary[gram] for gram in grams if gram in vocabulary)
+        indptr[row + 1] = len(indices)
+    # Collapse repeated terms within a row into (term, count) pairs.
+    width = len(vocabulary)
+    rows = np.repeat(np.arange(len(sentences), dtype=np.int64), np.diff(indptr))
+    keys, counts = np.unique(rows * width + np.asarray(indices, dtype=np.int64), return_counts=True)
+    indptr = np.searchsorted(keys // width, np.arange(len(sentences) + 1)).astype(np.int64)
+    return indptr, keys % width, counts.astype(np.float64), token_counts
+
+
+def sentence_scores(indptr: np.ndarray, indices: np.ndarray, counts: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """``sentences x characteristics`` scores (sparse matrix times the lexicon matrix)."""
+    scores = np.zeros((indptr.shape[0] - 1, weights.shape[1]), dtype=np.float64)
+    if indices.shape[0] == 0:
+        return scores
+    contributions = counts[:, None] * weights[indices]
+    non_empty = np.flatnonzero(np.diff(indptr))
+    scores[non_empty] = np.add.reduceat(contributions, indptr[non_empty], axis=0)
+    return scores
+
+
+def compute_judge_stats(
+    syllabi_by_judge: Dict[str, Sequence[str]],
+    *,
+    lexicon: Dict[str, Dict[str, float]] = LEXICON,
+    snippets: int = DEFAULT_SNIPPETS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-judge lexicon rates and evidence snippets, for every judge in one pass.
+
+    The result maps judge name to ``{"documents", "tokens", "rates", "evidenceSnippets"}``
+    where ``rates`` holds weighted lexicon hits per 1,000 tokens.
+    """
+    names = list(syllabi_by_judge)
+    sentences: List[str] = []
+    bounds = [0]
+    for name in names:
+        for syllabus in syllabi_by_judge[name]:
+            sentences.extend(split_sentences(syllabus))
+        bounds.append(len(sentences))
+    bounds_array = np.asarray(bounds, dtype=np.int64)
+
+    vocabulary, weights = lexicon_matrix(lexicon)
+    indptr, indices, counts, token_counts = sentence_term_matrix(sentences, vocabulary)
+    scores = sentence_scores(indptr, indices, counts, weights)
+
+    judge_of = np.repeat(np.arange(len(names)), np.diff(bounds_array))
+    judge_scores = np.zeros((len(names), len(CHARACTERISTICS)), dtype=np.float64)
+    judge_tokens = np.zeros(len(names), dtype=np.int64)
+    non_empty = np.flatnonzero(np.diff(bounds_array))
+    if non_empty.shape[0]:
+        judge_scores[non_empty] = np.add.reduceat(scores, bounds_array[non_empty], axis=0)
+        judge_tokens[non_empty] = np.add.reduceat(token_counts, bounds_array[non_empty])
+    rates = 1000.0 * judge_scores / np.maximum(judge_tokens, 1)[:, None]
+
+    evidence: List[Dict[str, List[str]]] = [{name: [] for name in CHARACTERISTICS} for _ in names]
+    for column, characteristic in enumerate(CHARACTERISTICS):
+        column_scores = scores[:, column]
+        order = np.lexsort((-column_scores, judge_of))
+        # Position of each sorted sentence within its judge's block.
+        rank = np.arange(order.shape[0]) - bounds_array[judge_of[order]]
+        chosen = order[(rank < snippets) & (column_scores[order] > 0)]
+        for row in chosen.tolist():
+            evidence[int(judge_of[row])][characteristic].append(sentences[row])
+
+    return {
+        name: {
+            "documents": len(syllabi_by_judge[name]),
+            "tokens": int(judge_tokens[position]),
+            "rates": [float(value) for value in rates[position]],
+            "evidenceSnippets": evidence[position],
+        }
+        for position, name in enumerate(names)
+    }
+
+
+def calibrate(stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Map per-judge rates to 0-10 scores relative to the other judges.
+
+    Each characteristic is z-scored across judges, shrunk by
+    ``n / (n + SHRINKAGE_DOCUMENTS)`` for a judge with ``n`` syllabi and squashed
+    with a logistic, so an average judge scores 5.
+    """
+    names = list(stats)
+    if not names:
+        return {}
+    rates = np.asarray([stats[name]["rates"] for name in names], dtype=np.float64)
+    documents = np.asarray([stats[name]["documents"] for name in names], dtype=np.float64)
+    spread = rates.std(axis=0)
+    z = (rates - rates.mean(axis=0)) / np.where(spread > 0, spread, 1.0)
+    z *= (documents / (documents + SHRINKAGE_DOCUMENTS))[:, None]
+    scores = 10.0 / (1.0 + np.exp(-z))
+    return {
+        name: {characteristic: round(float(scores[row, column]) * 2) / 2 for column, characteristic in enumerate(CHARACTERISTICS)}
+        for row, name in enumerate(names)
+    }
+
+
+def load_cache(path: Path, lexicon_hash: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            cache = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if cache.get("lexicon") != lexicon_hash:
+        return {}
+    return cache.get("judges", {})
+
+
+def build_judge_profiles(
+    syllabi_by_judge: Dict[str, Sequence[str]],
+    *,
+    cache_path: Optional[Path] = None,
+    snippets: int = DEFAULT_SNIPPETS,
+) -> List[Dict[str, Any]]:
+    """
+    Compute a profile for every judge, reusing cached stats for unchanged inputs.
+
+    Only judges whose syllabi hash (or the lexicon) changed go through
+    :func:`compute_judge_stats`; the refreshed cache is written back atomically.
+    """
+    lexicon_hash = lexicon_fingerprint()
+    cached = load_cache(cache_path, lexicon_hash) if cache_path else {}
+    hashes = {name: judge_fingerprint(syllabi) for name, syllabi in syllabi_by_judge.items()}
+    stale = {
+        name: syllabi
+        for name, syllabi in syllabi_by_judge.items()
+        if cached.get(name, {}).get("hash") != hashes[name] or cached[name].get("snippets") != snippets
+    }
+    if stale:
+        logging.info("Computing characteristics for %s of %s judges.", len(stale), len(syllabi_by_judge))
+        for name, entry in compute_judge_stats(stale, snippets=snippets).items():
+            cached[name] = {**entry, "hash": hashes[name], "snippets": snippets}
+    else:
+        logging.info("All %s judges unchanged; using cached characteristics.", len(syllabi_by_judge))
+
+    stats = {name: cached[name] for name in syllabi_by_judge}
+    if cache_path and stale:
+        payload = json.dumps({"lexicon": lexicon_hash, "judges": stats}, ensure_ascii=False).encode("utf-8")
+        atomic_write(cache_path, lambda handle: handle.write(payload))
+
+    scores = calibrate(stats)
+    return [
+        {
+            "name": name,
+            **scores[name],
+            "evidenceSnippets": stats[name]["evidenceSnippets"],
+            "documentCount": stats[name]["documents"],
+        }
+        for name in syllabi_by_judge
+    ]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compute judge characteristic scores and evidence snippets from syllabi.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--input", type=Path, default=DEFAULT_SOURCE, help="JSON object of judge name -> syllabi.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Profiles file to write.")
+    parser.add_argument("--snippets", type=int, default=DEFAULT_SNIPPETS, help="Evidence snippets per characteristic.")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every judge.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    with args.input.open("r", encoding="utf-8") as handle:
+        syllabi_by_judge = json.load(handle)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    cache_path = None if args.no_cache else args.output.with_suffix(".cache.json")
+    profiles = build_judge_profiles(syllabi_by_judge, cache_path=cache_path, snippets=args.snippets)
+    payload = json.dumps({"profiles": profiles}, ensure_ascii=False, indent=2).encode("utf-8")
+    atomic_write(args.output, lambda handle: handle.write(payload))
+    logging.info("Wrote %s judge profiles to %s.", len(profiles), args.output)
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
@@ -0,0 +1,331 @@
+"""
+Single gateway for every LLM call the API makes.
+
+Strategy generation, transcript scoring, the memorandum, the case-query
+reasoning call and the in-process courtroom agents all send their requests
+through one :class:`LLMGateway` (``chat`` / ``chat_async`` for chat
+completions, ``chat_stream`` for streamed ones, ``responses`` for the Responses
+API).  Per call it:
+
+  * answers from an exact-match response cache first: the key is a SHA-256 of
+    the endpoint and the full request (model, messages or input, response
+    format / JSON schema, temperature and every other parameter), so only an
+    identical request is served; entries are evicted least recently used and
+    expire after a TTL.  Callers that want a fresh sample (the courtroom
+    agents) pass ``cache=False``;
+  * caps the calls in flight per model (``max_concurrency``) across threads and
+    coroutines alike;
+  * optionally refuses calls once a model used ``max_tokens_per_hour`` tokens
+    in the last hour (:class:`LLMBudgetExceeded`);
+  * records latency, prompt and completion tokens per model.
+
+Rate limiting (429 handling) stays with the caller's token bucket, passed as
+``limiter``; it runs inside the model's concurrency slot.  The gateway does not
+own clients: each call names the (sync or async) client to use, so injected
+stand-ins keep working.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from lru_cache import LRUCache
+
+DEFAULT_MAX_CONCURRENCY = 8
+# How often a coroutine waiting for a model slot re-checks it
+ASYNC_POLL_SECONDS = 0.02
+# Latency samples kept per model for the percentiles in stats()
+LATENCY_SAMPLES = 1000
+BUDGET_WINDOW_SECONDS = 3600.0
+
+_MISSING = object()
+
+
+class LLMBudgetExceeded(RuntimeError):
+    """Raised instead of calling a model whose hourly token budget is used up."""
+
+
+def request_key(endpoint: str, request: Dict[str, Any]) -> str:
+    """Exact-match cache key of one request to ``endpoint`` (``chat`` / ``responses``)."""
+    material = json.dumps({"endpoint": endpoint, "request": request}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def usage_tokens(response: Any) -> Tuple[int, int]:
+    """``(prompt, completion)`` tokens of a chat completion or Responses API result."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    prompt = getattr(usage, "prompt_tokens", None)
+    if prompt is None:
+        prompt = getattr(usage, "input_tokens", 0)
+    completion = getattr(usage, "completion_tokens", None)
+    if completion is None:
+        completion = getattr(usage, "output_tokens", 0)
+    return int(prompt or 0), int(completion or 0)
+
+
+def percentile(samples: Any, fraction: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelLimits:
+    """Concurrency slots, token budget and accounting for one model."""
+
+    def __init__(self, model: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_tokens_per_hour: Optional[int] = None) -> None:
+        self.model = model
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.calls = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.rejected = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_seconds = 0.0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._spent: Deque[Tuple[float, int]] = deque()
+        self.configure(max_concurrency, max_tokens_per_hour)
+
+    def configure(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                  max_tokens_per_hour: Optional[int] = None) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        with self._cond:
+            self.max_concurrency = int(max_concurrency)
+            self.max_tokens_per_hour = int(max_tokens_per_hour) if max_tokens_per_hour else None
+            self._cond.notify_all()
+
+    def _tokens_last_hour(self, now: float) -> int:
+        while self._spent and self._spent[0][0] <= now - BUDGET_WINDOW_SECONDS:
+            self._spent.popleft()
+        return sum(tokens for _, tokens in self._spent)
+
+    def _check_budget(self, now: float) -> None:
+        if self.max_tokens_per_hour is not None and self._tokens_last_hour(now) >= self.max_tokens_per_hour:
+            self.rejected += 1
+            raise LLMBudgetExceeded(
+                f"{self.model} used its budget of {self.max_tokens_per_hour} tokens in the last hour"
+            )
+
+    def _take(self) -> bool:
+        self._check_budget(time.monotonic())
+        if self.in_flight >= self.max_concurrency:
+            return False
+        self.in_flight += 1
+        return True
+
+    def acquire(self) -> None:
+        with self._cond:
+            while not self._take():
+                self._cond.wait()
+
+    async def acquire_async(self) -> None:
+        while True:
+            with self._cond:
+                if self._take():
+                    return
+            # Releases cannot wake a sleeping coroutine, so slot waits are polled.
+            await asyncio.sleep(ASYNC_POLL_SECONDS)
+
+    def release(self, seconds: float, response: Any = None, failed: bool = False) -> None:
+        prompt, completion = usage_tokens(response) if response is not None else (0, 0)
+        with self._cond:
+            self.in_flight -= 1
+            self.calls += 1
+            self.errors += int(failed)
+            self.latency_seconds += seconds
+            self._latencies.append(seconds)
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+            if prompt or completion:
+                self._spent.append((time.monotonic(), prompt + completion))
+            self._cond.notify_all()
+
+    def hit(self) -> None:
+        with self._cond:
+            self.cache_hits += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "maxConcurrency": self.max_concurrency,
+                "inFlight": self.in_flight,
+                "calls": self.calls,
+                "cacheHits": self.cache_hits,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "promptTokens": self.prompt_tokens,
+                "completionTokens": self.completion_tokens,
+                "tokensLastHour": self._tokens_last_hour(time.monotonic()),
+                "maxTokensPerHour": self.max_tokens_per_hour,
+                "latency": {
+                    "mean": round(self.latency_seconds / self.calls, 3) if self.calls else 0.0,
+                    "p50": round(percentile(self._latencies, 0.5), 3),
+                    "p95": round(percentile(self._latencies, 0.95), 3),
+                    "max": round(max(self._latencies, default=0.0), 3),
+                },
+            }
+
+
+class LLMGateway:
+    """Response cache, per-model limits and accounting around chat and Responses API calls."""
+
+    def __init__(self, cache_size: int = 512, cache_ttl: Optional[float] = None,
+                 models: Optional[Dict[str, Dict[str, Any]]] = None,
+                 default_max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        self.cache: Optional[LRUCache[Any]] = None
+        self._models: Dict[str, ModelLimits] = {}
+        self._lock = threading.Lock()
+        self.configure(cache_size, cache_ttl, models, default_max_concurrency)
+
+    def configure(self, cache_size: int = 512, cache_ttl: Optional[float] = None,
+                  models: Optional[Dict[str, Dict[str, Any]]] = None,
+                  default_max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """(Re)apply the cache bounds (``cache_size`` 0 disables it) and per-model limits."""
+        with self._lock:
+            if not cache_size:
+                self.cache = None
+            elif self.cache is None:
+                self.cache = LRUCache(int(cache_size), ttl=cache_ttl)
+            else:
+                self.cache.maxsize, self.cache.ttl = int(cache_size), cache_ttl
+            self._settings = {name: dict(settings or {}) for name, settings in (models or {}).items()}
+            self.default_max_concurrency = int(default_max_concurrency)
+            for name, limits in self._models.items():
+                limits.configure(**self._limit_settings(name))
+
+    def _limit_settings(self, model: str) -> Dict[str, Any]:
+        settings = self._settings.get(model, {})
+        return {
+            "max_concurrency": int(settings.get("max_concurrency", self.default_max_concurrency)),
+            "max_tokens_per_hour": settings.get("max_tokens_per_hour"),
+        }
+
+    def limits(self, model: str) -> ModelLimits:
+        with self._lock:
+            limits = self._models.get(model)
+            if limits is None:
+                limits = self._models[model] = ModelLimits(model, **self._limit_settings(model))
+            return limits
+
+    def _lookup(self, endpoint: str, request: Dict[str, Any], cache: bool) -> Tuple[ModelLimits, Any, Optional[str], Any]:
+        """``(limits, store, key, cached response or _MISSING)`` for a request about to be sent."""
+        limits = self.limits(str(request.get("model", "")))
+        store = self.cache if cache else None
+        if store is None:
+            return limits, None, None, _MISSING
+        key = request_key(endpoint, request)
+        response = store.get(key, _MISSING)
+        if response is not _MISSING:
+            limits.hit()
+        return limits, store, key, response
+
+    def _call(self, endpoint: str, create: Callable[[], Any], request: Dict[str, Any],
+              cache: bool, limiter: Any) -> Any:
+        limits, store, key, response = self._lookup(endpoint, request, cache)
+        if response is not _MISSING:
+            return response
+        limits.acquire()
+        started = time.perf_counter()
+        response = None
+        try:
+            response = limiter.call(create) if limiter is not None else create()
+        finally:
+            limits.release(time.perf_counter() - started, response, failed=response is None)
+        if store is not None:
+            store.set(key, response)
+        return response
+
+    def chat(self, client: Any, request: Dict[str, Any], *, cache: bool = True, limiter: Any = None) -> Any:
+        """``client.chat.completions.create(**request)`` through the gateway."""
+        return self._call("chat", lambda: client.chat.completions.create(**request), request, cache, limiter)
+
+    def responses(self, client: Any, request: Dict[str, Any], *, cache: bool = True, limiter: Any = None) -> Any:
+        """``client.responses.create(**request)`` through the gateway."""
+        return self._call("responses", lambda: client.responses.create(**request), request, cache, limiter)
+
+    async def chat_async(self, client: Any, request: Dict[str, Any], *, cache: bool = True, limiter: Any = None) -> Any:
+        """:meth:`chat` with an awaitable client (``openai.AsyncOpenAI``)."""
+        limits, store, key, response = self._lookup("chat", request, cache)
+        if response is not _MISSING:
+            return response
+        create = lambda: client.chat.completions.create(**request)
+        await limits.acquire_async()
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await (limiter.call_async(create) if limiter is not None else create())
+        finally:
+            limits.release(time.perf_counter() - started, response, failed=response is None)
+        if store is not None:
+            store.set(key, response)
+        return response
+
+    def chat_stream(self, client: Any, request: Dict[str, Any], *, limiter: Any = None) -> Iterator[Any]:
+        """Chunks of ``client.chat.completions.create(**request, stream=True)``, as they arrive.
+
+        Streams are not cached; the model's slot is held until the stream ends
+        (or is closed) and the usage reported in its last chunk is accounted.
+        """
+        request = {**request, "stream": True, "stream_options": {"include_usage": True}}
+        limits = self.limits(str(request.get("model", "")))
+        create = lambda: client.chat.completions.create(**request)
+        limits.acquire()
+        started = time.perf_counter()
+        usage = None
+        failed = True
+        try:
+            for chunk in (limiter.call(create) if limiter is not None else create()):
+                usage = getattr(chunk, "usage", None) or usage
+                yield chunk
+            failed = False
+        finally:
+            limits.release(time.perf_counter() - started, SimpleNamespace(usage=usage), failed=failed)
+
+    def bind(self, client: Any, *, cache: bool = True) -> "GatewayClient":
+        """``client`` look-alike whose ``chat.completions.create`` goes through the gateway."""
+        return GatewayClient(self, client, cache)
+
+    def bind_async(self, client: Any, *, cache: bool = True) -> "AsyncGatewayClient":
+        """:meth:`bind` for an awaitable client."""
+        return AsyncGatewayClient(self, client, cache)
+
+    def clear(self) -> None:
+        if self.cache is not None:
+            self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = dict(self._models)
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "models": {name: limits.stats() for name, limits in sorted(models.items())},
+        }
+
+
+class GatewayClient:
+    """Chat-completions client facade over :meth:`LLMGateway.chat` (for code that takes a client)."""
+
+    def __init__(self, gateway: LLMGateway, client: Any, cache: bool) -> None:
+        create = lambda **request: gateway.chat(client, request, cache=cache)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+class AsyncGatewayClient:
+    """:class:`GatewayClient` over :meth:`LLMGateway.chat_async`."""
+
+    def __init__(self, gateway: LLMGateway, client: Any, cache: bool) -> None:
+        create = lambda **request: gateway.chat_async(client, request, cache=cache)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
@@ -0,0 +1,74 @@
+"""
+Section boundaries of a memorandum streamed as text chunks.
+
+The memorandum prompt asks for fixed sections (EXECUTIVE SUMMARY, CASE
+OVERVIEW, ...), but the model formats their headings freely: ``1. EXECUTIVE
+SUMMARY``, ``## Executive Summary``, ``**II. CASE OVERVIEW:**``.
+:func:`heading_of` reduces a line to its title and matches it against the
+expected ones; :class:`SectionTracker` is fed the streamed chunks and reports
+each heading line once it is complete, with the character offset where it
+starts in the memorandum, so a client can split the text it has already
+rendered.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Sequence
+
+# Markdown emphasis / heading marks, then list numbering ("1.", "2)", "IV.", "A.")
+_DECORATION = re.compile(r"^[\s#*_>]*(?:(?:\d+|[IVXLC]+|[A-Z])[.)]\s+)?")
+_TRAILER = re.compile(r"[\s*_:.#]*$")
+
+
+def heading_of(line: str, titles: Sequence[str]) -> Optional[str]:
+    """The title in ``titles`` that ``line`` is a heading for, if any (case-insensitive)."""
+    text = _TRAILER.sub("", _DECORATION.sub("", line.strip(), count=1)).strip(" *_")
+    if not text or len(text) > 80:
+        return None
+    upper = text.upper()
+    for title in titles:
+        if upper == title.upper():
+            return title
+    return None
+
+
+class SectionTracker:
+    """Finds the heading lines of ``titles`` in a text fed chunk by chunk."""
+
+    def __init__(self, titles: Sequence[str]) -> None:
+        self.titles = tuple(titles)
+        self.sections: List[Dict[str, object]] = []
+        self._seen: set = set()
+        self._line = ""
+        self._line_start = 0
+        self._length = 0
+
+    def _close_line(self) -> Optional[Dict[str, object]]:
+        title = heading_of(self._line, self.titles)
+        if title is None or title in self._seen:
+            return None
+        self._seen.add(title)
+        section = {"section": title, "index": len(self.sections) + 1, "offset": self._line_start}
+        self.sections.append(section)
+        return section
+
+    def feed(self, chunk: str) -> List[Dict[str, object]]:
+        """Consume ``chunk``; return the sections whose heading lines it completed."""
+        found = []
+        for line in chunk.splitlines(keepends=True):
+            self._line += line
+            self._length += len(line)
+            if line.endswith(("\n", "\r")):
+                section = self._close_line()
+                if section is not None:
+                    found.append(section)
+                self._line = ""
+                self._line_start = self._length
+        return found
+
+    def close(self) -> List[Dict[str, object]]:
+        """Check the last line (the text may not end with a newline)."""
+        section = self._close_line() if self._line else None
+        self._line = ""
+        return [section] if section is not None else []
@@ -0,0 +1,232 @@
+"""
+Keyed store of judge and prosecutor profiles with name resolution.
+
+Profile files under ``data/`` may hold a single profile object (the original
+``judge_characteristics.json`` layout), a list of profiles, or
+``{"profiles": [...]}``.  Each file is indexed once per version (through a
+:class:`~corpus_store.CorpusStore` using :func:`load_profile_index`) so that a
+request only pays for a hash lookup.
+
+Names arrive in the shapes CourtListener and the frontend use: ``"Hon. Sarah
+Mitchell"``, ``"Judge S. Mitchell"``, ``"Mitchell, Sarah J."``,
+``"Robert H. Montgomery, Jr."``.  They are normalised to lower-case tokens
+without honorifics or generational suffixes, and every profile is indexed
+under several keys:
+
+  * the full token sequence (``"sarah j mitchell"``);
+  * first and last token (``"sarah mitchell"``);
+  * first initial and last token (``"s mitchell"``);
+  * the last token alone (``"mitchell"``).
+
+The first-initial and surname-only keys only match when the query's given
+name agrees with the profile's (equal, or one is the other's initial) or the
+query has none, so ``"John Mitchell"`` never resolves to ``"Sarah Mitchell"``.
+A key shared by several such profiles is ambiguous and never resolves (nor
+falls through to fuzzy matching).  Names missing from the hash index fall back
+to a character-trigram index scored by the Dice coefficient (candidates whose
+given name is neither compatible nor a near-spelling are skipped); fuzzy
+results are memoised in an LRU cache.
+``python -m doctest backend/profile_store.py`` checks the given-name rules.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from lru_cache import LRUCache
+
+HONORIFICS = frozenset(
+    """
+    hon honorable judge justice chief presiding senior associate magistrate
+    mr mrs ms miss dr esq esquire ada ausa
+    """.split()
+)
+SUFFIXES = frozenset("jr sr ii iii iv".split())
+FUZZY_THRESHOLD = 0.6
+
+_NAME_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(name: Optional[str]) -> List[str]:
+    """
+    Normalise a person's name to lower-case tokens.
+
+    ``"Last, First"`` is reordered to ``"First Last"``; honorifics (``Hon.``,
+    ``Judge``, ``Chief``...) and suffixes (``Jr.``, ``III``) are dropped and
+    initials lose their dots (``"D. Michael"`` -> ``["d", "michael"]``).
+    """
+    if not name:
+        return []
+    parts = [part.strip() for part in str(name).split(",")]
+    if len(parts) == 2 and parts[1] and not set(_NAME_TOKEN.findall(parts[1].lower())) <= SUFFIXES:
+        parts = [parts[1], parts[0]]
+    tokens = _NAME_TOKEN.findall(" ".join(parts).lower().replace("'", ""))
+    return [token for token in tokens if token not in HONORIFICS and token not in SUFFIXES]
+
+
+def name_keys(tokens: Sequence[str]) -> List[str]:
+    """Hash keys for a normalised name, most specific first."""
+    if not tokens:
+        return []
+    first, last = tokens[0], tokens[-1]
+    keys = [" ".join(tokens)]
+    if len(tokens) > 1:
+        keys += [f"{first} {last}", f"{first[0]} {last}"]
+    keys.append(last)
+    return list(dict.fromkeys(keys))
+
+
+def dice(left: str, right: str) -> float:
+    """Dice coefficient of two strings' character trigrams."""
+    left_grams, right_grams = trigrams(left), trigrams(right)
+    return 2.0 * sum((left_grams & right_grams).values()) / (sum(left_grams.values()) + sum(right_grams.values()))
+
+
+def given_names_compatible(query: str, given: str) -> bool:
+    """Whether two given names can be the same person's (equal, or one is the other's initial)."""
+    if query == given:
+        return True
+    return (len(query) == 1 or len(given) == 1) and query[0] == given[0]
+
+
+def trigrams(text: str) -> Counter:
+    padded = f"  {text} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class ProfileMatch:
+    profile: Dict[str, Any]
+    match: str  # "exact" (full name), "alias" (partial key), "fuzzy" or "default"
+    score: float = 1.0
+
+
+class ProfileIndex:
+    """Hash plus trigram index over one file's profiles."""
+
+    def __init__(self, profiles: Sequence[Dict[str, Any]], fuzzy_threshold: float = FUZZY_THRESHOLD) -> None:
+        self.profiles = list(profiles)
+        self.fuzzy_threshold = fuzzy_threshold
+        self._keys: Dict[str, List[int]] = {}
+        self._given: List[List[str]] = []
+        self._full_keys: Dict[str, int] = {}
+        self._grams: List[Counter] = []
+        self._gram_sizes: List[int] = []
+        self._gram_index: Dict[str, List[int]] = {}
+        self._fuzzy_cache: LRUCache[Optional[Tuple[int, float]]] = LRUCache(4096)
+
+        for position, profile in enumerate(self.profiles):
+            names = [profile.get("name")] + list(profile.get("aliases") or [])
+            given: List[str] = []
+            for name in names:
+                tokens = name_tokens(name)
+                if tokens:
+                    self._full_keys.setdefault(" ".join(tokens), position)
+                if len(tokens) > 1 and tokens[0] not in given:
+                    given.append(tokens[0])
+                for key in name_keys(tokens):
+                    holders = self._keys.setdefault(key, [])
+                    if position not in holders:
+                        holders.append(position)
+            self._given.append(given)
+            grams = trigrams(" ".join(name_tokens(profile.get("name"))))
+            self._grams.append(grams)
+            self._gram_sizes.append(sum(grams.values()))
+            for gram in grams:
+                self._gram_index.setdefault(gram, []).append(position)
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "ProfileIndex":
+        if isinstance(payload, dict) and isinstance(payload.get("profiles"), list):
+            payload = payload["profiles"]
+        if isinstance(payload, dict):
+            payload = [payload]
+        return cls([profile for profile in payload or [] if isinstance(profile, dict)])
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    @property
+    def default(self) -> Dict[str, Any]:
+        """Profile used when no name is given or nothing matches (the first, or one flagged ``default``)."""
+        for profile in self.profiles:
+            if profile.get("default"):
+                return profile
+        return self.profiles[0] if self.profiles else {}
+
+    def _compatible(self, position: int, tokens: Sequence[str], typos: bool = False) -> bool:
+        """Whether the profile at ``position`` can be the person named ``tokens`` (by given name).
+
+        With ``typos`` a misspelt given name (trigram Dice above the fuzzy threshold) also counts.
+        """
+        if len(tokens) < 2 or not self._given[position]:
+            return True
+        return any(
+            given_names_compatible(tokens[0], given) or (typos and dice(tokens[0], given) >= self.fuzzy_threshold)
+            for given in self._given[position]
+        )
+
+    def lookup(self, name: Optional[str]) -> Optional[ProfileMatch]:
+        """Resolve ``name`` through the hash index, then the fuzzy index; ``None`` if nothing matches.
+
+        >>> index = ProfileIndex([{"name": "Hon. Sarah Mitchell"}, {"name": "James Anderson"}])
+        >>> index.lookup("Judge S. Mitchell").match, index.lookup("Mitchell").match
+        ('alias', 'alias')
+        >>> index.lookup("John Mitchell") is None
+        True
+        """
+        tokens = name_tokens(name)
+        if not tokens:
+            return None
+        full = " ".join(tokens)
+        for key in name_keys(tokens):
+            holders = self._keys.get(key)
+            if holders and key != full:
+                # Partial key: skip profiles whose given name conflicts with the query's
+                holders = [position for position in holders if self._compatible(position, tokens)]
+            if holders and len(holders) == 1:
+                exact = self._full_keys.get(key) == holders[0]
+                return ProfileMatch(self.profiles[holders[0]], "exact" if exact else "alias")
+            if holders:
+                return None  # ambiguous: several profiles share this key, don't guess
+
+        hit = self._fuzzy_cache.get(full, False)
+        if hit is False:
+            hit = self._fuzzy(full, tokens)
+            self._fuzzy_cache.set(full, hit)
+        if hit is None:
+            return None
+        position, score = hit
+        return ProfileMatch(self.profiles[position], "fuzzy", score)
+
+    def resolve(self, name: Optional[str]) -> ProfileMatch:
+        """Like :meth:`lookup` but falls back to the default profile."""
+        return self.lookup(name) or ProfileMatch(self.default, "default", 0.0)
+
+    def _fuzzy(self, full: str, tokens: Sequence[str]) -> Optional[Tuple[int, float]]:
+        grams = trigrams(full)
+        size = sum(grams.values())
+        overlaps: Counter = Counter()
+        for gram, count in grams.items():
+            for position in self._gram_index.get(gram, ()):
+                overlaps[position] += min(count, self._grams[position][gram])
+        best: Optional[Tuple[int, float]] = None
+        for position, overlap in overlaps.items():
+            if not self._compatible(position, tokens, typos=True):
+                continue  # typos are tolerated, a different given name is not
+            score = 2.0 * overlap / (size + self._gram_sizes[position])
+            if score >= self.fuzzy_threshold and (best is None or score > best[1]):
+                best = (position, score)
+        return best
+
+
+def load_profile_index(path: Path) -> ProfileIndex:
+    """:class:`CorpusStore` loader that parses a profile file and indexes it."""
+    with path.open("r", encoding="utf-8") as handle:
+        return ProfileIndex.from_payload(json.load(handle))
+
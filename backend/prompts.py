@@ -0,0 +1,281 @@
+"""
+Agent prompt templates for the courtroom simulations.
+
+Every run of a ``/api/run-simulations`` request sends three prompts to the n8n
+workflow: the defense lawyer's, the state attorney's (opponent) and the
+judge's.  Only the lawyer prompt depends on the strategy and the run's
+variation; the case context, the opponent prompt and the judge prompt are the
+same for every run of a request.  :class:`SimulationPrompts` therefore renders
+those once per (case, profiles) and reuses them, renders the strategy part of
+the lawyer prompt once per strategy, and per run only appends the
+pre-rendered variation block.
+
+The templates are plain ``str.format`` strings compiled at import time; values
+are substituted verbatim, so braces in case facts or profile text are safe.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+CASE_CONTEXT_TEMPLATE = """
+Case Facts:
+{case_facts}
+
+Extracted Case Documents:
+{documents}
+
+Judge: {judge_name}
+{court_line}
+State Attorney: {state_attorney_name}
+Firm: {firm}
+"""
+
+LAWYER_STRATEGY_TEMPLATE = """
+You are the defense attorney representing the defendant in this case.
+
+CASE DETAILS:
+{case_context}
+
+DEFENSE STRATEGY TO EMPLOY:
+{strategy_title}
+
+Strategy Details:
+- Advantages: {advantages}
+- Key Approach: {key_approach}
+
+"""
+
+# Appended to the strategy part of the lawyer prompt, one per variation
+LAWYER_VARIATION_TEMPLATE = """VARIATION: {variation}
+{guidance}
+
+Your role is to present a compelling legal defense using this strategy. Argue forcefully for dismissal or reduced liability.
+Present your argument professionally and persuasively, citing relevant legal principles where appropriate.
+"""
+
+VARIATION_GUIDANCE = {
+    "Aggressive Variant": "- Focus on aggressive cross-examination and forceful arguments.",
+    "Conservative Variant": "- Focus on measured, procedural arguments and risk mitigation.",
+}
+DEFAULT_VARIATION_GUIDANCE = "- Use a balanced approach combining legal precedent with factual analysis."
+
+OPPONENT_TEMPLATE = """
+You are the State Attorney representing the plaintiff in this lawsuit.
+
+CASE DETAILS:
+{case_context}
+
+YOUR PROFILE:
+- Aggressiveness Level: {aggressiveness}/10
+- Win Rate: {success_rate}%
+- Approach: {communication_style}
+- Settlement Willingness: {settlement}% (Low)
+
+KEY STRENGTHS:
+{strengths}
+
+TACTICAL APPROACH:
+{tactics}
+
+Your role is to aggressively prosecute this case on behalf of the plaintiff. Present compelling arguments for liability
+and maximum damages. Challenge the defense's arguments forcefully and cite precedent to support the plaintiff's position.
+"""
+
+JUDGE_TEMPLATE = """
+You are {judge_name}, presiding judge{court_clause}.
+
+CASE DETAILS:
+{case_context}
+
+YOUR JUDICIAL PROFILE:
+- Pleading Strictness: {pleading_strictness}/10
+- Precedent Weight: {precedent_weight}/10
+- Policy Receptivity: {policy_receptivity}/10
+- Plaintiff Friendly: {plaintiff_friendly}/10
+
+{temperament_section}{strict_areas_section}INSTRUCTIONS:
+1. Call both the defense lawyer (LawyerAgent) and state attorney (OpponentAgent) to hear their arguments
+2. Consider each argument carefully based on your judicial philosophy and characteristics
+3. Make a verdict determining the winner (Plaintiff or Defense) 
+4. Provide a judgment summary explaining your reasoning
+
+Your decision should reflect your judicial tendencies, particularly your:
+{tendencies}
+"""
+
+# Optional judge sections: profiles computed from syllabi (backend/judge_characteristics.py)
+# only carry the four scores, so these are left out rather than filled with another judge's traits
+JUDGE_TEMPERAMENT_TEMPLATE = """TEMPERAMENT: {temperament}
+- Patience: {patience}/100
+- Openness to Novel Arguments: {openness}/100
+- Plaintiff Sympathy: {plaintiff_sympathy}%
+- Defendant Sympathy: {defendant_sympathy}%
+
+"""
+
+JUDGE_STRICT_AREAS_TEMPLATE = """STRICT AREAS:
+{strict_areas}
+
+"""
+
+DEFAULT_JUDGE_NAME = "Hon. Sarah Mitchell"
+DEFAULT_STATE_ATTORNEY_NAME = "James Anderson"
+DEFAULT_FIRM = "Office of the State Attorney"
+
+PRECEDENT_NOTES = {
+    "High": "strongly favor established case law",
+    "Moderate": "weigh case law alongside the facts",
+    "Low": "open to departing from case law",
+}
+PLEADING_NOTES = {
+    "High": "demand rigorous legal standards",
+    "Moderate": "apply ordinary legal standards",
+    "Low": "lenient on procedural defects",
+}
+BIAS_LABELS = {"High": "Plaintiff-friendly", "Moderate": "Even-handed", "Low": "Defense-friendly"}
+
+
+def render_case_context(
+    case_facts: str,
+    extracted_text: str,
+    judge_chars: Mapping[str, Any],
+    state_attorney_chars: Mapping[str, Any],
+) -> str:
+    return CASE_CONTEXT_TEMPLATE.format(
+        case_facts=case_facts,
+        documents=extracted_text[:1000] if extracted_text else "No additional documents provided",
+        judge_name=judge_chars.get("name", DEFAULT_JUDGE_NAME),
+        court_line=f"Court: {judge_chars['court']}\n" if judge_chars.get("court") else "",
+        state_attorney_name=state_attorney_chars.get("name", DEFAULT_STATE_ATTORNEY_NAME),
+        firm=state_attorney_chars.get("firm", DEFAULT_FIRM),
+    )
+
+
+def render_opponent_prompt(case_context: str, state_attorney_chars: Mapping[str, Any]) -> str:
+    emotional = state_attorney_chars.get("emotionalProfile", {})
+    return OPPONENT_TEMPLATE.format(
+        case_context=case_context,
+        aggressiveness=state_attorney_chars.get("aggressiveness", 8.5),
+        success_rate=state_attorney_chars.get("plaintiffSuccessRate", 72.5),
+        communication_style=emotional.get("communicationStyle", "Direct and Confrontational"),
+        settlement=emotional.get("opennessToSettlement", 25),
+        strengths="\n".join(
+            f"- {s.get('area', '')}: {s.get('note', '')}" for s in state_attorney_chars.get("strengths", [])[:3]
+        ),
+        tactics="\n".join(
+            f"- {t}" for t in state_attorney_chars.get("tacticalProfile", {}).get("commonTactics", [])[:3]
+        ),
+    )
+
+
+def score_level(value: float, scale: float = 10.0) -> str:
+    """``High`` / ``Moderate`` / ``Low`` for a score on a 0-``scale`` scale."""
+    if value >= 0.7 * scale:
+        return "High"
+    if value <= 0.3 * scale:
+        return "Low"
+    return "Moderate"
+
+
+def judge_tendencies(judge_chars: Mapping[str, Any]) -> str:
+    """The tendencies the judge's verdict should reflect, worded from the profile's own scores."""
+    precedent = score_level(judge_chars.get("precedentWeight", 9.0))
+    pleading = score_level(judge_chars.get("pleadingStrictness", 8.5))
+    plaintiff_friendly = judge_chars.get("plaintiffFriendly", 8.0)
+    lines = [
+        f"- {precedent} precedent weight ({PRECEDENT_NOTES[precedent]})",
+        f"- {pleading} pleading strictness ({PLEADING_NOTES[pleading]})",
+        f"- {BIAS_LABELS[score_level(plaintiff_friendly)]} bias ({plaintiff_friendly}/10)",
+    ]
+    emotional = judge_chars.get("emotionalProfile")
+    if emotional and "opennessToNovelArguments" in emotional:
+        lines.append(f"- {score_level(emotional['opennessToNovelArguments'], 100)} openness to novel arguments")
+    return "\n".join(lines)
+
+
+def render_judge_prompt(case_context: str, judge_chars: Mapping[str, Any]) -> str:
+    emotional = judge_chars.get("emotionalProfile")
+    temperament_section = ""
+    if emotional:
+        sympathy = emotional.get("sympathy", {})
+        temperament_section = JUDGE_TEMPERAMENT_TEMPLATE.format(
+            temperament=emotional.get("temperament", "Methodical"),
+            patience=emotional.get("patience", 55),
+            openness=emotional.get("opennessToNovelArguments", 15),
+            plaintiff_sympathy=sympathy.get("plaintiff", 80),
+            defendant_sympathy=sympathy.get("defendant", 20),
+        )
+    strict_areas = judge_chars.get("strictAreas")
+    strict_areas_section = ""
+    if strict_areas:
+        strict_areas_section = JUDGE_STRICT_AREAS_TEMPLATE.format(
+            strict_areas="\n".join(
+                f"- {a.get('area', '')}: {a.get('level', 0)}/10 - {a.get('note', '')}" for a in strict_areas[:3]
+            )
+        )
+    return JUDGE_TEMPLATE.format(
+        case_context=case_context,
+        judge_name=judge_chars.get("name", DEFAULT_JUDGE_NAME),
+        court_clause=f" for {judge_chars['court']}" if judge_chars.get("court") else "",
+        pleading_strictness=judge_chars.get("pleadingStrictness", 8.5),
+        precedent_weight=judge_chars.get("precedentWeight", 9.0),
+        policy_receptivity=judge_chars.get("policyReceptivity", 2.0),
+        plaintiff_friendly=judge_chars.get("plaintiffFriendly", 8.0),
+        temperament_section=temperament_section,
+        strict_areas_section=strict_areas_section,
+        tendencies=judge_tendencies(judge_chars),
+    )
+
+
+def render_lawyer_strategy(case_context: str, strategy: Mapping[str, Any]) -> str:
+    """Strategy-dependent part of the lawyer prompt (everything before the variation block)."""
+    advantages = strategy.get("advantages", [])
+    return LAWYER_STRATEGY_TEMPLATE.format(
+        case_context=case_context,
+        strategy_title=strategy.get("title", ""),
+        advantages=", ".join(advantages[:3]),
+        key_approach=advantages[0] if advantages else "",
+    )
+
+
+def render_variation_block(variation: str) -> str:
+    return LAWYER_VARIATION_TEMPLATE.format(
+        variation=variation, guidance=VARIATION_GUIDANCE.get(variation, DEFAULT_VARIATION_GUIDANCE)
+    )
+
+
+class SimulationPrompts:
+    """
+    Prompts for every run of one simulation request.
+
+    The case context, opponent prompt and judge prompt are rendered on
+    construction; :meth:`run_prompts` renders a strategy's lawyer prompt once
+    and combines it with each variation's cached block.
+    """
+
+    def __init__(
+        self,
+        case_facts: str,
+        extracted_text: str,
+        judge_chars: Mapping[str, Any],
+        state_attorney_chars: Mapping[str, Any],
+    ) -> None:
+        self.case_context = render_case_context(case_facts, extracted_text, judge_chars, state_attorney_chars)
+        self.opponent_prompt = render_opponent_prompt(self.case_context, state_attorney_chars)
+        self.judge_prompt = render_judge_prompt(self.case_context, judge_chars)
+        self._variation_blocks: Dict[str, str] = {}
+
+    def variation_block(self, variation: str) -> str:
+        block = self._variation_blocks.get(variation)
+        if block is None:
+            block = self._variation_blocks[variation] = render_variation_block(variation)
+        return block
+
+    def run_prompts(self, strategy: Mapping[str, Any], variations: Sequence[str]) -> List[Tuple[str, str, str]]:
+        """``(lawyer, opponent, judge)`` prompts for each variation of ``strategy``."""
+        lawyer_strategy = render_lawyer_strategy(self.case_context, strategy)
+        return [
+            (lawyer_strategy + self.variation_block(variation), self.opponent_prompt, self.judge_prompt)
+            for variation in variations
+        ]
@@ -0,0 +1,326 @@
+"""
+Process-wide token-bucket rate limiting per upstream service.
+
+Every upstream (the n8n webhook, the OpenAI scoring model, ...) gets one
+:class:`TokenBucket` shared by all requests and worker threads in the process:
+
+  * ``rate`` tokens per second refill the bucket up to ``burst``; each call
+    takes one token, so calls run back-to-back while quota is available and
+    are spaced out only when it is not;
+  * ``max_in_flight`` caps concurrent calls to the upstream;
+  * a 429 answer pauses the bucket for ``Retry-After`` seconds (or an
+    exponential backoff when the header is missing) and halves the effective
+    rate; each successful call then raises it again additively until the
+    configured rate is reached (AIMD).
+
+Threads use :meth:`TokenBucket.call` / :meth:`TokenBucket.slot`; coroutines use
+the ``*_async`` variants, which share the same bucket state.
+
+Limiters are looked up by name from :data:`rate_limiters`; settings come from
+the ``rate_limits`` section of ``config.yaml`` and are re-applied when it changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_RATE = 5.0
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+# Share of the configured rate regained per successful call after throttling.
+RECOVERY_STEP = 0.1
+# How often a coroutine waiting for an in-flight slot re-checks the bucket.
+ASYNC_POLL_SECONDS = 0.02
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when a slot could not be acquired within the caller's timeout."""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if value in (None, ""):
+        return None
+    try:
+        return max(0.0, float(value))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        pass
+    try:
+        moment = email.utils.parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - (time.time() if now is None else now))
+
+
+def retry_after_of(source: Any) -> Optional[float]:
+    """``Retry-After`` seconds of an HTTP response or an SDK error carrying one."""
+    response = getattr(source, "response", source)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return parse_retry_after(headers.get("retry-after") or headers.get("Retry-After"))
+    except AttributeError:
+        return None
+
+
+def is_throttled(source: Any) -> bool:
+    """Whether a response or exception represents HTTP 429."""
+    status = getattr(source, "status_code", None)
+    if status is None:
+        status = getattr(getattr(source, "response", None), "status_code", None)
+    return status == 429
+
+
+class TokenBucket:
+    """Token bucket with an in-flight cap and adaptive (AIMD) rate."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = DEFAULT_RATE,
+        burst: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        max_retries: int = 3,
+    ) -> None:
+        self.name = name
+        self._cond = threading.Condition()
+        # configure() clamps both to the configured rate and burst
+        self.current_rate = float(rate)
+        self.tokens = float("inf")
+        self.configure(rate=rate, burst=burst, max_in_flight=max_in_flight, max_retries=max_retries)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._backoff = DEFAULT_BACKOFF
+        self.in_flight = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    def configure(
+        self,
+        *,
+        rate: float = DEFAULT_RATE,
+        burst: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        max_retries: int = 3,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._cond:
+            self.rate = float(rate)
+            self.capacity = float(burst) if burst else max(1.0, self.rate)
+            self.max_in_flight = int(max_in_flight) if max_in_flight else None
+            self.max_retries = int(max_retries)
+            self.current_rate = min(self.current_rate, self.rate)
+            self.tokens = min(self.tokens, self.capacity)
+            self._cond.notify_all()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.current_rate)
+        self._updated = now
+
+    def _take(self, now: float, started: float) -> Tuple[bool, Optional[float]]:
+        """
+        Take a slot if one is free (caller holds the lock).
+
+        Returns ``(True, seconds waited)`` on success, otherwise ``(False, wait)``
+        where ``wait`` is the time until a token is due, or ``None`` when only a
+        release can free a slot.
+        """
+        self._refill(now)
+        if now < self._blocked_until:
+            return False, self._blocked_until - now
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return False, None
+        if self.tokens < 1.0:
+            return False, (1.0 - self.tokens) / self.current_rate
+        self.tokens -= 1.0
+        self.in_flight += 1
+        self.acquired += 1
+        waited = now - started
+        self.waited_seconds += waited
+        return True, waited
+
+    def _bounded_wait(self, wait: Optional[float], deadline: Optional[float], now: float) -> Optional[float]:
+        if deadline is None:
+            return wait
+        remaining = deadline - now
+        if remaining <= 0:
+            raise RateLimitTimeout(f"Timed out waiting for the {self.name} rate limiter")
+        return remaining if wait is None else min(wait, remaining)
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """Block until a call may start; returns the seconds spent waiting."""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                acquired, wait = self._take(now, started)
+                if acquired:
+                    return wait  # type: ignore[return-value]
+                self._cond.wait(self._bounded_wait(wait, deadline, now))  # woken early by release()
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> float:
+        """:meth:`acquire` for coroutines: sleeps on the event loop instead of blocking a thread."""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                acquired, wait = self._take(now, started)
+            if acquired:
+                return wait  # type: ignore[return-value]
+            # Releases cannot wake a sleeping coroutine, so slot waits are polled.
+            wait = ASYNC_POLL_SECONDS if wait is None else wait
+            await asyncio.sleep(self._bounded_wait(wait, deadline, now))  # type: ignore[arg-type]
+
+    def release(self, *, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """Finish a call; ``throttled`` reports an HTTP 429 from the upstream."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = time.monotonic()
+            if throttled:
+                self.throttled += 1
+                delay = retry_after if retry_after is not None else self._backoff
+                self._backoff = min(MAX_BACKOFF, self._backoff * 2)
+                self._blocked_until = max(self._blocked_until, now + delay)
+                self._refill(now)
+                self.current_rate = max(self.rate * RECOVERY_STEP, self.current_rate / 2)
+                self.tokens = 0.0
+            else:
+                self._backoff = DEFAULT_BACKOFF
+                if self.current_rate < self.rate:
+                    self._refill(now)
+                    self.current_rate = min(self.rate, self.current_rate + self.rate * RECOVERY_STEP)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator["Slot"]:
+        """``with bucket.slot() as slot: ...``; call ``slot.throttle(retry_after)`` on a 429."""
+        self.acquire(timeout)
+        slot = Slot()
+        try:
+            yield slot
+        finally:
+            self.release(throttled=slot.throttled, retry_after=slot.retry_after)
+
+    @asynccontextmanager
+    async def slot_async(self, timeout: Optional[float] = None) -> AsyncIterator["Slot"]:
+        """``async with bucket.slot_async() as slot: ...``"""
+        await self.acquire_async(timeout)
+        slot = Slot()
+        try:
+            yield slot
+        finally:
+            self.release(throttled=slot.throttled, retry_after=slot.retry_after)
+
+    def call(self, function: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """
+        Run ``function`` in a slot, retrying up to ``max_retries`` times on HTTP 429.
+
+        A 429 may come back as a response (``requests``) or as a raised error
+        (OpenAI SDK); either way the bucket is paused before the retry.  The
+        last throttled response is returned, the last throttled error re-raised.
+        """
+        for attempt in range(self.max_retries + 1):
+            with self.slot(timeout) as slot:
+                try:
+                    result = function()
+                except Exception as exc:
+                    if not is_throttled(exc):
+                        raise
+                    slot.throttle(retry_after_of(exc))
+                    if attempt == self.max_retries:
+                        raise
+                    continue
+                if not is_throttled(result):
+                    return result
+                slot.throttle(retry_after_of(result))
+                if attempt == self.max_retries:
+                    return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def call_async(self, function: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """:meth:`call` for coroutine functions (``httpx.AsyncClient``, ``openai.AsyncOpenAI``)."""
+        for attempt in range(self.max_retries + 1):
+            async with self.slot_async(timeout) as slot:
+                try:
+                    result = await function()
+                except Exception as exc:
+                    if not is_throttled(exc):
+                        raise
+                    slot.throttle(retry_after_of(exc))
+                    if attempt == self.max_retries:
+                        raise
+                    continue
+                if not is_throttled(result):
+                    return result
+                slot.throttle(retry_after_of(result))
+                if attempt == self.max_retries:
+                    return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "currentRate": round(self.current_rate, 3),
+                "burst": self.capacity,
+                "maxInFlight": self.max_in_flight,
+                "inFlight": self.in_flight,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "waitedSeconds": round(self.waited_seconds, 3),
+                "pausedFor": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+            }
+
+
+class Slot:
+    """Handle for one rate-limited call."""
+
+    __slots__ = ("throttled", "retry_after")
+
+    def __init__(self) -> None:
+        self.throttled = False
+        self.retry_after: Optional[float] = None
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttled = True
+        self.retry_after = retry_after
+
+
+class RateLimiters:
+    """Named token buckets shared by the whole process."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._settings: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, settings: Optional[Dict[str, Any]] = None) -> TokenBucket:
+        """Return the bucket for ``name``, (re)applying ``settings`` when they changed."""
+        settings = dict(settings or {})
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                bucket = self._buckets[name] = TokenBucket(name, **settings)
+                self._settings[name] = settings
+            elif self._settings.get(name) != settings:
+                bucket.configure(**settings)
+                self._settings[name] = settings
+            return bucket
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {name: bucket.stats() for name, bucket in sorted(buckets.items())}
+
+
+rate_limiters = RateLimiters()
@@ -0,0 +1,156 @@
+"""
+Cursor pagination, field projection and pre-serialised JSON for case listings.
+
+Listing endpoints return many large ``syllabus``/``body`` strings.  Instead of
+running ``jsonify`` over big dicts on every call:
+  * each item's static part is serialised once per ``(item key, fields)`` and
+    kept as JSON bytes in an LRU cache;
+  * per-query values (score, rank, distance) are spliced onto those bytes;
+  * the response body is assembled by byte concatenation.
+
+Ranked result sets are kept server-side under a result id so later pages are
+slices; cursors are opaque, URL-safe tokens carrying the result id and offset.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from lru_cache import LRUCache
+
+DEFAULT_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 100
+
+
+class PaginationError(ValueError):
+    """Raised for malformed cursors, page sizes or field lists."""
+
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str]) -> Tuple[str, ...]:
+    """Parse a ``fields=a,b`` projection; an empty value selects every allowed field."""
+    if not raw:
+        return tuple(allowed)
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise PaginationError(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return fields
+
+
+def parse_page_size(raw: Optional[str], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    if raw in (None, ""):
+        return default
+    try:
+        size = int(raw)  # type: ignore[arg-type]
+    except (TypeError, ValueError) as exc:
+        raise PaginationError("limit must be an integer") from exc
+    if size < 1:
+        raise PaginationError("limit must be at least 1")
+    return min(size, maximum)
+
+
+def encode_cursor(result_id: str, offset: int) -> str:
+    raw = json.dumps({"r": result_id, "o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        result_id, offset = str(payload["r"]), int(payload["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as exc:
+        raise PaginationError("Invalid cursor") from exc
+    if offset < 0:
+        raise PaginationError("Invalid cursor")
+    return result_id, offset
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON bytes (the format every cached fragment uses)."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ItemSerializer:
+    """Cache of pre-serialised item JSON, keyed by item key and field projection."""
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.cache: LRUCache[bytes] = LRUCache(maxsize)
+
+    def serialize(
+        self,
+        key: Hashable,
+        fields: Tuple[str, ...],
+        build: Any,
+        dynamic: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        """
+        Return the item's JSON bytes.
+
+        ``build()`` produces the static dict and is only called on a cache miss.
+        ``dynamic`` values (if selected by ``fields``) are appended to the
+        cached object without re-serialising it.
+        """
+        cache_key = (key, fields)
+        static = self.cache.get(cache_key)
+        if static is None:
+            item = build()
+            static = dumps({name: item[name] for name in fields if name in item})
+            self.cache.set(cache_key, static)
+        extras = [(name, value) for name, value in (dynamic or {}).items() if name in fields]
+        if not extras:
+            return static
+        tail = b",".join(dumps(name) + b":" + dumps(value) for name, value in extras)
+        return static[:-1] + (b"," if len(static) > 2 else b"") + tail + b"}"
+
+
+def assemble(items: Iterable[bytes], *, items_key: str = "cases", **fields: Any) -> bytes:
+    """Build ``{"success":true, <items_key>:[...], **fields}`` by concatenation."""
+    head = {"success": True, **{name: value for name, value in fields.items() if value is not None}}
+    head_bytes = dumps(head)
+    body = b"[" + b",".join(items) + b"]"
+    return head_bytes[:-1] + b"," + dumps(items_key) + b":" + body + b"}"
+
+
+@dataclass
+class ResultSet:
+    """Ranked items (ids or payload dicts) with optional per-item scores."""
+
+    items: Sequence[Any]
+    scores: Optional[Sequence[float]] = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def slice(self, start: int, end: int) -> List[Tuple[Any, Optional[float]]]:
+        items = self.items[start:end]
+        scores = self.scores[start:end] if self.scores is not None else [None] * len(items)
+        return list(zip(items, scores))
+
+
+class ResultSets:
+    """Server-side ranked result sets that cursors page through."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 15 * 60) -> None:
+        self.cache: LRUCache[ResultSet] = LRUCache(maxsize, ttl)
+
+    def put(self, result_id: str, results: ResultSet) -> None:
+        self.cache.set(result_id, results)
+
+    def get(self, result_id: str) -> Optional[ResultSet]:
+        return self.cache.get(result_id)
+
+    def page(
+        self, result_id: str, offset: int, size: int
+    ) -> Tuple[List[Tuple[Any, Optional[float]]], Optional[str], int]:
+        """Return ``(page, next_cursor, total)`` where ``page`` holds ``(item, score)`` pairs."""
+        results = self.cache.get(result_id)
+        if results is None:
+            raise PaginationError("Cursor expired; repeat the original request")
+        next_offset = offset + size
+        next_cursor = encode_cursor(result_id, next_offset) if next_offset < len(results) else None
+        return results.slice(offset, next_offset), next_cursor, len(results)
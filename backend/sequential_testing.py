@@ -0,0 +1,98 @@
+"""
+Sequential stopping rules for adaptive courtroom simulations.
+
+Each strategy's run scores are treated as a sample; after every round of runs
+the mean score gets a two-sided Student-t confidence interval.  A strategy
+needs no more runs once its interval no longer overlaps any other strategy's
+(its rank is settled) or lies entirely below the best strategy's lower bound
+(it is dominated and cannot win), or once it hit its run cap.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Two-sided Student-t critical values by confidence level, for 1..30 degrees of freedom
+T_CRITICAL: Dict[float, Tuple[float, ...]] = {
+    0.8: (
+        3.078, 1.886, 1.638, 1.533, 1.476, 1.440, 1.415, 1.397, 1.383, 1.372,
+        1.363, 1.356, 1.350, 1.345, 1.341, 1.337, 1.333, 1.330, 1.328, 1.325,
+        1.323, 1.321, 1.319, 1.318, 1.316, 1.315, 1.314, 1.313, 1.311, 1.310,
+    ),
+    0.9: (
+        6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+        1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+        1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697,
+    ),
+    0.95: (
+        12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+    ),
+    0.99: (
+        63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+        3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+        2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750,
+    ),
+}
+# Normal approximation beyond the table
+Z_CRITICAL = {0.8: 1.282, 0.9: 1.645, 0.95: 1.960, 0.99: 2.576}
+
+# Why a strategy stopped receiving runs
+SEPARATED = "separated"
+DOMINATED = "dominated"
+MAX_RUNS = "max_runs"
+BUDGET = "budget"
+
+
+def t_critical(confidence: float, df: int) -> float:
+    if confidence not in T_CRITICAL:
+        raise ValueError(f"Unsupported confidence level: {confidence} (use one of {sorted(T_CRITICAL)})")
+    if df < 1:
+        raise ValueError("df must be at least 1")
+    table = T_CRITICAL[confidence]
+    return table[df - 1] if df <= len(table) else Z_CRITICAL[confidence]
+
+
+def mean_interval(scores: Sequence[float], confidence: float, sd_floor: float = 0.0) -> Tuple[float, float, float]:
+    """``(mean, low, high)`` of the mean score; unbounded with fewer than two scores.
+
+    ``sd_floor`` keeps a few identical scores from producing a zero-width interval.
+    """
+    n = len(scores)
+    if n == 0:
+        return 0.0, -math.inf, math.inf
+    mean = sum(scores) / n
+    if n < 2:
+        return mean, -math.inf, math.inf
+    variance = sum((score - mean) ** 2 for score in scores) / (n - 1)
+    half_width = t_critical(confidence, n - 1) * max(math.sqrt(variance), sd_floor) / math.sqrt(n)
+    return mean, mean - half_width, mean + half_width
+
+
+def stop_reason(
+    index: int,
+    intervals: Sequence[Tuple[float, float, float]],
+    runs: int,
+    min_runs: int,
+    max_runs: int,
+) -> Optional[str]:
+    """Why strategy ``index`` needs no more runs, or None to keep sampling it."""
+    if runs >= max_runs:
+        return MAX_RUNS
+    if runs < min_runs:
+        return None
+    _, low, high = intervals[index]
+    others = [interval for other, interval in enumerate(intervals) if other != index]
+    if any(high < other_low for _, other_low, _ in others):
+        return DOMINATED
+    if all(high < other_low or low > other_high for _, other_low, other_high in others):
+        return SEPARATED
+    return None
+
+
+def interval_summary(interval: Tuple[float, float, float]) -> List[Optional[float]]:
+    """JSON-safe ``[low, high]`` (None for an unbounded side)."""
+    _, low, high = interval
+    return [None if math.isinf(low) else round(low, 3), None if math.isinf(high) else round(high, 3)]
@@ -0,0 +1,97 @@
+"""
+Content-addressed, disk-backed cache of scored courtroom simulation runs.
+
+A run is fully determined by what is sent upstream: the lawyer, opponent and
+judge prompts, the variation, and the models behind the n8n workflow and the
+scoring call.  :func:`simulation_cache_key` hashes exactly those, so re-running
+the same strategy against the same facts and profiles finds the earlier
+transcript and evaluation regardless of run ids or request order.
+
+Entries live in a :mod:`diskcache` store (SQLite + files) that survives
+restarts and is shared by every worker process; it is bounded in bytes with
+least-recently-used eviction, and each entry expires after the configured TTL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import diskcache
+
+# Bump when the cached entry layout or the key derivation changes
+CACHE_FORMAT = 1
+
+
+def simulation_cache_key(prompts: Sequence[str], variation: str, models: Sequence[str], replicate: int = 0) -> str:
+    """SHA-256 of the run's ``(lawyer, opponent, judge)`` prompts, variation and model ids.
+
+    ``replicate`` numbers repeated runs of the same prompts (adaptive simulations
+    sample a variation more than once); each replicate is cached separately.
+    """
+    lawyer_prompt, opponent_prompt, judge_prompt = prompts
+    fields = {
+        "format": CACHE_FORMAT,
+        "lawyer_prompt": lawyer_prompt,
+        "judge_prompt": judge_prompt,
+        "opponent_prompt": opponent_prompt,
+        "variation": variation,
+        "models": list(models),
+    }
+    if replicate:
+        fields["replicate"] = replicate
+    material = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class SimulationCache:
+    """Scored runs (session id, transcript, evaluation) by :func:`simulation_cache_key`."""
+
+    def __init__(self, directory: Path, size_limit: int, ttl: Optional[float] = None) -> None:
+        if size_limit <= 0:
+            raise ValueError("size_limit must be positive")
+        self.directory = Path(directory)
+        self.size_limit = size_limit
+        self.ttl = ttl
+        self._store = diskcache.Cache(
+            str(self.directory), size_limit=size_limit, eviction_policy="least-recently-used"
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._store.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def set(self, key: str, session_id: str, transcript: Dict[str, Any], evaluation: Dict[str, Any]) -> None:
+        entry = {"session_id": session_id, "transcript": transcript, "evaluation": evaluation}
+        self._store.set(key, entry, expire=self.ttl)
+        with self._lock:
+            self.writes += 1
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def close(self) -> None:
+        self._store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._store),
+            "bytes": self._store.volume(),
+            "maxbytes": self.size_limit,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
@@ -0,0 +1,375 @@
+"""
+Persistent simulation jobs: background execution with replayable event logs.
+
+A ``/api/run-simulations`` request becomes a job with an id.  The job runs on
+a worker pool independently of the HTTP connection that started it and
+appends every stream event to a SQLite log (``JobStore``); a stream is just a
+reader of that log.  A client that lost its connection reconnects with the
+last event id it saw (``<job_id>:<seq>``) and receives the events it missed,
+then the live tail, while the job's runs keep going in the meantime.
+
+Jobs are executed by the process that created them.  When a process dies,
+jobs it was still running are marked ``interrupted`` by the next process that
+opens the store on the same host.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("complete", "failed", "cancelled", "interrupted")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs(updated_at);
+"""
+
+
+def process_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_alive(owner: str) -> bool:
+    """Whether the process that owns a job may still be running (other hosts are assumed alive)."""
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    if int(pid) == os.getpid():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def format_event_id(job_id: str, seq: int) -> str:
+    return f"{job_id}:{seq}"
+
+
+def parse_event_id(value: Optional[str]) -> Tuple[Optional[str], int]:
+    """Split a ``Last-Event-ID`` into ``(job_id, seq)``; a bare number is a sequence without a job."""
+    value = (value or "").strip()
+    if not value:
+        return None, 0
+    job_id, _, seq = value.rpartition(":")
+    if not seq.isdigit():
+        raise ValueError(f"Invalid event id: {value}")
+    return job_id or None, int(seq)
+
+
+class JobStore:
+    """SQLite tables of jobs and their events, safe to share between threads."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, parameters: Iterable[Any] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._connection.execute(sql, tuple(parameters))
+
+    def create(self, job_id: str, request: Dict[str, Any], owner: str) -> None:
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, status, request, owner, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?)",
+            (job_id, json.dumps(request), owner, now, now),
+        )
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, error = COALESCE(?, error), updated_at = ? WHERE id = ?",
+            (status, error, time.time(), job_id),
+        )
+
+    def append(self, job_id: str, seq: int, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.execute(
+                    "INSERT INTO events (job_id, seq, data) VALUES (?, ?, ?)", (job_id, seq, json.dumps(event))
+                )
+                self._connection.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def events_after(self, job_id: str, seq: int) -> List[Tuple[int, Dict[str, Any]]]:
+        rows = self._execute(
+            "SELECT seq, data FROM events WHERE job_id = ? AND seq > ? ORDER BY seq", (job_id, seq)
+        ).fetchall()
+        return [(row_seq, json.loads(data)) for row_seq, data in rows]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._execute(
+            "SELECT id, status, owner, error, created_at, updated_at, "
+            "(SELECT COALESCE(MAX(seq), 0) FROM events WHERE job_id = jobs.id) "
+            "FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        job_id, status, owner, error, created_at, updated_at, last_seq = row
+        return {
+            "id": job_id,
+            "status": status,
+            "owner": owner,
+            "error": error,
+            "createdAt": created_at,
+            "updatedAt": updated_at,
+            "lastEventId": format_event_id(job_id, last_seq) if last_seq else None,
+        }
+
+    def orphaned(self) -> List[Tuple[str, str]]:
+        """``(job_id, owner)`` of queued or running jobs."""
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        return self._execute(
+            f"SELECT id, owner FROM jobs WHERE status IN ({placeholders})", ACTIVE_STATUSES
+        ).fetchall()
+
+    def last_seq(self, job_id: str) -> int:
+        row = self._execute("SELECT COALESCE(MAX(seq), 0) FROM events WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0]
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs (and their events) last updated before ``older_than`` (epoch seconds)."""
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        cursor = self._execute(
+            f"DELETE FROM jobs WHERE updated_at < ? AND status IN ({placeholders})", (older_than, *FINISHED_STATUSES)
+        )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class SimulationJobs:
+    """
+    Runs simulation jobs in the background and fans their events out to readers.
+
+    Sync readers block in :meth:`wait`; async readers register a callback with
+    :meth:`add_listener` (called from the publishing thread) and wake their
+    event loop from it.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 16, retention: Optional[float] = None) -> None:
+        self.store = store
+        self.workers = max(1, int(workers))
+        self.owner = process_owner()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._condition = threading.Condition()
+        self._last_seq: Dict[str, int] = {}  # jobs of this process that have not finished
+        self._cancelled: Set[str] = set()
+        self._listeners: Dict[str, Set[Callable[[], None]]] = {}
+        self.started = 0
+        for job_id, owner in store.orphaned():
+            if not owner_alive(owner):
+                self._interrupt(job_id)
+        if retention:
+            store.purge(time.time() - retention)
+
+    def _interrupt(self, job_id: str) -> None:
+        seq = self.store.last_seq(job_id) + 1
+        self.store.append(job_id, seq, job_error_event("Simulation job was interrupted by a server restart"))
+        self.store.set_status(job_id, "interrupted", "Server restarted")
+
+    def create(self, request: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, request, self.owner)
+        with self._condition:
+            self._last_seq[job_id] = 0
+        self.started += 1
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def is_active(self, job_id: str) -> bool:
+        """Whether the job is still producing events in this process."""
+        with self._condition:
+            return job_id in self._last_seq
+
+    def events_after(self, job_id: str, seq: int) -> List[Tuple[int, Dict[str, Any]]]:
+        return self.store.events_after(job_id, seq)
+
+    def publish(self, job_id: str, event: Dict[str, Any]) -> int:
+        """Append an event to the job's log and wake its readers; returns its sequence number."""
+        with self._condition:
+            seq = self._last_seq[job_id] + 1
+            self.store.append(job_id, seq, event)
+            self._last_seq[job_id] = seq
+            self._condition.notify_all()
+        self._notify_listeners(job_id)
+        return seq
+
+    def mark_running(self, job_id: str) -> None:
+        self.store.set_status(job_id, "running")
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        self.store.set_status(job_id, status, error)
+        with self._condition:
+            self._last_seq.pop(job_id, None)
+            self._cancelled.discard(job_id)
+            self._condition.notify_all()
+        self._notify_listeners(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a running job to stop at its next event; False if it is not active here."""
+        with self._condition:
+            if job_id not in self._last_seq:
+                return False
+            self._cancelled.add(job_id)
+            return True
+
+    def cancelled(self, job_id: str) -> bool:
+        with self._condition:
+            return job_id in self._cancelled
+
+    def wait(self, job_id: str, seq: int, timeout: float) -> bool:
+        """Block until the job has an event after ``seq`` or finished; False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: job_id not in self._last_seq or self._last_seq[job_id] > seq, timeout
+            )
+
+    def add_listener(self, job_id: str, callback: Callable[[], None]) -> None:
+        with self._condition:
+            self._listeners.setdefault(job_id, set()).add(callback)
+
+    def remove_listener(self, job_id: str, callback: Callable[[], None]) -> None:
+        with self._condition:
+            listeners = self._listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(callback)
+                if not listeners:
+                    del self._listeners[job_id]
+
+    def _notify_listeners(self, job_id: str) -> None:
+        with self._condition:
+            listeners = list(self._listeners.get(job_id, ()))
+        for callback in listeners:
+            callback()
+
+    def submit(self, job_id: str, events: Callable[[], Iterator[Dict[str, Any]]]) -> None:
+        """Run a job on the worker pool; ``events`` returns the job's event iterator when it starts."""
+        with self._condition:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="simulation-job")
+        self._pool.submit(self.run, job_id, events)
+
+    def run(self, job_id: str, events: Callable[[], Iterator[Dict[str, Any]]]) -> None:
+        """Execute a job in the calling thread, publishing its events until it ends or is cancelled."""
+        self.mark_running(job_id)
+        status, error, stream = "failed", None, None
+        try:
+            stream = events()
+            for event in stream:
+                self.publish(job_id, event)
+                if self.cancelled(job_id):
+                    status, error = "cancelled", "Cancelled by request"
+                    self.publish(job_id, job_error_event("Simulation job cancelled"))
+                    break
+                status, error = job_outcome(event)
+        except Exception as e:
+            error = str(e)
+            self.publish(job_id, job_error_event(error))
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            self.finish(job_id, status, error)
+
+    async def run_async(self, job_id: str, events: AsyncIterator[Dict[str, Any]]) -> None:
+        """Async counterpart of :meth:`run` for an async event generator (store writes run in threads)."""
+        await asyncio.to_thread(self.mark_running, job_id)
+        status, error = "failed", None
+        try:
+            async for event in events:
+                await asyncio.to_thread(self.publish, job_id, event)
+                if self.cancelled(job_id):
+                    status, error = "cancelled", "Cancelled by request"
+                    await asyncio.to_thread(self.publish, job_id, job_error_event("Simulation job cancelled"))
+                    break
+                status, error = job_outcome(event)
+        except asyncio.CancelledError:
+            status, error = "interrupted", "Server shut down"
+            # The task is already cancelled; the write still runs off the loop like every other one
+            await asyncio.to_thread(
+                self.publish, job_id, job_error_event("Simulation job was interrupted by a server shutdown")
+            )
+            raise
+        except Exception as e:
+            error = str(e)
+            await asyncio.to_thread(self.publish, job_id, job_error_event(error))
+        finally:
+            aclose = getattr(events, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            await asyncio.to_thread(self.finish, job_id, status, error)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            active = len(self._last_seq)
+        return {
+            "active": active,
+            "workers": self.workers,
+            "started": self.started,
+            "stored": self.store.counts(),
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self.store.close()
+
+
+def job_error_event(message: str) -> Dict[str, Any]:
+    """The ``error`` stream event a job ends with when it fails outside the pipeline."""
+    return {"type": "error", "success": False, "error": message}
+
+
+def job_outcome(event: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Job status and error implied by its latest event (a stream ends with ``complete`` or ``error``)."""
+    if event.get("type") == "complete":
+        return "complete", None
+    if event.get("type") == "error":
+        return "failed", event.get("error")
+    return "failed", "Simulation stream ended early"
@@ -0,0 +1,67 @@
+"""
+In-memory cache of generated defense strategies, keyed by the selected case set.
+
+Users often ask for strategies over the same handful of precedents, picked in
+a different order.  :func:`canonical_cases` puts a selection into one order
+(by case id, then syllabus) and :func:`strategy_cache_key` hashes the ids and
+syllabi in that order together with the model, so every ordering of the same
+cases maps to one entry.  The prompt is built from the canonical order too,
+so a fresh generation does not depend on the order the cases were picked in.
+
+Entries are kept in a bounded :class:`~lru_cache.LRUCache` (least recently
+used evicted first) and expire after the configured TTL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from lru_cache import LRUCache
+
+# Bump when the prompt or the cached strategy layout changes
+CACHE_FORMAT = 1
+
+
+def case_fingerprint(case: Dict[str, Any]) -> Tuple[str, str]:
+    """``(id, syllabus)`` of a selected case, the fields that identify it for the prompt."""
+    return str(case.get("id") or ""), str(case.get("syllabus") or "")
+
+
+def canonical_cases(cases: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """``cases`` in an order that does not depend on how they were selected."""
+    return sorted(cases, key=case_fingerprint)
+
+
+def strategy_cache_key(cases: Sequence[Dict[str, Any]], model: str) -> str:
+    """SHA-256 of the selected cases' ids and syllabi (order-insensitive) and ``model``."""
+    material = json.dumps(
+        {
+            "format": CACHE_FORMAT,
+            "model": model,
+            "cases": sorted(case_fingerprint(case) for case in cases),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class StrategyCache:
+    """Formatted strategies by :func:`strategy_cache_key`."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None) -> None:
+        self.cache: LRUCache[List[Dict[str, Any]]] = LRUCache(maxsize, ttl)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        return self.cache.get(key)
+
+    def put(self, key: str, strategies: List[Dict[str, Any]]) -> None:
+        self.cache.set(key, strategies)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
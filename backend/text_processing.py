@@ -0,0 +1,61 @@
+"""
+Text helpers shared by the local case indexes.
+
+Keeps tokenisation and case-identity rules in one place so the vector index,
+the keyword index and the API all agree on what a "case" and a "term" are.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+# Words joined by dots are kept together so statute citations such as
+# "R.C. 4511.20" survive as "r.c" and "4511.20" instead of four fragments.
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+OPINION_URL_PATTERN = re.compile(r"/opinion/(\d+)/")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from had has have he her his in is it its of on or
+    that the their this to was were which with
+    """.split()
+)
+
+
+def tokenize(text: Optional[str], *, drop_stopwords: bool = True) -> List[str]:
+    """Lower-case word tokens of ``text`` (optionally without stopwords)."""
+    if not text:
+        return []
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if drop_stopwords:
+        return [token for token in tokens if token not in STOPWORDS]
+    return tokens
+
+
+def case_text(case: Dict[str, Any]) -> str:
+    """Text used to represent a case in the local indexes (caption + syllabus)."""
+    name = str(case.get("caseName") or "").strip()
+    syllabus = str(case.get("syllabus") or "").strip()
+    if name and syllabus:
+        return f"{name}.\n\n{syllabus}"
+    return name or syllabus
+
+
+def case_identifier(case: Dict[str, Any]) -> Optional[int]:
+    """
+    Return the CourtListener cluster id of a case.
+
+    Most records in the exported datasets omit ``cluster_id`` but carry it in
+    ``absolute_url`` (``/opinion/<cluster_id>/<slug>/``), so fall back to that.
+    """
+    raw_id = case.get("cluster_id")
+    if raw_id not in (None, ""):
+        try:
+            return int(raw_id)
+        except (TypeError, ValueError):
+            return None
+    match = OPINION_URL_PATTERN.search(str(case.get("absolute_url") or ""))
+    if match:
+        return int(match.group(1))
+    return None
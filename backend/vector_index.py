@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Local, memory-mapped embedding index for similar-case ranking.
+
+The index is a precomputed ``float32`` matrix of L2-normalised case embeddings
+saved as ``<name>.npy`` next to a ``<name>.json`` manifest (row ids, embedder
+and corpus fingerprint).  At query time the matrix is memory-mapped and ranked
+with a single matmul plus ``argpartition``, so similar-case lookups never leave
+the process.
+
+Two embedders are available:
+  * ``hashing`` - a deterministic feature-hashing embedder that needs no network
+    access; it is the default and what offline runs and tests use.
+  * ``openai``  - OpenAI embeddings, for deployments that want semantic vectors.
+
+Build (or refresh) an index from the command line with::
+
+    python backend/vector_index.py --input data/reckless_driving_cases.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from text_processing import case_identifier, case_text, tokenize
+
+DEFAULT_DIMENSIONS = 384
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parent.parent / "data" / "index"
+DEFAULT_OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+INDEX_FORMAT_VERSION = 1
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-words embedder based on signed feature hashing.
+
+    Unigrams and bigrams are hashed with BLAKE2 (stable across processes, unlike
+    ``hash()``) into ``dimensions`` buckets with sublinear term weighting.  It is
+    not semantic, but it is fast, reproducible and needs no model download.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS) -> None:
+        self.dimensions = int(dimensions)
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.dimensions}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            counts: Dict[str, int] = {}
+            for feature in features:
+                counts[feature] = counts.get(feature, 0) + 1
+            for feature, count in counts.items():
+                bucket, sign = self._bucket(feature)
+                matrix[row, bucket] += sign * (1.0 + np.log(count))
+        return normalize_rows(matrix)
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        cached = self._buckets.get(feature)
+        if cached is None:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            cached = (digest % self.dimensions, 1.0 if digest >> 63 else -1.0)
+            self._buckets[feature] = cached
+        return cached
+
+
+class OpenAIEmbedder:
+    """Embedder backed by the OpenAI embeddings endpoint."""
+
+    def __init__(
+        self,
+        model: str = DEFAULT_OPENAI_EMBEDDING_MODEL,
+        dimensions: Optional[int] = None,
+        client: Any = None,
+        batch_size: int = 256,
+    ) -> None:
+        self.model = model
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+        self._client = client
+
+    @property
+    def name(self) -> str:
+        suffix = f"-{self.dimensions}" if self.dimensions else ""
+        return f"openai-{self.model}{suffix}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        client = self._client
+        if client is None:
+            from openai import OpenAI  # type: ignore[import]
+
+            client = self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        extra: Dict[str, Any] = {"dimensions": self.dimensions} if self.dimensions else {}
+        rows: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = [text or " " for text in texts[start:start + self.batch_size]]
+            response = client.embeddings.create(model=self.model, input=batch, **extra)
+            rows.extend(item.embedding for item in response.data)
+        return normalize_rows(np.asarray(rows, dtype=np.float32))
+
+
+def build_embedder(settings: Optional[Dict[str, Any]] = None) -> Any:
+    """Create an embedder from the ``local_index`` config section."""
+    settings = settings or {}
+    kind = str(settings.get("embedder", "hashing")).lower()
+    dimensions = settings.get("dimensions")
+    if kind == "hashing":
+        return HashingEmbedder(int(dimensions or DEFAULT_DIMENSIONS))
+    if kind == "openai":
+        return OpenAIEmbedder(
+            model=settings.get("embedding_model") or DEFAULT_OPENAI_EMBEDDING_MODEL,
+            dimensions=int(dimensions) if dimensions else None,
+        )
+    raise ValueError(f"Unsupported local_index.embedder '{kind}'. Use 'hashing' or 'openai'.")
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalise each row in place (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def corpus_fingerprint(ids: Iterable[int], texts: Iterable[str]) -> str:
+    """Content hash identifying the corpus an index was built from."""
+    digest = hashlib.sha256()
+    for case_id, text in zip(ids, texts):
+        digest.update(str(case_id).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+def prepare_corpus(cases: Iterable[Dict[str, Any]]) -> Tuple[List[int], List[str]]:
+    """Return the ids and index texts of every identifiable case (first occurrence wins)."""
+    ids: List[int] = []
+    texts: List[str] = []
+    seen = set()
+    for case in cases:
+        case_id = case_identifier(case)
+        if case_id is None or case_id in seen:
+            continue
+        seen.add(case_id)
+        ids.append(case_id)
+        texts.append(case_text(case))
+    return ids, texts
+
+
+@dataclass
+class SearchHit:
+    case_id: int
+    row: int
+    score: float
+
+
+class VectorIndex:
+    """Dense embedding matrix plus row-to-case-id mapping."""
+
+    def __init__(self, ids: np.ndarray, matrix: np.ndarray, embedder_name: str, fingerprint: str) -> None:
+        self.ids = ids
+        self.matrix = matrix
+        self.embedder_name = embedder_name
+        self.fingerprint = fingerprint
+        self._rows = {int(case_id): row for row, case_id in enumerate(ids.tolist())}
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    @classmethod
+    def build(cls, cases: Iterable[Dict[str, Any]], embedder: Any) -> "VectorIndex":
+        ids, texts = prepare_corpus(cases)
+        if texts:
+            matrix = np.ascontiguousarray(embedder.embed(texts), dtype=np.float32)
+        else:
+            matrix = np.zeros((0, getattr(embedder, "dimensions", None) or DEFAULT_DIMENSIONS), dtype=np.float32)
+        return cls(np.asarray(ids, dtype=np.int64), matrix, embedder.name, corpus_fingerprint(ids, texts))
+
+    def save(self, directory: Path, name: str) -> None:
+        """Write ``<name>.npy`` and ``<name>.json`` atomically."""
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "format": INDEX_FORMAT_VERSION,
+            "embedder": self.embedder_name,
+            "fingerprint": self.fingerprint,
+            "dimensions": int(self.matrix.shape[1]),
+            "ids": self.ids.tolist(),
+        }
+        atomic_write(directory / f"{name}.npy", lambda handle: np.save(handle, self.matrix))
+        atomic_write(
+            directory / f"{name}.json",
+            lambda handle: handle.write(json.dumps(manifest).encode("utf-8")),
+        )
+
+    @classmethod
+    def load(cls, directory: Path, name: str, *, mmap: bool = True) -> "VectorIndex":
+        manifest = json.loads((directory / f"{name}.json").read_text(encoding="utf-8"))
+        if manifest.get("format") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format in '{directory / name}'.")
+        matrix = np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+        ids = np.asarray(manifest["ids"], dtype=np.int64)
+        if matrix.shape[0] != ids.shape[0]:
+            raise ValueError(f"Index '{name}' has {matrix.shape[0]} rows but {ids.shape[0]} ids.")
+        return cls(ids, matrix, manifest["embedder"], manifest["fingerprint"])
+
+    def row_of(self, case_id: int) -> Optional[int]:
+        return self._rows.get(int(case_id))
+
+    def rows_of(self, case_ids: Iterable[int]) -> np.ndarray:
+        """Sorted row positions of the given case ids (unknown ids are skipped)."""
+        rows = [self._rows[int(case_id)] for case_id in case_ids if int(case_id) in self._rows]
+        return np.asarray(sorted(rows), dtype=np.int64)
+
+    def vector_of(self, case_id: int) -> Optional[np.ndarray]:
+        row = self.row_of(case_id)
+        return None if row is None else np.asarray(self.matrix[row])
+
+    def scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every row against ``query_vector``."""
+        return self.matrix @ np.asarray(query_vector, dtype=np.float32).reshape(-1)
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        k: int,
+        *,
+        exclude: Iterable[int] = (),
+        restrict_to: Optional[Iterable[int]] = None,
+    ) -> List[SearchHit]:
+        """
+        Return the ``k`` highest-scoring rows, best first.
+
+        ``restrict_to`` limits ranking to the given case ids; only those rows are
+        multiplied, so a filtered search costs O(len(restrict_to)).
+        """
+        if len(self) == 0 or k <= 0:
+            return []
+        excluded = {int(case_id) for case_id in exclude}
+        query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        if restrict_to is None:
+            rows = np.arange(len(self))
+            scores = self.scores(query)
+            for case_id in excluded:
+                row = self.row_of(case_id)
+                if row is not None:
+                    scores[row] = -np.inf
+        else:
+            rows = self.rows_of(case_id for case_id in restrict_to if int(case_id) not in excluded)
+            scores = np.asarray(self.matrix[rows]) @ query
+        return [
+            SearchHit(case_id=int(self.ids[rows[position]]), row=int(rows[position]), score=float(scores[position]))
+            for position in top_k_indices(scores, k)
+            if np.isfinite(scores[position])
+        ]
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest scores in descending order (O(n + k log k))."""
+    k = min(int(k), scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def load_or_build_index(
+    cases: Sequence[Dict[str, Any]],
+    *,
+    directory: Path,
+    name: str,
+    embedder: Any,
+) -> VectorIndex:
+    """
+    Memory-map the prebuilt index if it matches the corpus and embedder,
+    otherwise rebuild it and persist it for the next process.
+    """
+    ids, texts = prepare_corpus(cases)
+    fingerprint = corpus_fingerprint(ids, texts)
+    try:
+        index = VectorIndex.load(directory, name)
+        if index.fingerprint == fingerprint and index.embedder_name == embedder.name:
+            return index
+        logging.info("Local index '%s' is stale; rebuilding.", name)
+    except FileNotFoundError:
+        logging.info("Local index '%s' not found; building it.", name)
+    except (ValueError, KeyError, json.JSONDecodeError) as exc:
+        logging.warning("Local index '%s' is unreadable (%s); rebuilding.", name, exc)
+
+    index = VectorIndex.build(cases, embedder)
+    try:
+        index.save(directory, name)
+        return VectorIndex.load(directory, name)
+    except OSError as exc:
+        logging.warning("Could not persist local index '%s': %s", name, exc)
+        return index
+
+
+def atomic_write(path: Path, write: Any) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Build the local memory-mapped embedding index for a case dataset.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--input", type=Path, required=True, help="JSON array of case records.")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_INDEX_DIR, help="Index directory.")
+    parser.add_argument("--name", help="Index name (defaults to the input file stem).")
+    parser.add_argument("--embedder", choices=("hashing", "openai"), default="hashing")
+    parser.add_argument("--dimensions", type=int, help="Embedding dimensions.")
+    parser.add_argument("--embedding-model", help="OpenAI embedding model (openai embedder only).")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    with args.input.open("r", encoding="utf-8") as handle:
+        cases = json.load(handle)
+    embedder = build_embedder(
+        {"embedder": args.embedder, "dimensions": args.dimensions, "embedding_model": args.embedding_model}
+    )
+    name = args.name or args.input.stem
+    index = load_or_build_index(cases, directory=args.output_dir, name=name, embedder=embedder)
+    logging.info("Index '%s' ready: %s cases x %s dims (%s).", name, len(index), index.matrix.shape[1], index.embedder_name)
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
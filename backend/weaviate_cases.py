@@ -15,6 +15,7 @@ an existing Weaviate instance (local or cloud).  Authenticate via `WEAVIATE_URL`
 from __future__ import annotations
 
 import argparse
+import functools
 import inspect
 import json
 import logging
@@ -33,23 +34,33 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-try:
-    import weaviate
-except ImportError as exc:  # pragma: no cover - dependency handled via environment.yml
-    raise SystemExit(
-        "The 'weaviate-client' package is required to run this script. "
-        "Install it in your environment (see environment.yml)."
-    ) from exc
+@functools.lru_cache(maxsize=None)
+def load_weaviate() -> Tuple[Any, Any, Any]:
+    """
+    Import the Weaviate client on first use and return ``(weaviate, Auth, MetadataQuery)``.
 
-try:  # New-style auth helper (Weaviate client v4)
-    from weaviate.classes.init import Auth  # type: ignore
-except ImportError:  # pragma: no cover - fallback for older client versions
-    Auth = None  # type: ignore
+    The client package takes over a second to import, so it is deferred until a
+    connection is actually made; the API server imports it during warm-up.
+    """
+    try:
+        import weaviate
+    except ImportError as exc:  # pragma: no cover - dependency handled via environment.yml
+        raise SystemExit(
+            "The 'weaviate-client' package is required to run this script. "
+            "Install it in your environment (see environment.yml)."
+        ) from exc
+
+    try:  # New-style auth helper (Weaviate client v4)
+        from weaviate.classes.init import Auth  # type: ignore
+    except ImportError:  # pragma: no cover - fallback for older client versions
+        Auth = None  # type: ignore
+
+    try:
+        from weaviate.classes.query import MetadataQuery  # type: ignore
+    except ImportError:  # pragma: no cover - metadata retrieval optional
+        MetadataQuery = None  # type: ignore
+    return weaviate, Auth, MetadataQuery
 
-try:
-    from weaviate.classes.query import MetadataQuery  # type: ignore
-except ImportError:  # pragma: no cover - metadata retrieval optional
-    MetadataQuery = None  # type: ignore
 
 DEFAULT_COLLECTION_NAME = "CourtCase"
 SUPPORTED_VECTOR_MODULES = {"text2vec-weaviate", "text2vec-openai", "text2vec-cohere"}
@@ -192,6 +203,7 @@ def connect_weaviate_client(connection: ConnectionOptions) -> Any:
 
     Prefers the v4 `connect_to_weaviate_cloud` helper. Falls back to legacy Client.
     """
+    weaviate, Auth, _ = load_weaviate()
     base_headers = {}
     if connection.openai_api_key:
         base_headers["X-OpenAI-Api-Key"] = connection.openai_api_key
@@ -499,10 +511,16 @@ def derive_query_via_reasoning(
     model: Optional[str],
     effort: Optional[str],
     api_base: Optional[str],
+    client: Optional[Any] = None,
+    gateway: Optional[Any] = None,
 ) -> str:
-    """Call the OpenAI Responses API to produce a single natural-language query."""
+    """Call the OpenAI Responses API to produce a single natural-language query.
+
+    ``client`` overrides the OpenAI client (the API server injects stand-ins for benchmarks);
+    ``gateway`` (an ``llm_gateway.LLMGateway``) routes the call through the API server's
+    response cache, concurrency caps and token accounting.
+    """
     import os
-    from openai import OpenAI  # type: ignore[import]
 
     api_key=os.getenv('OPENAI_API_KEY')
 
@@ -520,14 +538,18 @@ def derive_query_via_reasoning(
         f"Document:\n{trimmed}"
     )
 
-    client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
-    result = client.responses.create(
+    if client is None:
+        from openai import OpenAI  # type: ignore[import]
+
+        client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+    request = dict(
         model=model_name,
         input=prompt,
         reasoning={"effort": effort_level},
         max_output_tokens=4000,
         text={"verbosity": "low"},
     )
+    result = gateway.responses(client, request) if gateway is not None else client.responses.create(**request)
 
     return (result.output_text or "").strip()
 
@@ -594,6 +616,29 @@ def build_search_namespace(
         reasoning_model=search_cfg.get("reasoning_model"),
         reasoning_effort=search_cfg.get("reasoning_effort", "low"),
         reasoning_api_base=search_cfg.get("reasoning_api_base"),
+        keyword_index=build_keyword_index_namespace(search_cfg.get("keyword_index")),
+    )
+
+
+def build_keyword_index_namespace(keyword_cfg: Any) -> Optional[SimpleNamespace]:
+    """Create the hybrid-search options (local BM25 index fused with RRF) from config."""
+    if not keyword_cfg:
+        return None
+    if not isinstance(keyword_cfg, dict):
+        raise SystemExit("'search.keyword_index' must be a mapping.")
+    if not keyword_cfg.get("enabled", True):
+        return None
+    inputs = keyword_cfg.get("inputs") or []
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    if not isinstance(inputs, list) or not inputs:
+        raise SystemExit("'search.keyword_index.inputs' must list at least one case dataset.")
+    input_paths = [Path(item) for item in inputs]
+    return SimpleNamespace(
+        inputs=input_paths,
+        directory=Path(keyword_cfg.get("directory", "data/index")),
+        name=keyword_cfg.get("name") or "+".join(path.stem for path in input_paths),
+        rrf_k=int(keyword_cfg.get("rrf_k", 60)),
     )
 
 
@@ -792,6 +837,7 @@ def search_cases(
         logging.info("Running similarity search (k=%s).", args.top_k)
 
         metadata_query = None
+        MetadataQuery = load_weaviate()[2]
         if args.include_distance and MetadataQuery is not None:
             metadata_query = MetadataQuery(distance=True, certainty=True)  # type: ignore[call-arg]
 
@@ -857,6 +903,10 @@ def search_cases(
                     entry["metadata"] = properties["metadata"]
             results.append(entry)
 
+        keyword_settings = getattr(args, "keyword_index", None)
+        if keyword_settings is not None:
+            results = fuse_with_keyword_index(results, query_text, keyword_settings, args.top_k)
+
         print(json.dumps(results, indent=2))
         return results
     finally:
@@ -866,6 +916,76 @@ def search_cases(
             pass
 
 
+def fuse_with_keyword_index(
+    results: List[Dict[str, Any]],
+    query_text: str,
+    settings: SimpleNamespace,
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """
+    Re-rank Weaviate vector hits together with a local BM25 ranking using RRF.
+
+    Cases only found by the keyword index are filled in from the local dataset.
+    Results are matched by CourtListener cluster id, falling back to the id in
+    ``absolute_url`` because most records were ingested without ``cluster_id``.
+    """
+    from bm25_index import load_or_build_bm25, reciprocal_rank_fusion
+    from text_processing import case_identifier
+
+    cases: List[Dict[str, Any]] = []
+    source_of: Dict[int, str] = {}
+    for path in settings.inputs:
+        for record in iter_dataset_records(path, "auto", None):
+            cases.append(record)
+            case_id = case_identifier(record)
+            if case_id is not None:
+                source_of.setdefault(case_id, path.name)
+    cases_by_id: Dict[int, Dict[str, Any]] = {}
+    for record in cases:
+        cases_by_id.setdefault(case_identifier(record), record)
+
+    index = load_or_build_bm25(cases, directory=settings.directory, name=settings.name)
+    keyword_hits = index.search(query_text, max(top_k, len(results)))
+    logging.info("Keyword index returned %s hits; fusing with %s vector hits.", len(keyword_hits), len(results))
+
+    def result_key(entry: Dict[str, Any]) -> Any:
+        raw_id = str(entry.get("case_id", ""))
+        case_id = case_identifier(
+            {"cluster_id": raw_id if raw_id.isdigit() else None, "absolute_url": entry.get("absolute_url")}
+        )
+        return case_id if case_id is not None else raw_id
+
+    entries_by_key: Dict[Any, Dict[str, Any]] = {}
+    vector_ranking: List[Any] = []
+    for entry in results:
+        key = result_key(entry)
+        if key not in entries_by_key:
+            entries_by_key[key] = entry
+            vector_ranking.append(key)
+
+    fused = reciprocal_rank_fusion(
+        [vector_ranking, [hit.case_id for hit in keyword_hits]], k=settings.rrf_k
+    )
+
+    fused_results: List[Dict[str, Any]] = []
+    for rank, (key, score) in enumerate(fused[:top_k], start=1):
+        entry = entries_by_key.get(key)
+        if entry is None:
+            record = cases_by_id[key]
+            entry = {"case_id": str(key)}
+            for field_name, value in (
+                ("title", record.get("caseName")),
+                ("body", record.get("syllabus")),
+                ("source_file", source_of.get(key)),
+                ("absolute_url", record.get("absolute_url")),
+                ("judge", record.get("judge")),
+            ):
+                if value:
+                    entry[field_name] = value
+        fused_results.append({**entry, "rank": rank, "fusion_score": score})
+    return fused_results
+
+
 def build_parser() -> argparse.ArgumentParser:
     """Build the configuration-first CLI parser."""
     parser = argparse.ArgumentParser(
@@ -0,0 +1,283 @@
+"""
+Pooled, retrying client for the n8n simulation webhook, behind a circuit breaker.
+
+:class:`WebhookClient` wraps one HTTP transport (a ``requests.Session`` with a
+bounded keep-alive pool per host, an ``httpx.AsyncClient``, or an injected
+stand-in) shared by every simulation run in the process:
+
+  * a 5xx answer, a timeout or a dropped connection is retried up to
+    ``retries`` times after an exponential backoff with full jitter
+    (``uniform(0, min(max_backoff, backoff * 2 ** attempt))``), so runs that
+    failed together do not retry together;
+  * each attempt goes through the upstream's rate limiter, which keeps
+    handling 429 / ``Retry-After`` on its own;
+  * a :class:`CircuitBreaker` counts calls that still failed after their
+    retries.  ``failure_threshold`` consecutive failures open it: further calls
+    raise :class:`CircuitOpenError` immediately instead of waiting out their
+    timeouts.  After ``reset_seconds`` one probe call is let through; its
+    success closes the circuit again, its failure re-opens it.
+
+Breakers are looked up by upstream name from :data:`circuit_breakers`, so the
+Flask and ASGI paths to the same webhook trip and recover together.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (TimeoutError, ConnectionError)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+def backoff_delay(attempt: int, backoff: float, max_backoff: float) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt + 1``."""
+    return random.uniform(0.0, min(max_backoff, backoff * 2 ** attempt))
+
+
+def is_server_error(response: Any) -> bool:
+    status = getattr(response, "status_code", None)
+    return isinstance(status, int) and 500 <= status < 600
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+        self.configure(failure_threshold, reset_seconds)
+
+    def configure(self, failure_threshold: int = 5, reset_seconds: float = 30.0) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        with self._lock:
+            self.failure_threshold = int(failure_threshold)
+            self.reset_seconds = float(reset_seconds)
+
+    def before_call(self) -> None:
+        """Admit a call, or raise :class:`CircuitOpenError` while the circuit is open."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"{self.name} circuit breaker open after {self.consecutive_failures} consecutive failures; "
+                f"retrying in {max(0, math.ceil(remaining))}s"
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self) -> None:
+        """Give back an admitted call that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+            return {
+                "state": self.state,
+                "consecutiveFailures": self.consecutive_failures,
+                "failureThreshold": self.failure_threshold,
+                "resetSeconds": self.reset_seconds,
+                "retryIn": round(retry_in, 3),
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class CircuitBreakers:
+    """Named circuit breakers shared by the whole process."""
+
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._settings: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, settings: Optional[Dict[str, Any]] = None) -> CircuitBreaker:
+        """Return the breaker for ``name``, (re)applying ``settings`` when they changed."""
+        settings = dict(settings or {})
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, **settings)
+                self._settings[name] = settings
+            elif self._settings.get(name) != settings:
+                breaker.configure(**settings)
+                self._settings[name] = settings
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in sorted(breakers.items())}
+
+
+circuit_breakers = CircuitBreakers()
+
+
+class WebhookClient:
+    """Retries and circuit breaking around ``transport.post`` (sync or async)."""
+
+    def __init__(
+        self,
+        transport: Any,
+        breaker: CircuitBreaker,
+        *,
+        timeout: Any = 120,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        retry_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTIONS,
+        pool_stats: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> None:
+        if retries < 0:
+            raise ValueError("retries must be >= 0")
+        self.transport = transport
+        self.breaker = breaker
+        self.timeout = timeout
+        self.retries = int(retries)
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+        self.retry_exceptions = retry_exceptions
+        self._pool_stats = pool_stats
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retried = 0
+        self.failures = 0
+        self.in_flight = 0
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _admit(self) -> None:
+        self.breaker.before_call()
+        self._count(calls=1, in_flight=1)
+
+    def _settle(self, failed: bool) -> None:
+        if failed:
+            self._count(failures=1)
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def post(self, url: str, payload: Any, limiter: Any = None) -> Any:
+        """POST ``payload`` as JSON; returns the last response or re-raises the last error."""
+        self._admit()
+        settled = False
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self._count(retried=1)
+                    time.sleep(backoff_delay(attempt - 1, self.backoff, self.max_backoff))
+                self._count(attempts=1)
+                send = lambda: self.transport.post(url, json=payload, timeout=self.timeout)
+                try:
+                    response = limiter.call(send) if limiter is not None else send()
+                except self.retry_exceptions:
+                    if attempt == self.retries:
+                        raise
+                    continue
+                if not is_server_error(response) or attempt == self.retries:
+                    self._settle(is_server_error(response))
+                    settled = True
+                    return response
+            raise AssertionError("unreachable")  # pragma: no cover
+        except Exception:
+            if not settled:
+                self._settle(True)
+                settled = True
+            raise
+        finally:
+            if not settled:
+                self.breaker.release()
+            self._count(in_flight=-1)
+
+    async def post_async(self, url: str, payload: Any, limiter: Any = None) -> Any:
+        """:meth:`post` for an awaitable transport (``httpx.AsyncClient``)."""
+        self._admit()
+        settled = False
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self._count(retried=1)
+                    await asyncio.sleep(backoff_delay(attempt - 1, self.backoff, self.max_backoff))
+                self._count(attempts=1)
+                send: Callable[[], Awaitable[Any]] = lambda: self.transport.post(url, json=payload, timeout=self.timeout)
+                try:
+                    response = await (limiter.call_async(send) if limiter is not None else send())
+                except self.retry_exceptions:
+                    if attempt == self.retries:
+                        raise
+                    continue
+                if not is_server_error(response) or attempt == self.retries:
+                    self._settle(is_server_error(response))
+                    settled = True
+                    return response
+            raise AssertionError("unreachable")  # pragma: no cover
+        except Exception:
+            if not settled:
+                self._settle(True)
+                settled = True
+            raise
+        finally:
+            if not settled:
+                self.breaker.release()
+            self._count(in_flight=-1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retried": self.retried,
+                "failures": self.failures,
+                "inFlight": self.in_flight,
+                "retries": self.retries,
+            }
+        stats["pool"] = self._pool_stats() if self._pool_stats else None
+        stats["breaker"] = self.breaker.stats()
+        return stats
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Simulation requests on the in-process courtroom agents (``simulation.backend: agents``).
+
+Runs ``--requests`` complete ``/api/run-simulations`` pipelines (``--strategies``
+x 3 runs, simulation and scoring) fully offline: the agents and the scoring
+calls both answer from the deterministic stub LLM
+(``backend/courtroom_agents.py``), each call taking ``--llm-latency`` seconds.
+For every ``--rounds`` value and engine it reports LLM calls, wall time per
+request and the mean time a run spends in its hearing, next to the time the
+same hearing takes with every turn in sequence (``(2 * rounds + 1) * latency``):
+
+  * ``threads`` - the Flask pipeline (``app.simulation_events``), concurrent
+    turns on the agents' thread pool;
+  * ``asyncio`` - the asgi.py pipeline (``asgi.simulation_events``), concurrent
+    turns via ``asyncio.gather``.
+
+    python benchmarks/bench_agents.py --strategies 3 --rounds 1 2 3 --llm-latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import app as server  # noqa: E402
+import asgi  # noqa: E402
+from courtroom_agents import AsyncStubLLM, StubLLM  # noqa: E402
+from fakes import disable_llm_cache, disable_simulation_cache, lift_rate_limits  # noqa: E402
+
+ENGINES = ("threads", "asyncio")
+
+
+def use_agents(rounds: int, latency: float) -> None:
+    """Point ``server``'s config at the stub-LLM courtroom agents with ``rounds`` argument rounds."""
+    load_app_config = server.load_app_config
+
+    def agents() -> Dict[str, Any]:
+        config = dict(load_app_config())
+        simulation = dict(config.get("simulation") or {})
+        simulation["backend"] = "agents"
+        simulation["agents"] = {
+            **(simulation.get("agents") or {}), "llm": "stub", "rounds": rounds, "stub_latency_seconds": latency,
+        }
+        config["simulation"] = simulation
+        return config
+
+    server.load_app_config = agents
+
+
+def sample_request(strategies: int) -> Dict[str, Any]:
+    return {
+        "strategies": [
+            {"id": f"strategy-{index + 1}", "title": f"Strategy {index + 1}", "advantages": ["Suppression of the radar reading"]}
+            for index in range(strategies)
+        ],
+        "caseFacts": "The defendant was charged with reckless driving after a radar stop on a wet highway.",
+    }
+
+
+class TimedBackend:
+    """Wraps a simulation backend to total the seconds its runs take."""
+
+    def __init__(self, backend: Any) -> None:
+        self.backend = backend
+        self.identity = backend.identity
+        self.seconds: List[float] = []
+
+    def simulate(self, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self.backend.simulate(*args)
+        finally:
+            self.seconds.append(time.perf_counter() - started)
+
+    async def simulate_async(self, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await self.backend.simulate(*args)
+        finally:
+            self.seconds.append(time.perf_counter() - started)
+
+
+def run_threads(args: argparse.Namespace, data: Dict[str, Any]) -> Dict[str, Any]:
+    flask_app = server.create_app(warm_up="off", services={"openai": StubLLM(args.llm_latency)})
+    timed: List[TimedBackend] = []
+    get_simulation_backend = server.get_simulation_backend
+
+    def timed_backend(simulation_config: Dict[str, Any]) -> TimedBackend:
+        timed.append(TimedBackend(get_simulation_backend(simulation_config)))
+        return timed[-1]
+
+    server.get_simulation_backend = timed_backend
+    try:
+        started = time.perf_counter()
+        with flask_app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.requests):
+                events = list(server.simulation_events(data))
+                assert events[-1]["type"] == "complete", events[-1]
+            calls = server.get_courtroom_agents().stats()["llmCalls"]
+        wall = time.perf_counter() - started
+    finally:
+        server.get_simulation_backend = get_simulation_backend
+    seconds = [value for backend in timed for value in backend.seconds]
+    return {"calls": calls, "wall": wall, "hearing": sum(seconds) / len(seconds)}
+
+
+def run_asyncio(args: argparse.Namespace, data: Dict[str, Any]) -> Dict[str, Any]:
+    openai_client = AsyncStubLLM(args.llm_latency)
+    app = asgi.create_asgi_app(warm_up="off", services={"async_openai": openai_client})
+
+    async def drive() -> Dict[str, Any]:
+        started = time.perf_counter()
+        seconds: List[float] = []
+        for _ in range(args.requests):
+            backend = TimedBackend(app.simulation_backend())
+            backend.simulate = backend.simulate_async  # type: ignore[method-assign]
+            events = [event async for event in asgi.simulation_events(data, openai_client, backend, None)]
+            assert events[-1]["type"] == "complete", events[-1]
+            seconds.extend(backend.seconds)
+        wall = time.perf_counter() - started
+        return {"calls": app.courtroom_agents().stats()["llmCalls"], "wall": wall, "hearing": sum(seconds) / len(seconds)}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(drive())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3, help="Simulation requests per rounds value and engine.")
+    parser.add_argument("--strategies", type=int, default=3, help="Strategies per request (3 runs each).")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[1, 2, 3], help="Argument rounds per side.")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per stub LLM call.")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=ENGINES)
+    args = parser.parse_args()
+
+    lift_rate_limits(server)
+    disable_simulation_cache(server)
+    disable_llm_cache(server)
+    load_app_config = server.load_app_config
+    data = sample_request(args.strategies)
+    runners = {"threads": run_threads, "asyncio": run_asyncio}
+
+    print(f"{args.requests} requests x {args.strategies * 3} runs, {args.llm_latency:.2f}s per LLM call")
+    print(f"{'rounds':>6}  {'engine':<8}{'agent calls':>12}{'s/request':>11}{'hearing s':>11}{'sequential s':>14}")
+    for rounds in args.rounds:
+        for engine in args.engines:
+            server.load_app_config = load_app_config
+            use_agents(rounds, args.llm_latency)
+            stats = runners[engine](args, data)
+            sequential = (2 * rounds + 1) * args.llm_latency
+            print(
+                f"{rounds:>6}  {engine:<8}{stats['calls']:>12}{stats['wall'] / args.requests:>11.2f}"
+                f"{stats['hearing']:>11.2f}{sequential:>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: list-of-dicts loader vs. the columnar CaseTable.
+
+The real datasets are replicated (with fresh cluster ids and shifted filing
+dates) up to ``--cases`` records, written to a temporary JSON file and loaded
+both ways.  Retained memory is measured with ``tracemalloc`` after the loader
+returns, so it reflects what a worker keeps resident for the corpus.
+
+    python benchmarks/bench_case_memory.py --cases 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from case_table import load_case_table  # noqa: E402
+from corpus_store import load_json_file  # noqa: E402
+
+
+def synthesize_cases(count: int) -> List[Dict[str, Any]]:
+    """Replicate the bundled datasets to ``count`` records with unique ids."""
+    seeds: List[Dict[str, Any]] = []
+    for path in sorted((ROOT / "data").glob("*_cases.json")):
+        seeds.extend(json.loads(path.read_text(encoding="utf-8")))
+    records = []
+    for index in range(count):
+        seed = seeds[index % len(seeds)]
+        cluster_id = 20_000_000 + index
+        record = dict(seed)
+        record["cluster_id"] = cluster_id
+        record["absolute_url"] = f"/opinion/{cluster_id}/synthetic-{index}/"
+        year = 1970 + index % 55
+        record["dateFiled"] = f"{year}-{(index % 12) + 1:02d}-{(index % 28) + 1:02d}"
+        records.append(record)
+    return records
+
+
+def measure(loader: Callable[[], Any]) -> Tuple[Any, int, int, float]:
+    """Return (result, retained bytes, peak bytes, seconds) for one loader call."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = loader()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=100_000, help="Number of synthetic cases.")
+    args = parser.parse_args()
+
+    records = synthesize_cases(args.cases)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic_cases.json"
+        path.write_text(json.dumps(records), encoding="utf-8")
+        del records
+        file_size = path.stat().st_size
+
+        dicts, dict_retained, dict_peak, dict_seconds = measure(lambda: load_json_file(path))
+        del dicts
+        table, table_retained, table_peak, table_seconds = measure(lambda: load_case_table(path, "synthetic"))
+
+    mb = 1024 * 1024
+    print(f"cases: {args.cases:,}   json file: {file_size / mb:.1f} MiB")
+    print(f"{'loader':<16}{'retained MiB':>14}{'peak MiB':>12}{'bytes/case':>12}{'load s':>9}")
+    for name, retained, peak, seconds in (
+        ("list of dicts", dict_retained, dict_peak, dict_seconds),
+        ("CaseTable", table_retained, table_peak, table_seconds),
+    ):
+        print(f"{name:<16}{retained / mb:>14.1f}{peak / mb:>12.1f}{retained / args.cases:>12.0f}{seconds:>9.2f}")
+    print(f"retained reduction: {dict_retained / max(table_retained, 1):.1f}x (table.nbytes={table.nbytes / mb:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
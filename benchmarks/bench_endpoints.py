@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Latency/throughput benchmark of every API route against offline fakes.
+
+The app is built with ``create_app(services=...)`` so OpenAI, the n8n webhook
+and Weaviate are replaced by the stand-ins in ``benchmarks/fakes.py`` with the
+latencies given on the command line.  Each endpoint receives ``--requests``
+calls from ``--concurrency`` threads through Flask's test client (streamed
+responses are read to the end).  Reported per endpoint: p50/p95/p99 latency,
+requests per second and non-2xx responses.
+
+    python benchmarks/bench_endpoints.py --requests 50 --concurrency 8 --openai-latency 0.2
+
+``--save results.json`` stores the numbers; ``--baseline results.json`` compares
+against a saved run and exits non-zero when an endpoint's p95 regressed by more
+than ``--max-regression``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("WEAVIATE_URL", "http://weaviate.benchmark.invalid")
+
+import app as server  # noqa: E402
+from fakes import build_services, disable_llm_cache, disable_simulation_cache, disable_strategy_cache  # noqa: E402
+
+
+def minimal_pdf(text: str) -> bytes:
+    """A one-page PDF containing ``text`` (enough for pypdf's text extraction)."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return body
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    payload: Callable[[], Dict[str, Any]] = dict
+    requests: Optional[int] = None  # overrides --requests (slow, multi-call endpoints)
+
+
+def sample_cases() -> List[Dict[str, Any]]:
+    registry = server.case_registry.get()
+    return [server.format_case(case) for case in registry.filter(limit=3)]
+
+
+def sample_strategies() -> List[Dict[str, Any]]:
+    return [
+        {"id": f"strategy-{index}", "title": title}
+        for index, title in enumerate(
+            ("Challenge the speed evidence", "Contest recklessness mens rea", "Negotiate a lesser offense"), start=1
+        )
+    ]
+
+
+def sample_simulation_results() -> List[Dict[str, Any]]:
+    runs = [
+        {"runId": f"strategy-1-run-{run}", "variation": "Standard Approach", "winner": "Defense", "score": 7.0 + run,
+         "defenseArgument": "...", "plaintiffArgument": "...", "judgmentSummary": "..."}
+        for run in range(1, 4)
+    ]
+    return [{"strategyId": "strategy-1", "strategyTitle": "Challenge the speed evidence", "averageScore": 8.0,
+             "winsCount": 2, "runs": runs}]
+
+
+def build_endpoints(simulation_requests: int) -> List[Endpoint]:
+    pdf = minimal_pdf("State v. Ryder reckless driving appeal")
+    return [
+        Endpoint("health", "GET", "/health"),
+        Endpoint("case-facets", "GET", "/api/case-facets"),
+        Endpoint("similar-cases:list", "GET", "/api/similar-cases?limit=20&fields=id,caseName,date"),
+        Endpoint("similar-cases:hybrid", "GET", "/api/similar-cases?q=reckless+driving+speed+radar&limit=10"),
+        Endpoint("similar-cases:keyword", "GET", "/api/similar-cases?q=manifest+weight&mode=keyword&limit=10"),
+        Endpoint("generate-strategies", "POST", "/api/generate-strategies", lambda: {"json": {"cases": sample_cases()}}),
+        Endpoint(
+            "generate-strategies:stream", "POST", "/api/generate-strategies/stream", lambda: {"json": {"cases": sample_cases()}}
+        ),
+        Endpoint(
+            "upload-case",
+            "POST",
+            "/api/upload-case",
+            lambda: {"data": {"files": [(io.BytesIO(pdf), "case.pdf")]},
+                     "content_type": "multipart/form-data"},
+        ),
+        Endpoint(
+            "run-simulations",
+            "POST",
+            "/api/run-simulations",
+            lambda: {"json": {"strategies": sample_strategies(), "caseFacts": "Defendant was clocked at 95 mph.",
+                              "judgeName": "Hon. Sarah Mitchell", "stateAttorneyName": "James Anderson"}},
+            requests=simulation_requests,
+        ),
+        Endpoint(
+            "generate-memorandum",
+            "POST",
+            "/api/generate-memorandum",
+            lambda: {"json": {"simulationResults": sample_simulation_results(), "caseFacts": "..."}},
+        ),
+        Endpoint(
+            "generate-memorandum:stream",
+            "POST",
+            "/api/generate-memorandum/stream",
+            lambda: {"json": {"simulationResults": sample_simulation_results(), "caseFacts": "..."}},
+        ),
+    ]
+
+
+def timed_call(flask_app: Any, endpoint: Endpoint) -> Tuple[float, int]:
+    client = flask_app.test_client()
+    started = time.perf_counter()
+    response = client.open(endpoint.path, method=endpoint.method, buffered=False, **endpoint.payload())
+    response.get_data()  # drain streamed bodies
+    elapsed = time.perf_counter() - started
+    response.close()
+    return elapsed, response.status_code
+
+
+def run_endpoint(flask_app: Any, endpoint: Endpoint, requests: int, concurrency: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda _: timed_call(flask_app, endpoint), range(requests)))
+    wall = time.perf_counter() - started
+    latencies = np.asarray([latency for latency, _ in samples]) * 1000.0
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "requests": requests,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "rps": requests / wall if wall else float("inf"),
+        "errors": sum(1 for _, status in samples if status >= 400),
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and current["p95_ms"] > previous["p95_ms"] * (1.0 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.1f}ms -> {current['p95_ms']:.1f}ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=30, help="Requests per endpoint.")
+    parser.add_argument("--simulation-requests", type=int, default=2, help="Requests for /api/run-simulations.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent client threads.")
+    parser.add_argument("--openai-latency", type=float, default=0.05, help="Seconds per fake OpenAI call.")
+    parser.add_argument("--n8n-latency", type=float, default=0.2, help="Seconds per fake n8n webhook call.")
+    parser.add_argument("--weaviate-latency", type=float, default=0.03, help="Seconds per fake Weaviate query.")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Extra random latency as a fraction of the base.")
+    parser.add_argument("--endpoints", nargs="*", help="Only run endpoints whose name starts with one of these.")
+    parser.add_argument("--save", type=Path, help="Write results as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Compare p95 against a saved run.")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 increase vs. the baseline.")
+    args = parser.parse_args()
+
+    disable_simulation_cache(server)
+    disable_llm_cache(server)
+    disable_strategy_cache(server)
+    services = build_services(
+        openai_latency=args.openai_latency,
+        n8n_latency=args.n8n_latency,
+        weaviate_latency=args.weaviate_latency,
+        jitter=args.jitter,
+    )
+    flask_app = server.create_app(warm_up="sync", services=services)
+
+    endpoints = build_endpoints(args.simulation_requests)
+    if args.endpoints:
+        endpoints = [endpoint for endpoint in endpoints if endpoint.name.startswith(tuple(args.endpoints))]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'endpoint':<24}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}{'errors':>8}")
+    for endpoint in endpoints:
+        # The routes log to stdout; keep the table readable.
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_endpoint(flask_app, endpoint, endpoint.requests or args.requests, args.concurrency)
+        results[endpoint.name] = stats
+        print(
+            f"{endpoint.name:<24}{stats['requests']:>5}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+            f"{stats['p99_ms']:>10.1f}{stats['rps']:>9.1f}{stats['errors']:>8}"
+        )
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Prompt construction cost of one ``/api/run-simulations`` request.
+
+Compares the two ways of building the (lawyer, opponent, judge) prompts for
+``--strategies`` x 3 runs with the bundled judge and state attorney profiles:
+
+  * ``per-run``  - case context, opponent and judge prompts rendered again for
+    every run (what the route did before ``backend/prompts.py``);
+  * ``hoisted``  - ``app.plan_simulation_runs``: rendered once per request, only
+    the lawyer prompt's strategy part per strategy and the cached variation block
+    per run.
+
+Both produce identical prompts (checked before timing). Reported: microseconds
+per request (best of ``--repeat`` rounds of ``--number`` requests) and the
+characters rendered per request.
+
+    python benchmarks/bench_prompts.py --strategies 3 --case-words 800
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import app as server  # noqa: E402
+from bench_endpoints import sample_strategies  # noqa: E402
+from prompts import SimulationPrompts  # noqa: E402
+
+
+def per_run_prompts(strategies: List[Dict[str, Any]], case_facts: str, extracted_text: str,
+                    judge_chars: Dict[str, Any], state_attorney_chars: Dict[str, Any]) -> List[tuple]:
+    return [
+        SimulationPrompts(case_facts, extracted_text, judge_chars, state_attorney_chars).run_prompts(strategy, [variation])[0]
+        for strategy in strategies
+        for variation in server.SIMULATION_VARIATIONS
+    ]
+
+
+def hoisted_prompts(strategies: List[Dict[str, Any]], case_facts: str, extracted_text: str,
+                    judge_chars: Dict[str, Any], state_attorney_chars: Dict[str, Any]) -> List[tuple]:
+    return [
+        run[-1]
+        for run in server.plan_simulation_runs(strategies, case_facts, extracted_text, judge_chars, state_attorney_chars)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strategies", type=int, default=3, help="Strategies per request (3 runs each).")
+    parser.add_argument("--case-words", type=int, default=800, help="Words of case facts and of extracted text.")
+    parser.add_argument("--number", type=int, default=2000, help="Requests per timing round.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds; the best is reported.")
+    args = parser.parse_args()
+
+    base = sample_strategies()
+    strategies = [
+        {**base[index % len(base)], "id": f"strategy-{index + 1}"} for index in range(args.strategies)
+    ]
+    case_facts = " ".join(["Defendant was clocked at 95 mph in a 55 mph zone."] * max(1, args.case_words // 11))
+    extracted_text = case_facts
+    with contextlib.redirect_stdout(io.StringIO()):
+        judge_chars = server.load_judge_characteristics("Hon. Sarah Mitchell")
+        state_attorney_chars = server.load_state_attorney_characteristics("James Anderson")
+    request = (strategies, case_facts, extracted_text, judge_chars, state_attorney_chars)
+
+    builders: Dict[str, Callable[..., List[tuple]]] = {"per-run": per_run_prompts, "hoisted": hoisted_prompts}
+    expected = per_run_prompts(*request)
+    assert hoisted_prompts(*request) == expected, "hoisted prompts differ from per-run prompts"
+    characters = sum(len(prompt) for prompts in expected for prompt in prompts)
+
+    print(f"{args.strategies} strategies x {len(server.SIMULATION_VARIATIONS)} runs, {characters} prompt chars per request")
+    print(f"{'mode':<10}{'us/request':>12}{'speedup':>9}")
+    baseline = None
+    for mode, build in builders.items():
+        seconds = min(timeit.repeat(lambda: build(*request), number=args.number, repeat=args.repeat)) / args.number
+        baseline = baseline or seconds
+        print(f"{mode:<10}{seconds * 1e6:>12.1f}{baseline / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
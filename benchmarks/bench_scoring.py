@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Scoring cost per request: one GPT-4o call per run vs. batched calls.
+
+Builds ``--strategies`` x 3 simulated transcripts (``--transcript-words`` words per
+argument) and scores them the way ``/api/run-simulations`` does for each
+``simulation.scoring_batch`` mode:
+
+  * ``run``      - one call per run (the instruction preamble is sent every time);
+  * ``strategy`` - one call per strategy;
+  * ``request``  - one call for all runs of the request.
+
+Reported per mode: calls, prompt tokens (tiktoken ``o200k_base`` when it is
+available, otherwise ~4 characters per token), completion tokens as reported by the fake
+client, and wall time with ``--scoring-concurrency`` parallel calls against the
+fake OpenAI client (``--openai-latency`` per call plus ``--token-latency`` per
+generated token).
+
+    python benchmarks/bench_scoring.py --strategies 3 --transcript-words 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import app as server  # noqa: E402
+from fakes import FakeOpenAI, Latency, disable_llm_cache, estimate_tokens, lift_rate_limits  # noqa: E402
+
+FILLER = (
+    "the defendant's speed was measured by a radar unit whose calibration records were never produced "
+    "and the officer's testimony does not establish a conscious disregard of a substantial risk"
+).split()
+
+
+def token_counter() -> Tuple[str, Callable[[str], int]]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")  # downloads the vocabulary on first use
+    except Exception:
+        return "~4 chars/token", estimate_tokens
+    return "o200k_base", lambda text: len(encoding.encode(text))
+
+
+def words(count: int) -> str:
+    return " ".join(FILLER[index % len(FILLER)] for index in range(count))
+
+
+def sample_batch(strategies: int, transcript_words: int) -> List[tuple]:
+    """Pipeline items ``(strategy_idx, run_idx, strategy_title, run_id, variation, session_id, transcript)``."""
+    items = []
+    for strategy_idx in range(strategies):
+        for run_idx, variation in enumerate(server.SIMULATION_VARIATIONS):
+            transcript = {
+                "defense_argument": words(transcript_words),
+                "plaintiff_argument": words(transcript_words),
+                "judgment_summary": words(transcript_words // 2),
+                "winner": "Defense" if run_idx % 2 == 0 else "Plaintiff",
+            }
+            items.append((
+                strategy_idx, run_idx, f"Strategy {strategy_idx + 1}",
+                f"strategy-{strategy_idx + 1}-run-{run_idx + 1}", variation, f"session-{run_idx}", transcript,
+            ))
+    return items
+
+
+def batches_for(mode: str, items: List[tuple], strategies: int) -> List[List[tuple]]:
+    grouping = server.ScoringBatches(mode, strategies, max_runs=len(items))
+    batches: List[List[tuple]] = []
+    for item in items:
+        batches.extend(grouping.add(item[0], item))
+    return batches
+
+
+def prompt_tokens(batch: List[tuple], count: Callable[[str], int]) -> int:
+    if len(batch) == 1:
+        _, _, strategy_title, _, variation, _, transcript = batch[0]
+        request = server.build_scoring_request(strategy_title=strategy_title, variation=variation, **transcript)
+    else:
+        request = server.build_batch_scoring_request([
+            (run_id, strategy_title, variation, transcript)
+            for _, _, strategy_title, run_id, variation, _, transcript in batch
+        ])
+    return sum(count(message["content"]) for message in request["messages"])
+
+
+class UsageRecorder:
+    """Wraps the fake client's ``chat.completions.create`` to total its reported usage."""
+
+    def __init__(self, client: FakeOpenAI) -> None:
+        self.completion_tokens = 0
+        create = client.chat.completions.create
+
+        def recording_create(**kwargs: Any) -> Any:
+            response = create(**kwargs)
+            self.completion_tokens += response.usage.completion_tokens
+            return response
+
+        client.chat.completions.create = recording_create
+
+
+def run_mode(mode: str, items: List[tuple], args: argparse.Namespace, count: Callable[[str], int]) -> Dict[str, Any]:
+    client = FakeOpenAI(Latency(args.openai_latency), token_seconds=args.token_latency)
+    usage = UsageRecorder(client)
+    flask_app = server.create_app(warm_up="off", services={"openai": client})
+    batches = batches_for(mode, items, args.strategies)
+
+    def score(batch: List[tuple]) -> List[Dict[str, Any]]:
+        with flask_app.app_context():
+            return server.score_runs(batch)
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(args.scoring_concurrency) as pool:
+        results = [run for scored in pool.map(score, batches) for run in scored]
+    wall = time.perf_counter() - started
+    assert len(results) == len(items)
+    return {
+        "calls": client.latency.calls,
+        "prompt_tokens": sum(prompt_tokens(batch, count) for batch in batches),
+        "completion_tokens": usage.completion_tokens,
+        "wall": wall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strategies", type=int, default=3, help="Strategies per request (3 runs each).")
+    parser.add_argument("--transcript-words", type=int, default=300, help="Words per argument in a transcript.")
+    parser.add_argument("--scoring-concurrency", type=int, default=4, help="Parallel scoring calls.")
+    parser.add_argument("--openai-latency", type=float, default=0.8, help="Seconds per fake OpenAI call.")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="Seconds per generated token.")
+    parser.add_argument("--modes", nargs="+", default=list(server.SCORING_BATCH_MODES), choices=server.SCORING_BATCH_MODES)
+    args = parser.parse_args()
+
+    lift_rate_limits(server)
+    disable_llm_cache(server)
+
+    tokenizer, count = token_counter()
+    items = sample_batch(args.strategies, args.transcript_words)
+    results = {mode: run_mode(mode, items, args, count) for mode in args.modes}
+    baseline = results.get("run")
+
+    print(f"{len(items)} runs, {args.transcript_words} words per argument, prompt tokens by {tokenizer}")
+    print(f"{'mode':<10}{'calls':>6}{'prompt tok':>12}{'compl tok':>11}{'wall s':>8}{'tokens saved':>14}{'time saved':>12}")
+    for mode, stats in results.items():
+        saved_tokens = saved_time = ""
+        if baseline and mode != "run":
+            before = baseline["prompt_tokens"] + baseline["completion_tokens"]
+            after = stats["prompt_tokens"] + stats["completion_tokens"]
+            saved_tokens = f"{(1 - after / before) * 100:.1f}%"
+            saved_time = f"{(1 - stats['wall'] / baseline['wall']) * 100:.1f}%"
+        print(
+            f"{mode:<10}{stats['calls']:>6}{stats['prompt_tokens']:>12}{stats['completion_tokens']:>11}"
+            f"{stats['wall']:>8.2f}{saved_tokens:>14}{saved_time:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
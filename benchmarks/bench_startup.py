@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: cold boot of the API server in fresh interpreters.
+
+Each sample starts a new Python process that imports ``app`` and calls
+``create_app`` with the given warm-up mode, so module import caches never carry
+over between samples.  Reported per mode:
+
+  * ``boot``    - module import + ``create_app`` (what a test process or a
+    restarted worker waits for before it can serve);
+  * ``warm-up`` - the warm-up phases (heavy SDK imports, corpus and indexes);
+  * ``process`` - wall time of the whole child process.
+
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, app
+instance = app.create_app(warm_up={mode!r})
+print(json.dumps(instance.extensions['startup'].as_dict()))
+"""
+
+
+def sample(mode: str) -> Dict[str, float]:
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark")}
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(mode=mode)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    elapsed = time.perf_counter() - started
+    report = json.loads(output.strip().splitlines()[-1])
+    return {
+        "boot": report["bootSeconds"],
+        "warm-up": sum(report["phases"].values()),
+        "process": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per mode.")
+    parser.add_argument("--modes", nargs="+", default=["off", "sync"], choices=["off", "sync"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'boot ms':>10}{'warm-up ms':>12}{'process ms':>12}  (median of {args.repeat})")
+    for mode in args.modes:
+        samples: List[Dict[str, float]] = [sample(mode) for _ in range(args.repeat)]
+        medians = {key: statistics.median(entry[key] for entry in samples) * 1000 for key in samples[0]}
+        print(f"{mode:<8}{medians['boot']:>10.1f}{medians['warm-up']:>12.1f}{medians['process']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Time to the first strategy: /api/generate-strategies vs. its streaming variant.
+
+Sends ``--requests`` strategy requests for the same three bundled cases to both
+endpoints against the fake OpenAI client (``--openai-latency`` before the first
+token, ``--token-latency`` per generated token, ~4 characters each), with the
+strategy and LLM response caches turned off.  Reported per endpoint: mean
+seconds until the first strategy is available to the client and until the
+full response has arrived:
+
+  * ``blocking`` - ``POST /api/generate-strategies``; every strategy arrives
+    with the JSON response;
+  * ``stream``   - ``POST /api/generate-strategies/stream``; the first
+    ``strategy`` event is sent as soon as the first strategy object is complete.
+
+    python benchmarks/bench_strategies.py --openai-latency 0.5 --token-latency 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import app as server  # noqa: E402
+from fakes import FakeOpenAI, Latency, disable_llm_cache, disable_strategy_cache  # noqa: E402
+
+
+def sample_cases() -> List[Dict[str, Any]]:
+    registry = server.case_registry.get()
+    return [server.format_case(case) for case in registry.filter(limit=3)]
+
+
+def time_blocking(client: Any, cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    payload = client.post("/api/generate-strategies", json={"cases": cases}).get_json()
+    wall = time.perf_counter() - started
+    assert payload["success"], payload
+    return {"first": wall, "total": wall, "strategies": payload["strategies"]}
+
+
+def time_stream(client: Any, cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    response = client.post("/api/generate-strategies/stream", json={"cases": cases}, buffered=False)
+    first = None
+    payload: Dict[str, Any] = {}
+    for line in response.iter_encoded():
+        for message in line.decode("utf-8").split("\n\n"):
+            if not message.startswith("data: "):
+                continue
+            event = json.loads(message[len("data: "):])
+            if event["type"] == "strategy" and first is None:
+                first = time.perf_counter() - started
+            elif event["type"] in ("complete", "error"):
+                payload = event
+    total = time.perf_counter() - started
+    response.close()
+    assert payload.get("success"), payload
+    return {"first": first, "total": total, "strategies": payload["strategies"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3, help="Requests per endpoint.")
+    parser.add_argument("--openai-latency", type=float, default=0.5, help="Seconds before the first token.")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="Seconds per generated token.")
+    args = parser.parse_args()
+
+    disable_strategy_cache(server)
+    disable_llm_cache(server)
+    flask_app = server.create_app(
+        warm_up="off", services={"openai": FakeOpenAI(Latency(args.openai_latency), args.token_latency)}
+    )
+    client = flask_app.test_client()
+    cases = sample_cases()
+    runners = {"blocking": time_blocking, "stream": time_stream}
+
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, runner in runners.items():
+            results[name] = [runner(client, cases) for _ in range(args.requests)]
+    assert results["stream"][0]["strategies"] == results["blocking"][0]["strategies"], "payloads differ"
+
+    print(f"{args.requests} requests, {args.openai_latency:.2f}s to first token, {args.token_latency:.3f}s per token")
+    print(f"{'endpoint':<10}{'first strategy s':>18}{'complete s':>12}")
+    for name, samples in results.items():
+        first = sum(sample["first"] for sample in samples) / len(samples)
+        total = sum(sample["total"] for sample in samples) / len(samples)
+        print(f"{name:<10}{first:>18.2f}{total:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
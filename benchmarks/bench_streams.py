@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Concurrent simulation streams: asyncio engine (asgi.py) vs. WSGI worker threads.
+
+Opens ``--streams`` concurrent ``/api/run-simulations`` streams against the
+offline fakes from ``benchmarks/fakes.py`` and reports wall time, per-stream
+latency and the peak number of threads in the process.
+
+  * ``asgi`` - every stream is a coroutine on one event loop (``asgi.create_asgi_app``
+    driven in-process through the ASGI interface);
+  * ``wsgi`` - the Flask route behind ``--wsgi-workers`` worker threads, as a
+    threaded WSGI server would run it: streams beyond the worker count queue.
+
+Upstream rate limits are lifted so the numbers reflect the engine, not the quota.
+
+    python benchmarks/bench_streams.py --streams 200 --n8n-latency 1.0 --openai-latency 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import app as server  # noqa: E402
+import asgi  # noqa: E402
+from bench_endpoints import sample_strategies  # noqa: E402
+from fakes import build_services, disable_llm_cache, disable_simulation_cache, lift_rate_limits  # noqa: E402
+
+PAYLOAD = {
+    "strategies": sample_strategies(),
+    "caseFacts": "Defendant was clocked at 95 mph.",
+    "judgeName": "Hon. Sarah Mitchell",
+    "stateAttorneyName": "James Anderson",
+}
+
+
+class ThreadPeak:
+    """Samples ``threading.active_count()`` in the background."""
+
+    def __init__(self) -> None:
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self) -> "ThreadPeak":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def event_types(body: bytes) -> List[str]:
+    return [json.loads(line[6:])["type"] for line in body.decode().splitlines() if line.startswith("data: ")]
+
+
+async def asgi_stream(application: Any) -> tuple:
+    body = json.dumps(PAYLOAD).encode()
+    done = asyncio.Event()
+    chunks: List[bytes] = []
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive() -> Dict[str, Any]:
+        if messages:
+            return messages.pop()
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                done.set()
+
+    scope = {"type": "http", "method": "POST", "path": "/api/run-simulations", "headers": []}
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return time.perf_counter() - started, event_types(b"".join(chunks))
+
+
+def run_asgi(application: Any, streams: int) -> list:
+    async def main() -> list:
+        return await asyncio.gather(*(asgi_stream(application) for _ in range(streams)))
+
+    return asyncio.run(main())
+
+
+def run_wsgi(flask_app: Any, streams: int, workers: int) -> list:
+    def stream(_: int) -> tuple:
+        started = time.perf_counter()
+        response = flask_app.test_client().post("/api/run-simulations", json=PAYLOAD, buffered=False)
+        body = response.get_data()
+        response.close()
+        return time.perf_counter() - started, event_types(body)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(stream, range(streams)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=200, help="Concurrent simulation streams.")
+    parser.add_argument("--wsgi-workers", type=int, default=16, help="Worker threads of the WSGI comparison.")
+    parser.add_argument("--openai-latency", type=float, default=0.1, help="Seconds per fake OpenAI call.")
+    parser.add_argument("--n8n-latency", type=float, default=0.5, help="Seconds per fake n8n webhook call.")
+    parser.add_argument("--modes", nargs="+", default=["asgi", "wsgi"], choices=["asgi", "wsgi"])
+    args = parser.parse_args()
+
+    lift_rate_limits(server)
+    disable_simulation_cache(server)
+    disable_llm_cache(server)
+    print(f"{'mode':<8}{'streams':>8}{'wall s':>9}{'p50 s':>8}{'p95 s':>8}{'threads':>9}{'complete':>10}")
+    for mode in args.modes:
+        services = build_services(openai_latency=args.openai_latency, n8n_latency=args.n8n_latency)
+        if mode == "asgi":
+            application = asgi.create_asgi_app(warm_up="sync", services=services)
+        else:
+            application = server.create_app(warm_up="sync", services=services)
+        started = time.perf_counter()
+        with ThreadPeak() as threads, contextlib.redirect_stdout(io.StringIO()):
+            if mode == "asgi":
+                samples = run_asgi(application, args.streams)
+            else:
+                samples = run_wsgi(application, args.streams, args.wsgi_workers)
+        wall = time.perf_counter() - started
+        latencies = np.asarray([latency for latency, _ in samples])
+        complete = sum(1 for _, types in samples if types and types[-1] == "complete")
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{mode:<8}{args.streams:>8}{wall:>9.2f}{p50:>8.2f}{p95:>8.2f}{threads.peak:>9}{complete:>10}")
+
+
+if __name__ == "__main__":
+    main()
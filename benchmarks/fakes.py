@@ -0,0 +1,384 @@
+"""
+Offline stand-ins for the external services the API calls.
+
+Each fake sleeps for a configurable latency (plus optional uniform jitter) and
+returns a response shaped like the real one, so endpoint code runs its normal
+path without network access or API spend:
+
+  * :class:`FakeOpenAI` - ``chat.completions.create`` and ``responses.create``.
+    Structured-output requests get a payload synthesised from their JSON schema,
+    plain requests get a short memorandum-style text; ``usage`` carries estimated
+    token counts; ``stream=True`` yields the content in token-sized chunks;
+    :class:`FakeAsyncOpenAI` is the awaitable variant;
+  * :class:`FakeN8n` - a ``requests``-compatible ``post`` returning a courtroom
+    transcript like the n8n webhook (:class:`FakeAsyncN8n` for ``httpx.AsyncClient``);
+  * :func:`fake_weaviate_connect` - a client whose
+    ``collections.get(...).query.near_text`` serves the bundled case files.
+
+Pass them to ``app.create_app(services=...)`` or ``asgi.create_asgi_app(services=...)``;
+see :func:`build_services`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Latency:
+    """Simulated service time: ``seconds`` plus up to ``jitter * seconds`` extra."""
+
+    def __init__(self, seconds: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None) -> None:
+        self.seconds = seconds
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _next(self) -> float:
+        with self._lock:
+            self.calls += 1
+            extra = self._random.uniform(0.0, self.jitter * self.seconds) if self.jitter else 0.0
+        return self.seconds + extra
+
+    def wait(self) -> None:
+        delay = self._next()
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        delay = self._next()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def sample_from_schema(schema: Dict[str, Any], name: str = "value") -> Any:
+    """Minimal instance of a JSON schema (enough to satisfy strict structured output)."""
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {key: sample_from_schema(value, key) for key, value in properties.items()}
+    if kind == "array":
+        items = schema.get("items", {})
+        # Arrays of objects keyed by an enum property (e.g. batch evaluations by run id): one item per value
+        keys = [key for key, value in items.get("properties", {}).items() if "enum" in value]
+        if keys:
+            return [
+                {**sample_from_schema(items, name), keys[0]: value}
+                for value in items["properties"][keys[0]]["enum"]
+            ]
+        count = schema.get("minItems", 3 if name == "strategies" else 2)
+        return [sample_from_schema(items, name) for _ in range(count)]
+    if kind in ("number", "integer"):
+        minimum, maximum = schema.get("minimum", 5), schema.get("maximum", 10)
+        value = (minimum + maximum) / 2 + 0.5
+        return int(value) if kind == "integer" else value
+    if kind == "boolean":
+        return True
+    return f"Sample {name.replace('_', ' ')}"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _chat_completion(model: str, messages: List[Dict[str, Any]], response_format: Any) -> Any:
+    schema = None
+    if isinstance(response_format, dict) and response_format.get("type") == "json_schema":
+        schema = response_format.get("json_schema", {}).get("schema")
+    if schema is not None:
+        content = json.dumps(sample_from_schema(schema))
+    elif isinstance(response_format, dict) and response_format.get("type") == "json_object":
+        content = json.dumps({"score": 7.5, "rationale": "Sample rationale", "strengths": [], "weaknesses": []})
+    else:
+        content = (
+            "MEMORANDUM\n\nI. EXECUTIVE SUMMARY\nSample memorandum text.\n\nII. CASE OVERVIEW\nSample overview.\n\n"
+            "III. RECOMMENDED STRATEGY\nSample strategy.\n\nIV. NEXT STEPS\nProceed."
+        )
+    message = SimpleNamespace(content=content, role="assistant")
+    prompt_tokens = sum(estimate_tokens(str(entry.get("content", ""))) for entry in messages)
+    completion_tokens = estimate_tokens(content)
+    return SimpleNamespace(
+        id=f"chatcmpl-{uuid.uuid4().hex}",
+        model=model,
+        choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+    )
+
+
+def _chunk(content: Optional[str] = None, usage: Any = None) -> Any:
+    choices = [] if content is None else [SimpleNamespace(index=0, delta=SimpleNamespace(content=content), finish_reason=None)]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class _ChatCompletions:
+    def __init__(self, latency: Latency, token_seconds: float = 0.0) -> None:
+        self.latency = latency
+        self.token_seconds = token_seconds
+
+    def _stream(self, response: Any) -> Iterator[Any]:
+        """``response`` as ``stream=True`` chunks: the latency up front, then one ~4-character token at a time."""
+        self.latency.wait()
+        content = response.choices[0].message.content
+        for start in range(0, len(content), 4):
+            if self.token_seconds:
+                time.sleep(self.token_seconds)
+            yield _chunk(content[start:start + 4])
+        yield _chunk(usage=response.usage)
+
+    def create(self, *, model: str, messages: List[Dict[str, Any]], response_format: Any = None,
+               stream: bool = False, **_: Any) -> Any:
+        response = _chat_completion(model, messages, response_format)
+        if stream:
+            return self._stream(response)
+        self.latency.wait()
+        if self.token_seconds:
+            time.sleep(self.token_seconds * response.usage.completion_tokens)
+        return response
+
+
+class _AsyncChatCompletions(_ChatCompletions):
+    async def create(self, *, model: str, messages: List[Dict[str, Any]], response_format: Any = None, **_: Any) -> Any:
+        response = _chat_completion(model, messages, response_format)
+        await self.latency.wait_async()
+        if self.token_seconds:
+            await asyncio.sleep(self.token_seconds * response.usage.completion_tokens)
+        return response
+
+
+class _Responses:
+    def __init__(self, latency: Latency) -> None:
+        self.latency = latency
+
+    def create(self, *, model: str, input: Any, **_: Any) -> Any:  # noqa: A002 - mirrors the SDK
+        self.latency.wait()
+        return SimpleNamespace(model=model, output_text="reckless driving conviction appeal sufficiency of evidence")
+
+
+class FakeOpenAI:
+    """Stand-in for ``openai.OpenAI`` covering the endpoints this app uses."""
+
+    def __init__(self, latency: Optional[Latency] = None, token_seconds: float = 0.0) -> None:
+        self.latency = latency or Latency()
+        self.chat = SimpleNamespace(completions=_ChatCompletions(self.latency, token_seconds))
+        self.responses = _Responses(self.latency)
+
+
+class FakeAsyncOpenAI:
+    """Stand-in for ``openai.AsyncOpenAI`` (chat completions only)."""
+
+    def __init__(self, latency: Optional[Latency] = None, token_seconds: float = 0.0) -> None:
+        self.latency = latency or Latency()
+        self.chat = SimpleNamespace(completions=_AsyncChatCompletions(self.latency, token_seconds))
+
+    async def close(self) -> None:
+        pass
+
+
+class _HttpResponse:
+    def __init__(self, payload: Dict[str, Any], status_code: int = 200) -> None:
+        self.status_code = status_code
+        self._payload = payload
+        self.headers: Dict[str, str] = {"Content-Type": "application/json"}
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self._payload)
+
+    def json(self) -> Dict[str, Any]:
+        return self._payload
+
+
+class FakeN8n:
+    """``requests``-compatible module stand-in for the n8n simulation webhook."""
+
+    WINNERS = ("Defense", "Plaintiff", "Defense")
+
+    def __init__(self, latency: Optional[Latency] = None) -> None:
+        self.latency = latency or Latency()
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _transcript(self) -> _HttpResponse:
+        with self._lock:
+            self._counter += 1
+            winner = self.WINNERS[self._counter % len(self.WINNERS)]
+        return _HttpResponse({
+            "output": {
+                "defense_argument": "The State failed to establish the elements of reckless driving.",
+                "plaintiff_argument": "The evidence shows a willful disregard for the safety of others.",
+                "judgment_summary": f"The court finds for the {winner}.",
+                "winner": winner,
+            }
+        })
+
+    def post(self, url: str, json: Optional[Dict[str, Any]] = None, timeout: Any = None, **_: Any) -> _HttpResponse:  # noqa: A002
+        self.latency.wait()
+        return self._transcript()
+
+
+class FakeAsyncN8n(FakeN8n):
+    """``httpx.AsyncClient``-compatible stand-in for the n8n simulation webhook."""
+
+    async def post(self, url: str, json: Optional[Dict[str, Any]] = None, timeout: Any = None, **_: Any) -> _HttpResponse:  # noqa: A002
+        await self.latency.wait_async()
+        return self._transcript()
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _load_bundled_cases() -> List[Dict[str, Any]]:
+    cases: List[Dict[str, Any]] = []
+    for path in sorted((ROOT / "data").glob("*_cases.json")):
+        cases.extend(json.loads(path.read_text(encoding="utf-8")))
+    return cases
+
+
+class _Query:
+    def __init__(self, cases: List[Dict[str, Any]], latency: Latency) -> None:
+        self.cases = cases
+        self.latency = latency
+
+    def near_text(self, *, query: str, limit: int = 10, **_: Any) -> Any:
+        self.latency.wait()
+        objects = []
+        for rank, case in enumerate(self.cases[:limit]):
+            properties = {
+                "case_id": str(case.get("cluster_id") or rank),
+                "title": case.get("caseName", ""),
+                "body": case.get("syllabus", ""),
+                "metadata": json.dumps({"court": case.get("court", ""), "dateFiled": case.get("dateFiled", "")}),
+                "source_file": "fake",
+                "absolute_url": case.get("absolute_url", ""),
+                "judge": case.get("judge", ""),
+            }
+            distance = 0.2 + rank / max(limit, 1) * 0.5
+            objects.append(SimpleNamespace(
+                uuid=uuid.UUID(int=rank + 1),
+                properties=properties,
+                metadata=SimpleNamespace(distance=distance, certainty=1 - distance / 2),
+            ))
+        return SimpleNamespace(objects=objects)
+
+
+class FakeWeaviateClient:
+    def __init__(self, cases: List[Dict[str, Any]], latency: Latency) -> None:
+        query = _Query(cases, latency)
+        self.collections = SimpleNamespace(get=lambda name: SimpleNamespace(name=name, query=query))
+
+    def close(self) -> None:
+        pass
+
+
+def fake_weaviate_connect(latency: Optional[Latency] = None) -> Any:
+    """Return a ``connect_weaviate_client`` replacement serving the bundled cases."""
+    cases = _load_bundled_cases()
+    latency = latency or Latency()
+    return lambda connection: FakeWeaviateClient(cases, latency)
+
+
+def build_services(
+    *,
+    openai_latency: float = 0.0,
+    openai_token_latency: float = 0.0,
+    n8n_latency: float = 0.0,
+    weaviate_latency: float = 0.0,
+    jitter: float = 0.0,
+    seed: Optional[int] = 0,
+) -> Dict[str, Any]:
+    """
+    Services mapping for ``create_app`` / ``asgi.create_asgi_app`` with the given
+    per-call latencies (seconds); sync and async fakes of a service share one latency.
+    ``openai_token_latency`` adds seconds per generated (completion) token.
+    """
+    openai = Latency(openai_latency, jitter, seed)
+    n8n = Latency(n8n_latency, jitter, seed)
+    return {
+        "openai": FakeOpenAI(openai, openai_token_latency),
+        "async_openai": FakeAsyncOpenAI(openai, openai_token_latency),
+        "http": FakeN8n(n8n),
+        "async_http": FakeAsyncN8n(n8n),
+        "weaviate_connect": fake_weaviate_connect(Latency(weaviate_latency, jitter, seed)),
+    }
+
+
+def lift_rate_limits(server: Any) -> None:
+    """Make ``server`` (the ``app`` module) report unlimited upstream rate limits.
+
+    Benchmarks use this to measure the code paths rather than the configured quota.
+    """
+    load_app_config = server.load_app_config
+
+    def unlimited() -> Dict[str, Any]:
+        config = dict(load_app_config())
+        config["rate_limits"] = {name: {"rate": 1e6, "burst": 1e6} for name in ("n8n", "openai_scoring", "openai_agents")}
+        return config
+
+    server.load_app_config = unlimited
+
+
+def disable_simulation_cache(server: Any) -> None:
+    """Turn off ``server``'s disk cache of scored simulation runs.
+
+    Repeated benchmark streams send identical prompts; with the cache on, every
+    stream after the first would be served from disk instead of the fakes.
+    """
+    load_app_config = server.load_app_config
+
+    def uncached() -> Dict[str, Any]:
+        config = dict(load_app_config())
+        config["simulation"] = {**(config.get("simulation") or {}), "cache": {"enabled": False}}
+        return config
+
+    server.load_app_config = uncached
+
+
+def disable_llm_cache(server: Any) -> None:
+    """Turn off the response cache of ``server``'s LLM gateway.
+
+    Benchmarks repeat identical requests; with the cache on, only the first
+    would reach the fake OpenAI client.
+    """
+    load_app_config = server.load_app_config
+
+    def uncached() -> Dict[str, Any]:
+        config = dict(load_app_config())
+        llm = dict(config.get("llm") or {})
+        config["llm"] = {**llm, "cache": {**(llm.get("cache") or {}), "enabled": False}}
+        return config
+
+    server.load_app_config = uncached
+
+
+def disable_strategy_cache(server: Any) -> None:
+    """Turn off ``server``'s cache of generated strategies.
+
+    Every benchmark request selects the same cases; with the cache on, only the
+    first would call the fake OpenAI client.
+    """
+    load_app_config = server.load_app_config
+
+    def uncached() -> Dict[str, Any]:
+        config = dict(load_app_config())
+        strategies = dict(config.get("strategies") or {})
+        config["strategies"] = {**strategies, "cache": {**(strategies.get("cache") or {}), "enabled": False}}
+        return config
+
+    server.load_app_config = uncached
@@ -150,6 +150,7 @@ export function ExportReport() {
   const [copied, setCopied] = useState(false);
   const [memorandum, setMemorandum] = useState<string>('');
   const [isLoadingMemo, setIsLoadingMemo] = useState(true);
+  const [isStreamingMemo, setIsStreamingMemo] = useState(false);
   const [bestStrategy, setBestStrategy] = useState<any>(null);
   const [strategySummaries, setStrategySummaries] = useState<StrategySummary[]>([]);
   const [caseDetails, setCaseDetails] = useState<Partial<CaseIntake> | null>(null);
@@ -408,21 +409,8 @@ export function ExportReport() {
         return;
       }
       
-      // Call backend to generate memorandum
-      const response = await fetch('http://localhost:5000/api/generate-memorandum', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          simulationResults: simulationResults,
-          caseFacts: caseData.facts || ''
-        }),
-      });
-      
-      const result = await response.json();
-      
-      if (result.success) {
+      // Shows the best strategy and run as soon as the stream names them
+      const showBestStrategy = (result: any) => {
         const strategyWithInsights = simulationResults.find(
           (s: any) => s.strategyTitle === result.bestStrategy.title
         ) || simulationResults[0];
@@ -464,7 +452,6 @@ export function ExportReport() {
           riskBullet
         ].filter(Boolean).join(' ');
         
-        setMemorandum(sanitizeMemorandum(result.memorandum));
         setBestStrategy({
           ...result.bestStrategy,
           rationale,
@@ -489,9 +476,78 @@ export function ExportReport() {
         };
         
         setExportData(data);
-      } else {
-        alert(`Failed to generate memorandum: ${result.error}`);
-        router.push('/simulation');
+      };
+
+      // Stream the memorandum: the best strategy first, then the text token by token
+      const response = await fetch('http://localhost:5000/api/generate-memorandum/stream', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+          simulationResults: simulationResults,
+          caseFacts: caseData.facts || ''
+        }),
+      });
+      
+      if (!response.ok) {
+        const result = await response.json().catch(() => ({}));
+        throw new Error(result.error || `HTTP error! status: ${response.status}`);
+      }
+      
+      const reader = response.body?.getReader();
+      const decoder = new TextDecoder();
+      
+      if (!reader) {
+        throw new Error('Response body is not readable');
+      }
+      
+      setIsStreamingMemo(true);
+      let buffer = '';
+      let draft = '';
+      let finished = false;
+      
+      while (!finished) {
+        const { done, value } = await reader.read();
+        
+        if (done) {
+          break;
+        }
+        
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() || '';
+        const draftLength = draft.length;
+        
+        for (const line of lines) {
+          if (!line.startsWith('data: ')) {
+            continue;
+          }
+          const data = JSON.parse(line.slice(6));
+          
+          if (data.type === 'start') {
+            showBestStrategy(data);
+            setIsLoadingMemo(false);
+          } else if (data.type === 'token') {
+            draft += data.text;
+          } else if (data.type === 'complete') {
+            draft = data.memorandum;
+            finished = true;
+          } else if (data.type === 'error') {
+            alert(`Failed to generate memorandum: ${data.error}`);
+            router.push('/simulation');
+            return;
+          }
+        }
+        
+        // Re-render once per network read rather than once per token
+        if (finished || draft.length !== draftLength) {
+          setMemorandum(sanitizeMemorandum(draft));
+        }
+      }
+      
+      if (!finished) {
+        throw new Error('Memorandum stream ended before completion');
       }
     } catch (error) {
       console.error('Error generating memorandum:', error);
@@ -499,6 +555,7 @@ export function ExportReport() {
       router.push('/simulation');
     } finally {
       setIsLoadingMemo(false);
+      setIsStreamingMemo(false);
     }
   };
 
@@ -742,7 +799,7 @@ export function ExportReport() {
               </CardTitle>
             </CardHeader>
             <CardContent className="flex flex-1 flex-col gap-4">
-              <Button onClick={generatePDF} disabled={isGenerating} className="w-full legal-gradient text-white">
+              <Button onClick={generatePDF} disabled={isGenerating || isStreamingMemo} className="w-full legal-gradient text-white">
                 {isGenerating ? (
                   <div className="flex items-center space-x-2">
                     <div className="animate-spin h-4 w-4 border-2 border-white border-t-transparent rounded-full"></div>
@@ -756,7 +813,7 @@ export function ExportReport() {
                 )}
               </Button>
 
-              <Button onClick={copyToClipboard} variant="outline" className="w-full">
+              <Button onClick={copyToClipboard} disabled={isStreamingMemo} variant="outline" className="w-full">
                 {copied ? (
                   <div className="flex items-center space-x-2">
                     <CheckCircle className="h-4 w-4 text-black" />
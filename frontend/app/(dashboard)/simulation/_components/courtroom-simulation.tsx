@@ -81,6 +81,8 @@ interface StrategyRun {
   variation: string;
   rounds: SimulationRound[];
   averageScore: number;
+  // false while the transcript is in but GPT-4o is still scoring the run
+  scored?: boolean;
   evaluation?: {
     rationale: string;
     strengths: string[];
@@ -88,10 +90,82 @@ interface StrategyRun {
   };
 }
 
+// Transform a streamed run (`run_transcript` or `run_scored`) into the display model
+function toStrategyRun(run: any, scored: boolean): StrategyRun {
+  const strengths = Array.isArray(run.evaluation?.strengths) ? (run.evaluation?.strengths as string[]) : [];
+  const weaknesses = Array.isArray(run.evaluation?.weaknesses) ? (run.evaluation?.weaknesses as string[]) : [];
+  
+  const normalizedRationale = (run.evaluation?.rationale || '').trim();
+  const evaluationRationale = normalizedRationale || run.judgmentSummary || '';
+  
+  const positiveWeight = strengths.length ? Math.min(0.45, 1 / strengths.length) : 0.3;
+  const negativeWeight = weaknesses.length ? Math.min(0.45, 1 / weaknesses.length) : 0.3;
+  const hasModelInsights = strengths.length > 0 || weaknesses.length > 0;
+  const score = run.score || 0;
+  
+  const featureAttributions = !scored
+    ? []
+    : hasModelInsights
+    ? [
+        ...strengths.map((factor) => ({
+          factor,
+          weight: positiveWeight,
+          impact: 'Strength'
+        })),
+        ...weaknesses.map((factor) => ({
+          factor,
+          weight: -negativeWeight,
+          impact: 'Weakness'
+        }))
+      ]
+    : [
+        { 
+          factor: 'Legal Precedent', 
+          weight: score >= 7 ? 0.3 : -0.2, 
+          impact: score >= 7 ? 'Strength' : 'Weakness' 
+        },
+        { 
+          factor: 'Factual Support', 
+          weight: score >= 7 ? 0.25 : -0.15, 
+          impact: score >= 7 ? 'Strength' : 'Weakness' 
+        },
+        { 
+          factor: 'Judicial Philosophy Alignment', 
+          weight: score >= 5 ? 0.2 : -0.25, 
+          impact: score >= 5 ? 'Strength' : 'Weakness' 
+        }
+      ];
+  
+  return {
+    runId: run.runId,
+    variation: run.variation,
+    scored,
+    evaluation: {
+      rationale: evaluationRationale,
+      strengths,
+      weaknesses
+    },
+    rounds: [{
+      round: 1,
+      defenseArgument: run.defenseArgument || 'Defense argument not available',
+      oppositionResponse: run.plaintiffArgument || 'Plaintiff argument not available',
+      judgeResponse: run.judgmentSummary || 'No judgment summary',
+      judgeScoring: {
+        score,
+        rationale: scored ? evaluationRationale : 'Scoring in progress...',
+        featureAttributions
+      }
+    }],
+    averageScore: score
+  };
+}
+
 export function CourtroomSimulation() {
   const router = useRouter();
   const [isRunning, setIsRunning] = useState(false);
   const [progress, setProgress] = useState(0);
+  // Seconds until the n8n circuit breaker retries, while runs are refused by it
+  const [circuitRetryIn, setCircuitRetryIn] = useState<number | null>(null);
   
   // Load strategies from localStorage (populated on strategy page)
   const [strategies, setStrategies] = useState<Array<{
@@ -189,6 +263,7 @@ export function CourtroomSimulation() {
   const startAllSimulations = async () => {
     setIsRunning(true);
     setProgress(0);
+    setCircuitRetryIn(null);
     const acceptedStrategies = strategies.filter(s => s.accepted);
     
     try {
@@ -216,155 +291,151 @@ export function CourtroomSimulation() {
       
       setProgress(5);
       
-      const totalRuns = acceptedStrategies.length * 3;
-      let completedRuns = 0;
+      // Two steps per run: transcript, then score. Each strategy starts with one
+      // run per variation; adaptive mode adds rounds, reported as `plannedRuns`.
+      const plannedRuns: Record<string, number> = Object.fromEntries(
+        strategiesForBackend.map(s => [s.id, 3])
+      );
+      const totalSteps = () => Object.values(plannedRuns).reduce((sum, runs) => sum + runs, 0) * 2;
+      let completedSteps = 0;
+      const transcribedRuns = new Set<string>();
       const allResults: any[] = [];
       
-      // Call backend API to run simulations with streaming
-      const response = await fetch('http://localhost:5000/api/run-simulations', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          strategies: strategiesForBackend,
-          caseFacts: caseData.facts || '',
-          extractedText: extractedText,
-          judgeName: caseData.judge || 'Hon. Sarah Mitchell',
-          stateAttorneyName: caseData.opposingCounsel || 'James Anderson'
-        }),
+      // Call backend API to run simulations with streaming. The simulations run as a
+      // server-side job: if the connection drops, reconnect with the last event id
+      // and the backend replays the events we missed instead of starting over.
+      const requestBody = JSON.stringify({
+        strategies: strategiesForBackend,
+        caseFacts: caseData.facts || '',
+        extractedText: extractedText,
+        judgeName: caseData.judge || 'Hon. Sarah Mitchell',
+        stateAttorneyName: caseData.opposingCounsel || 'James Anderson'
       });
+      const maxReconnects = 5;
+      let reconnects = 0;
+      let lastEventId = '';
+      let finished = false;
       
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      
-      // Read the streaming response
-      const reader = response.body?.getReader();
-      const decoder = new TextDecoder();
-      
-      if (!reader) {
-        throw new Error('Response body is not readable');
-      }
-      
-      let buffer = '';
-      
-      while (true) {
-        const { done, value } = await reader.read();
-        
-        if (done) {
-          break;
-        }
-        
-        buffer += decoder.decode(value, { stream: true });
-        const lines = buffer.split('\n');
-        buffer = lines.pop() || '';
-        
-        for (const line of lines) {
-          if (line.startsWith('data: ')) {
-            try {
-              const data = JSON.parse(line.slice(6));
+      while (!finished) {
+        let streamError: unknown = null;
+        try {
+          const response = await fetch('http://localhost:5000/api/run-simulations', {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+              ...(lastEventId ? { 'Last-Event-ID': lastEventId } : {})
+            },
+            body: requestBody,
+          });
+          
+          if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+          }
+          
+          // Read the streaming response
+          const reader = response.body?.getReader();
+          const decoder = new TextDecoder();
+          
+          if (!reader) {
+            throw new Error('Response body is not readable');
+          }
+          
+          let buffer = '';
+          
+          while (true) {
+            const { done, value } = await reader.read();
+            
+            if (done) {
+              break;
+            }
+            
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop() || '';
+            
+            for (const line of lines) {
+              if (line.startsWith('id: ')) {
+                lastEventId = line.slice(4);
+              } else if (line.startsWith('data: ')) {
+                try {
+                  const data = JSON.parse(line.slice(6));
               
-              if (data.type === 'run_complete') {
-                // Update state incrementally as each run completes
-                completedRuns++;
-                const progressPercent = (completedRuns / totalRuns) * 90 + 5; // 5-95%
-                setProgress(Math.round(progressPercent));
-                
-                // Transform and add the run result immediately
-                const run = data.run;
-                const strategyId = data.strategyId;
-                const strengths = Array.isArray(run.evaluation?.strengths) ? (run.evaluation?.strengths as string[]) : [];
-                const weaknesses = Array.isArray(run.evaluation?.weaknesses) ? (run.evaluation?.weaknesses as string[]) : [];
-                
-                const normalizedRationale = (run.evaluation?.rationale || '').trim();
-                const evaluationRationale = normalizedRationale || run.judgmentSummary || '';
-                
-                const positiveWeight = strengths.length ? Math.min(0.45, 1 / strengths.length) : 0.3;
-                const negativeWeight = weaknesses.length ? Math.min(0.45, 1 / weaknesses.length) : 0.3;
-                const hasModelInsights = strengths.length > 0 || weaknesses.length > 0;
-                
-                const featureAttributions = hasModelInsights
-                  ? [
-                      ...strengths.map((factor) => ({
-                        factor,
-                        weight: positiveWeight,
-                        impact: 'Strength'
-                      })),
-                      ...weaknesses.map((factor) => ({
-                        factor,
-                        weight: -negativeWeight,
-                        impact: 'Weakness'
-                      }))
-                    ]
-                  : [
-                      { 
-                        factor: 'Legal Precedent', 
-                        weight: run.score >= 7 ? 0.3 : -0.2, 
-                        impact: run.score >= 7 ? 'Strength' : 'Weakness' 
-                      },
-                      { 
-                        factor: 'Factual Support', 
-                        weight: run.score >= 7 ? 0.25 : -0.15, 
-                        impact: run.score >= 7 ? 'Strength' : 'Weakness' 
-                      },
-                      { 
-                        factor: 'Judicial Philosophy Alignment', 
-                        weight: run.score >= 5 ? 0.2 : -0.25, 
-                        impact: run.score >= 5 ? 'Strength' : 'Weakness' 
-                      }
-                    ];
-                
-                const transformedRun: StrategyRun = {
-                  runId: run.runId,
-                  variation: run.variation,
-                  evaluation: {
-                    rationale: evaluationRationale,
-                    strengths,
-                    weaknesses
-                  },
-                  rounds: [{
-                    round: 1,
-                    defenseArgument: run.defenseArgument || 'Defense argument not available',
-                    oppositionResponse: run.plaintiffArgument || 'Plaintiff argument not available',
-                    judgeResponse: run.judgmentSummary || 'No judgment summary',
-                    judgeScoring: {
-                      score: run.score || 0,
-                      rationale: evaluationRationale,
-                      featureAttributions
+                  if (data.type === 'run_transcript' || data.type === 'run_scored') {
+                    // Each run arrives twice: its transcript as soon as the courtroom
+                    // simulation ends (provisional), then again once GPT-4o scored it.
+                    // Failed runs skip the transcript and count for both steps.
+                    const run = data.run;
+                    const strategyId = data.strategyId;
+                    const scored = data.type === 'run_scored';
+                    completedSteps += scored && !transcribedRuns.has(run.runId) ? 2 : 1;
+                    transcribedRuns.add(run.runId);
+                    if (data.plannedRuns) {
+                      plannedRuns[strategyId] = data.plannedRuns;
                     }
-                  }],
-                  averageScore: run.score || 0
-                };
+                    // A run refused by the open circuit breaker means the simulation
+                    // service is down, not that the run itself failed
+                    if (run.circuitOpen) {
+                      setCircuitRetryIn(run.retryIn ?? 0);
+                    } else if (!run.error) {
+                      setCircuitRetryIn(null);
+                    }
+                    // 5-95%; never moves back when an adaptive round adds runs
+                    const progressPercent = Math.min(completedSteps / totalSteps(), 1) * 90 + 5;
+                    setProgress(prev => Math.max(prev, Math.round(progressPercent)));
+                
+                    const transformedRun = toStrategyRun(run, scored);
                 
-                // Update strategy runs incrementally
-                setStrategyRuns(prev => ({
-                  ...prev,
-                  [strategyId]: [...(prev[strategyId] || []), transformedRun]
-                }));
+                    // Insert the run, or replace its provisional version
+                    setStrategyRuns(prev => {
+                      const runs = prev[strategyId] || [];
+                      const existing = runs.findIndex(r => r.runId === run.runId);
+                      return {
+                        ...prev,
+                        [strategyId]: existing === -1
+                          ? [...runs, transformedRun]
+                          : runs.map((r, idx) => (idx === existing ? transformedRun : r))
+                      };
+                    });
                 
-                console.log(`Run completed: ${run.runId} (${completedRuns}/${totalRuns})`);
+                    console.log(`Run ${scored ? 'scored' : 'transcript received'}: ${run.runId} (${completedSteps}/${totalSteps()})`);
                 
-              } else if (data.type === 'strategy_complete') {
-                console.log(`Strategy completed: ${data.strategy.strategyTitle}`);
+                  } else if (data.type === 'strategy_complete') {
+                    console.log(`Strategy completed: ${data.strategy.strategyTitle}`);
                 
-              } else if (data.type === 'complete') {
-                console.log('All simulations completed!');
-                allResults.push(...data.results);
-                setProgress(100);
+                  } else if (data.type === 'complete') {
+                    finished = true;
+                    console.log('All simulations completed!');
+                    allResults.push(...data.results);
+                    setProgress(100);
                 
-                // Save simulation results to localStorage for export page
-                localStorage.setItem('simulationResults', JSON.stringify(data.results));
-                console.log('Simulation results saved to localStorage');
+                    // Save simulation results to localStorage for export page
+                    localStorage.setItem('simulationResults', JSON.stringify(data.results));
+                    console.log('Simulation results saved to localStorage');
                 
-              } else if (data.type === 'error') {
-                throw new Error(data.error || 'Simulation failed');
+                  } else if (data.type === 'error') {
+                    finished = true;
+                    throw new Error(data.error || 'Simulation failed');
+                  }
+                } catch (parseError) {
+                  console.error('Error parsing SSE data:', parseError);
+                }
               }
-            } catch (parseError) {
-              console.error('Error parsing SSE data:', parseError);
             }
           }
+        } catch (error) {
+          streamError = error;
         }
+        
+        if (finished) {
+          break;
+        }
+        // The stream ended early: resume the job unless it never started
+        if (!lastEventId || reconnects >= maxReconnects) {
+          throw streamError || new Error('Simulation stream ended unexpectedly');
+        }
+        reconnects += 1;
+        console.warn(`Simulation stream interrupted, resuming after ${lastEventId} (attempt ${reconnects})`, streamError);
+        await new Promise(resolve => setTimeout(resolve, 1000 * reconnects));
       }
       
     } catch (error) {
@@ -378,12 +449,13 @@ export function CourtroomSimulation() {
   const resetSimulation = () => {
     setStrategyRuns({});
     setProgress(0);
+    setCircuitRetryIn(null);
     setExpandedStrategy(null);
     setExpandedRun(null);
   };
 
   const getStrategyAverageScore = (strategyId: string) => {
-    const runs = strategyRuns[strategyId] || [];
+    const runs = (strategyRuns[strategyId] || []).filter(run => run.scored !== false);
     if (runs.length === 0) return 0;
     return runs.reduce((sum, run) => sum + run.averageScore, 0) / runs.length;
   };
@@ -450,6 +522,14 @@ export function CourtroomSimulation() {
                   <span>{progress}%</span>
                 </div>
                 <Progress value={progress} className="h-2" />
+                {circuitRetryIn !== null && (
+                  <div className="flex items-center space-x-2 text-sm text-amber-700">
+                    <AlertCircle className="h-4 w-4" />
+                    <span>
+                      Simulation service unavailable; runs are skipped until it is retried in {Math.ceil(circuitRetryIn)}s.
+                    </span>
+                  </div>
+                )}
               </div>
             </CardContent>
           )}
@@ -519,9 +599,13 @@ export function CourtroomSimulation() {
                                       </div>
                                     </div>
                                     <div className="flex items-center space-x-2">
-                                      <Badge className={getBadgeColor(run.averageScore)}>
-                                        {run.averageScore.toFixed(1)}/10
-                                      </Badge>
+                                      {run.scored === false ? (
+                                        <Badge variant="outline">Scoring...</Badge>
+                                      ) : (
+                                        <Badge className={getBadgeColor(run.averageScore)}>
+                                          {run.averageScore.toFixed(1)}/10
+                                        </Badge>
+                                      )}
                                       {isRunExpanded ? <ChevronUp className="h-4 w-4" /> : <ChevronDown className="h-4 w-4" />}
                                     </div>
                                   </div>